@@ -0,0 +1,85 @@
+"""
+Compara a serialização das rotas de listagem: o caminho padrão do FastAPI
+(instâncias ORM validadas com `from_attributes` e codificadas com `json`) e o
+caminho rápido (linhas do Core convertidas em dict e codificadas com orjson).
+
+Uso, a partir de `api/`:
+
+    python -m benchmarks.serializacao_listagem
+"""
+
+import timeit
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import List
+
+from fastapi.responses import JSONResponse  # type: ignore
+from pydantic import TypeAdapter  # type: ignore
+
+from src.core.serialization import FastJSONResponse, response_columns
+from src.models.produtos import Produto, ProdutoResponse
+
+REPETICOES = 200
+DESCRICAO = "Descrição longa gerada pelo Faker para o produto. " * 6
+
+
+def gerar_produtos(n: int) -> List[Produto]:
+    inicio = datetime(2025, 1, 1, 3, 0, 0)
+    return [
+        Produto(
+            id=i,
+            nome=f"Produto {i}",
+            descricao=DESCRICAO,
+            categoria_id=i % 20 + 1,
+            fornecedor_id=i % 50 + 1,
+            preco=Decimal("199.90") + i,
+            custo=Decimal("89.45"),
+            peso=Decimal("1.250"),
+            quantidade_estoque=i % 300,
+            em_estoque=True,
+            ativo=True,
+            criado_em=inicio + timedelta(minutes=i),
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+def linhas_core(produtos: List[Produto]) -> List[dict]:
+    """Simula os `RowMapping` devolvidos por `select(*colunas)`."""
+    chaves = [coluna.key for coluna in response_columns(Produto, ProdutoResponse)]
+    return [{chave: getattr(p, chave) for chave in chaves} for p in produtos]
+
+
+adapter = TypeAdapter(List[ProdutoResponse])
+
+
+def caminho_atual(produtos):
+    validados = adapter.validate_python(produtos, from_attributes=True)
+    return JSONResponse(adapter.dump_python(validados, mode="json")).body
+
+
+def caminho_rapido(linhas):
+    return FastJSONResponse([dict(linha) for linha in linhas]).body
+
+
+def main():
+    for limit in (100, 1000):
+        produtos = gerar_produtos(limit)
+        linhas = linhas_core(produtos)
+        assert caminho_atual(produtos) == caminho_rapido(linhas)
+
+        atual = min(
+            timeit.repeat(lambda: caminho_atual(produtos), number=REPETICOES, repeat=3)
+        )
+        rapido = min(
+            timeit.repeat(lambda: caminho_rapido(linhas), number=REPETICOES, repeat=3)
+        )
+        print(
+            f"limit={limit:>4}: atual {atual / REPETICOES * 1000:7.3f} ms | "
+            f"rápido {rapido / REPETICOES * 1000:7.3f} ms | "
+            f"{atual / rapido:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+from fastapi import APIRouter  # type: ignore
+
+from ...core.cache import entity_cache
+from ...core.timing import TimedRoute
+from ...models.cache import CacheStatsResponse
+
+router = APIRouter(tags=["Cache"], route_class=TimedRoute)
+
+
+@router.get("/cache/stats", response_model=CacheStatsResponse)
+async def estatisticas_cache():
+    """
+    Retorna os contadores de acertos, falhas e remoções do cache de entidades.
+    """
+    return entity_cache.stats()
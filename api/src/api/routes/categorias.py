@@ -1,9 +1,25 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status  # type: ignore
-from sqlalchemy.orm import Session  # type: ignore
+from fastapi import (  # type: ignore
+    APIRouter,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore
 
-from ...core.database import get_db
+from ...core.bulk import bulk_insert, read_bulk_rows
+from ...core.cache import entity_cache
+from ...core.database import get_db, get_read_db
+from ...core.etag import conditional_get
+from ...core.generations import dataset_generations
+from ...core.pagination import paginate
+from ...core.serialization import fast_json_response, select_response
+from ...core.snapshot import snapshot_get
+from ...core.timing import TimedRoute
+from ...models.bulk import BulkResponse
 from ...models.categorias import (
     Categoria,
     CategoriaCreate,
@@ -11,68 +27,111 @@ from ...models.categorias import (
     CategoriaUpdate,
 )
 
-router = APIRouter(tags=["Categorias"])
+router = APIRouter(tags=["Categorias"], route_class=TimedRoute)
 
 
 @router.post(
     "/categorias", response_model=CategoriaResponse, status_code=status.HTTP_201_CREATED
 )
-async def criar_categoria(categoria: CategoriaCreate, db: Session = Depends(get_db)):
+async def criar_categoria(
+    categoria: CategoriaCreate, db: AsyncSession = Depends(get_db)
+):
     """
     Cria uma nova categoria.
     """
 
     db_categoria = Categoria(**categoria.dict())
     db.add(db_categoria)
-    db.commit()
-    db.refresh(db_categoria)
+    await dataset_generations.bump(db, "categorias")
+    await db.commit()
+    await db.refresh(db_categoria)
 
     return db_categoria
 
 
-@router.get("/categorias", response_model=List[CategoriaResponse])
+@router.post("/categorias/bulk", response_model=BulkResponse)
+async def criar_categorias_em_lote(
+    request: Request, db: AsyncSession = Depends(get_db)
+):
+    """
+    Cria categorias em lote a partir de um array JSON ou de NDJSON.
+    Retorna a quantidade inserida e os erros por índice de registro.
+    """
+    rows = await read_bulk_rows(request)
+    return await bulk_insert(db, Categoria, CategoriaCreate, rows, "categorias")
+
+
+@router.get(
+    "/categorias",
+    response_model=List[CategoriaResponse],
+    dependencies=[conditional_get("categorias"), snapshot_get("categorias")],
+)
 async def listar_categorias(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Lista todas as categorias com paginação.
+    Para páginas profundas, envie o `cursor` recebido no cabeçalho `X-Next-Cursor`.
     """
-    categorias = db.query(Categoria).offset(skip).limit(limit).all()
-    return categorias
+    rows = await paginate(
+        db,
+        select_response(Categoria, CategoriaResponse),
+        response,
+        (Categoria.id,),
+        cursor,
+        skip,
+        limit,
+        mappings=True,
+    )
+    return fast_json_response(rows, response)
 
 
-@router.get("/categorias/{categoria_id}", response_model=CategoriaResponse)
-async def obter_categoria(categoria_id: int, db: Session = Depends(get_db)):
+@router.get(
+    "/categorias/{categoria_id}",
+    response_model=CategoriaResponse,
+    dependencies=[conditional_get("categorias"), snapshot_get("categorias")],
+)
+async def obter_categoria(categoria_id: int, db: AsyncSession = Depends(get_read_db)):
     """
     Obtém uma categoria específica pelo ID.
     """
-    categoria = db.query(Categoria).filter(Categoria.id == categoria_id).first()
-    if not Categoria:
+    categoria = await entity_cache.get_or_load(
+        db, Categoria, CategoriaResponse, categoria_id
+    )
+    if not categoria:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Categoria não encontrado"
+            status_code=status.HTTP_404_NOT_FOUND, detail="Categoria não encontrada"
         )
     return categoria
 
 @router.delete("/categorias/{categoria_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def deletar_categoria(categoria_id: int, db: Session = Depends(get_db)):
+async def deletar_categoria(categoria_id: int, db: AsyncSession = Depends(get_db)):
     """
     Deleta uma categoria específica pelo ID.
     """
-    categoria = db.query(Categoria).filter(Categoria.id == categoria_id).first()
+    categoria = await db.get(Categoria, categoria_id)
     if not categoria:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Categoria não encontrada"
         )
 
-    db.delete(categoria)
-    db.commit()
+    await db.delete(categoria)
+    await dataset_generations.bump(db, "categorias", "produtos")
+    await db.commit()
+    entity_cache.invalidate("categorias", categoria_id)
+    # Produtos desta categoria ficam com categoria_id nulo
+    entity_cache.invalidate_namespace("produtos")
     
 @router.patch("/categorias/{categoria_id}", status_code=status.HTTP_200_OK)
-async def atualizar_categoria(categoria_id: int, categoria_update: CategoriaUpdate, db: Session = Depends(get_db)):
+async def atualizar_categoria(categoria_id: int, categoria_update: CategoriaUpdate, db: AsyncSession = Depends(get_db)):
     """
     Atualiza uma categoria específica pelo ID
     """
-    categoria = db.query(Categoria).filter(Categoria.id == categoria_id).first()
+    categoria = await db.get(Categoria, categoria_id)
     if not categoria:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Categoria não encontrada"
@@ -82,6 +141,8 @@ async def atualizar_categoria(categoria_id: int, categoria_update: CategoriaUpda
     for key, value in categoria_update.dict(exclude_unset=True).items():
         setattr(categoria, key, value)
 
-    db.commit()
-    db.refresh(categoria)
-    return categoria
\ No newline at end of file
+    await dataset_generations.bump(db, "categorias")
+    await db.commit()
+    entity_cache.invalidate("categorias", categoria_id)
+    await db.refresh(categoria)
+    return categoria
@@ -1,22 +1,42 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status  # type: ignore
-from sqlalchemy.orm import Session  # type: ignore
-
-from ...core.database import get_db
+from fastapi import (  # type: ignore
+    APIRouter,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy import select  # type: ignore
+from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore
+
+from ...core.bulk import bulk_insert, read_bulk_rows
+from ...core.cache import entity_cache
+from ...core.database import get_db, get_read_db
+from ...core.etag import conditional_get
+from ...core.generations import dataset_generations
+from ...core.pagination import paginate
+from ...core.search import fulltext_search
+from ...core.serialization import fast_json_response, select_response
+from ...core.snapshot import snapshot_get
+from ...core.timing import TimedRoute
+from ...models.bulk import BulkResponse
 from ...models.clientes import Cliente, ClienteCreate, ClienteResponse, ClienteUpdate
 
-router = APIRouter(tags=["Clientes"])
+router = APIRouter(tags=["Clientes"], route_class=TimedRoute)
 
 
 @router.post(
     "/clientes", response_model=ClienteResponse, status_code=status.HTTP_201_CREATED
 )
-async def criar_cliente(cliente: ClienteCreate, db: Session = Depends(get_db)):
+async def criar_cliente(cliente: ClienteCreate, db: AsyncSession = Depends(get_db)):
     """
     Cria um novo cliente.
     """
-    cliente_existente = db.query(Cliente).filter(Cliente.cpf == cliente.cpf).first()
+    cliente_existente = await db.scalar(
+        select(Cliente).where(Cliente.cpf == cliente.cpf)
+    )
     if cliente_existente:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -25,29 +45,104 @@ async def criar_cliente(cliente: ClienteCreate, db: Session = Depends(get_db)):
 
     db_cliente = Cliente(**cliente.dict())
     db.add(db_cliente)
-    db.commit()
-    db.refresh(db_cliente)
+    await dataset_generations.bump(db, "clientes")
+    await db.commit()
+    await db.refresh(db_cliente)
 
     return db_cliente
 
 
-@router.get("/clientes", response_model=List[ClienteResponse])
+@router.post("/clientes/bulk", response_model=BulkResponse)
+async def criar_clientes_em_lote(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Cria clientes em lote a partir de um array JSON ou de NDJSON.
+    Retorna a quantidade inserida e os erros por índice de registro.
+    """
+    rows = await read_bulk_rows(request)
+    return await bulk_insert(db, Cliente, ClienteCreate, rows, "clientes")
+
+
+@router.get(
+    "/clientes",
+    response_model=List[ClienteResponse],
+    dependencies=[conditional_get("clientes"), snapshot_get("clientes")],
+)
 async def listar_clientes(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Lista todos os clientes com paginação.
+    Para páginas profundas, envie o `cursor` recebido no cabeçalho `X-Next-Cursor`.
+    """
+    rows = await paginate(
+        db,
+        select_response(Cliente, ClienteResponse),
+        response,
+        (Cliente.id,),
+        cursor,
+        skip,
+        limit,
+        mappings=True,
+    )
+    return fast_json_response(rows, response)
+
+
+@router.get(
+    "/clientes/buscar",
+    response_model=List[ClienteResponse],
+    dependencies=[conditional_get("clientes")],
+)
+async def buscar_clientes(
+    q: Optional[str] = None,
+    nome: Optional[str] = None,
+    cpf: Optional[str] = None,
+    email: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_read_db),
+):
     """
-    clientes = db.query(Cliente).offset(skip).limit(limit).all()
+    Busca clientes por texto (nome, sobrenome e email), CPF ou prefixo do email.
+    Resultados ordenados por relevância; `nome` é aceito como sinônimo de `q`.
+    """
+    query = select(Cliente)
+
+    if cpf:
+        query = query.where(Cliente.cpf == cpf)
+    if email:
+        query = query.where(Cliente.email.like(f"{email}%"))
+
+    clientes = await fulltext_search(
+        db,
+        query,
+        (Cliente.nome, Cliente.sobrenome, Cliente.email),
+        q or nome,
+        Cliente.id,
+        skip,
+        limit,
+    )
+    if not clientes:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Nenhum cliente encontrado"
+        )
+
     return clientes
 
 
-@router.get("/clientes/{cliente_id}", response_model=ClienteResponse)
-async def obter_cliente(cliente_id: int, db: Session = Depends(get_db)):
+@router.get(
+    "/clientes/{cliente_id}",
+    response_model=ClienteResponse,
+    dependencies=[conditional_get("clientes"), snapshot_get("clientes")],
+)
+async def obter_cliente(cliente_id: int, db: AsyncSession = Depends(get_read_db)):
     """
     Obtém um cliente específico pelo ID.
     """
-    cliente = db.query(Cliente).filter(Cliente.id == cliente_id).first()
+    cliente = await entity_cache.get_or_load(db, Cliente, ClienteResponse, cliente_id)
     if not cliente:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Cliente não encontrado"
@@ -57,12 +152,12 @@ async def obter_cliente(cliente_id: int, db: Session = Depends(get_db)):
 
 @router.put("/clientes/{cliente_id}", response_model=ClienteUpdate)
 async def atualizar_cliente(
-    cliente_id: int, cliente_update: ClienteUpdate, db: Session = Depends(get_db)
+    cliente_id: int, cliente_update: ClienteUpdate, db: AsyncSession = Depends(get_db)
 ):
     """
     Atualiza um cliente específico pelo ID.
     """
-    cliente = db.query(Cliente).filter(Cliente.id == cliente_id).first()
+    cliente = await db.get(Cliente, cliente_id)
     if not cliente:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Cliente não encontrado"
@@ -71,49 +166,28 @@ async def atualizar_cliente(
     for key, value in cliente_update.dict().items():
         setattr(cliente, key, value)
 
-    db.commit()
-    db.refresh(cliente)
+    await dataset_generations.bump(db, "clientes")
+    await db.commit()
+    entity_cache.invalidate("clientes", cliente_id)
+    await db.refresh(cliente)
     return cliente
 
 
 @router.delete("/clientes/{cliente_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def deletar_cliente(cliente_id: int, db: Session = Depends(get_db)):
+async def deletar_cliente(cliente_id: int, db: AsyncSession = Depends(get_db)):
     """
     Deleta um cliente específico pelo ID.
     """
-    cliente = db.query(Cliente).filter(Cliente.id == cliente_id).first()
+    cliente = await db.get(Cliente, cliente_id)
     if not cliente:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Cliente não encontrado"
         )
 
-    db.delete(cliente)
-    db.commit()
-
-
-@router.get("/clientes/buscar")
-async def buscar_clientes(
-    nome: Optional[str] = None,
-    cpf: Optional[str] = None,
-    email: Optional[str] = None,
-    db: Session = Depends(get_db),
-):
-    """
-    Busca clientes por nome, CPF ou email.
-    """
-    query = db.query(Cliente)
-
-    if nome:
-        query = query.filter(Cliente.nome.ilike(f"%{nome}%"))
-    if cpf:
-        query = query.filter(Cliente.cpf == cpf)
-    if email:
-        query = query.filter(Cliente.email.ilike(f"%{email}%"))
-
-    clientes = query.all()
-    if not clientes:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Nenhum cliente encontrado"
-        )
-
-    return clientes
+    await db.delete(cliente)
+    await dataset_generations.bump(db, "clientes", "enderecos", "vendas", "itens_venda")
+    await db.commit()
+    entity_cache.invalidate("clientes", cliente_id)
+    # Endereços e vendas do cliente são removidos em cascata pelo banco
+    entity_cache.invalidate_namespace("enderecos")
+    entity_cache.invalidate_namespace("vendas")
@@ -1,9 +1,27 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status  # type: ignore
-from sqlalchemy.orm import Session  # type: ignore
-
-from ...core.database import get_db
+from fastapi import (  # type: ignore
+    APIRouter,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy import select  # type: ignore
+from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore
+
+from ...core.bulk import bulk_insert, read_bulk_rows
+from ...core.cache import entity_cache
+from ...core.database import get_db, get_read_db
+from ...core.etag import conditional_get
+from ...core.generations import dataset_generations
+from ...core.pagination import paginate
+from ...core.search import fulltext_search
+from ...core.serialization import fast_json_response, select_response
+from ...core.snapshot import snapshot_get
+from ...core.timing import TimedRoute
+from ...models.bulk import BulkResponse
 from ...models.clientes import Cliente
 from ...models.enderecos import (
     Endereco,
@@ -12,17 +30,17 @@ from ...models.enderecos import (
     EnderecoUpdate,
 )
 
-router = APIRouter(tags=["Endereços"])
+router = APIRouter(tags=["Endereços"], route_class=TimedRoute)
 
 
 @router.post(
     "/enderecos", response_model=EnderecoResponse, status_code=status.HTTP_201_CREATED
 )
-async def criar_endereco(endereco: EnderecoCreate, db: Session = Depends(get_db)):
+async def criar_endereco(endereco: EnderecoCreate, db: AsyncSession = Depends(get_db)):
     """
     Cria um novo endereço para um cliente.
     """
-    cliente = db.query(Cliente).filter(Cliente.id == endereco.cliente_id).first()
+    cliente = await db.get(Cliente, endereco.cliente_id)
     if not cliente:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Cliente não encontrado"
@@ -30,29 +48,107 @@ async def criar_endereco(endereco: EnderecoCreate, db: Session = Depends(get_db)
 
     db_endereco = Endereco(**endereco.dict())
     db.add(db_endereco)
-    db.commit()
-    db.refresh(db_endereco)
+    await dataset_generations.bump(db, "enderecos")
+    await db.commit()
+    await db.refresh(db_endereco)
 
     return db_endereco
 
 
-@router.get("/enderecos", response_model=List[EnderecoResponse])
+@router.post("/enderecos/bulk", response_model=BulkResponse)
+async def criar_enderecos_em_lote(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Cria endereços em lote a partir de um array JSON ou de NDJSON.
+    Retorna a quantidade inserida e os erros por índice de registro.
+    """
+    rows = await read_bulk_rows(request)
+    return await bulk_insert(db, Endereco, EnderecoCreate, rows, "enderecos")
+
+
+@router.get(
+    "/enderecos",
+    response_model=List[EnderecoResponse],
+    dependencies=[conditional_get("enderecos"), snapshot_get("enderecos")],
+)
 async def listar_enderecos(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Lista todos os endereços com paginação.
+    Para páginas profundas, envie o `cursor` recebido no cabeçalho `X-Next-Cursor`.
     """
-    enderecos = db.query(Endereco).offset(skip).limit(limit).all()
+    rows = await paginate(
+        db,
+        select_response(Endereco, EnderecoResponse),
+        response,
+        (Endereco.id,),
+        cursor,
+        skip,
+        limit,
+        mappings=True,
+    )
+    return fast_json_response(rows, response)
+
+
+@router.get(
+    "/enderecos/buscar",
+    response_model=List[EnderecoResponse],
+    dependencies=[conditional_get("enderecos")],
+)
+async def buscar_enderecos(
+    q: Optional[str] = None,
+    cliente_id: Optional[int] = None,
+    cep: Optional[str] = None,
+    logradouro: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Busca endereços por texto (logradouro, bairro e cidade), cliente ou prefixo do CEP.
+    Os resultados são ordenados por relevância; `logradouro` é aceito como sinônimo
+    de `q`.
+    """
+    query = select(Endereco)
+
+    if cliente_id:
+        query = query.where(Endereco.cliente_id == cliente_id)
+    if cep:
+        query = query.where(Endereco.cep.like(f"{cep}%"))
+
+    enderecos = await fulltext_search(
+        db,
+        query,
+        (Endereco.logradouro, Endereco.bairro, Endereco.cidade),
+        q or logradouro,
+        Endereco.id,
+        skip,
+        limit,
+    )
+    if not enderecos:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Nenhum endereço encontrado"
+        )
+
     return enderecos
 
 
-@router.get("/enderecos/{endereco_id}", response_model=EnderecoResponse)
-async def obter_endereco(endereco_id: int, db: Session = Depends(get_db)):
+@router.get(
+    "/enderecos/{endereco_id}",
+    response_model=EnderecoResponse,
+    dependencies=[conditional_get("enderecos"), snapshot_get("enderecos")],
+)
+async def obter_endereco(endereco_id: int, db: AsyncSession = Depends(get_read_db)):
     """
     Obtém um endereço específico pelo ID.
     """
-    endereco = db.query(Endereco).filter(Endereco.id == endereco_id).first()
+    endereco = await entity_cache.get_or_load(
+        db, Endereco, EnderecoResponse, endereco_id
+    )
     if not endereco:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Endereço não encontrado"
@@ -60,18 +156,26 @@ async def obter_endereco(endereco_id: int, db: Session = Depends(get_db)):
     return endereco
 
 
-@router.get("/enderecos/cliente/{cliente_id}", response_model=EnderecoResponse)
-async def obter_endereco_por_cliente(cliente_id: int, db: Session = Depends(get_db)):
+@router.get(
+    "/enderecos/cliente/{cliente_id}",
+    response_model=EnderecoResponse,
+    dependencies=[conditional_get("enderecos")],
+)
+async def obter_endereco_por_cliente(
+    cliente_id: int, db: AsyncSession = Depends(get_read_db)
+):
     """
     Obtém o endereço de um cliente específico.
     """
-    cliente = db.query(Cliente).filter(Cliente.id == cliente_id).first()
+    cliente = await db.get(Cliente, cliente_id)
     if not cliente:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Cliente não encontrado"
         )
 
-    endereco = db.query(Endereco).filter(Endereco.cliente_id == cliente_id).first()
+    endereco = await db.scalar(
+        select(Endereco).where(Endereco.cliente_id == cliente_id).limit(1)
+    )
     if not endereco:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -81,28 +185,32 @@ async def obter_endereco_por_cliente(cliente_id: int, db: Session = Depends(get_
 
 
 @router.delete("/enderecos/{endereco_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def deletar_endereco(endereco_id: int, db: Session = Depends(get_db)):
+async def deletar_endereco(endereco_id: int, db: AsyncSession = Depends(get_db)):
     """
     Deleta um endereço específico pelo ID.
     """
-    endereco = db.query(Endereco).filter(Endereco.id == endereco_id).first()
+    endereco = await db.get(Endereco, endereco_id)
     if not endereco:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Endereço não encontrado"
         )
 
-    db.delete(endereco)
-    db.commit()
+    await db.delete(endereco)
+    await dataset_generations.bump(db, "enderecos", "vendas")
+    await db.commit()
+    entity_cache.invalidate("enderecos", endereco_id)
+    # Vendas que usavam este endereço ficam com endereco_entrega_id nulo
+    entity_cache.invalidate_namespace("vendas")
 
 
 @router.put("/enderecos/{endereco_id}", response_model=EnderecoResponse)
 async def atualizar_endereco(
-    endereco_id: int, endereco: EnderecoUpdate, db: Session = Depends(get_db)
+    endereco_id: int, endereco: EnderecoUpdate, db: AsyncSession = Depends(get_db)
 ):
     """
     Atualiza um endereço específico pelo ID.
     """
-    db_endereco = db.query(Endereco).filter(Endereco.id == endereco_id).first()
+    db_endereco = await db.get(Endereco, endereco_id)
     if not db_endereco:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Endereço não encontrado"
@@ -111,46 +219,8 @@ async def atualizar_endereco(
     for key, value in endereco.dict(exclude_unset=True).items():
         setattr(db_endereco, key, value)
 
-    db.commit()
-    db.refresh(db_endereco)
+    await dataset_generations.bump(db, "enderecos")
+    await db.commit()
+    entity_cache.invalidate("enderecos", endereco_id)
+    await db.refresh(db_endereco)
     return db_endereco
-
-
-@router.get("/enderecos/buscar")
-async def buscar_enderecos(
-    cliente_id: Optional[int] = None,
-    cep: Optional[str] = None,
-    logradouro: Optional[str] = None,
-    db: Session = Depends(get_db),
-):
-    """
-    Busca endereços por cliente, CEP ou logradouro.
-    """
-    query = db.query(Endereco)
-
-    if cliente_id:
-        query = query.filter(Endereco.cliente_id == cliente_id)
-    if cep:
-        query = query.filter(Endereco.cep.ilike(f"%{cep}%"))
-    if logradouro:
-        query = query.filter(Endereco.logradouro.ilike(f"%{logradouro}%"))
-
-    enderecos = query.all()
-    if not enderecos:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Nenhum endereço encontrado"
-        )
-
-    return enderecos
-    if cpf:
-        query = query.filter(Cliente.cpf == cpf)
-    if email:
-        query = query.filter(Cliente.email.ilike(f"%{email}%"))
-
-    clientes = query.all()
-    if not clientes:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Nenhum cliente encontrado"
-        )
-
-    return clientes
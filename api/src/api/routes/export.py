@@ -0,0 +1,108 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, status  # type: ignore
+from fastapi.responses import StreamingResponse  # type: ignore
+from sqlalchemy import select  # type: ignore
+
+from ...core.config import settings
+from ...core.database import read_engine
+from ...core.timing import TimedRoute
+from ...models import (
+    Categoria,
+    Cliente,
+    Endereco,
+    Fornecedor,
+    ItensVendas,
+    Produto,
+    Venda,
+)
+
+router = APIRouter(tags=["Exportação"], route_class=TimedRoute)
+
+RECURSOS = {
+    model.__tablename__: model.__table__
+    for model in (
+        Categoria,
+        Cliente,
+        Endereco,
+        Fornecedor,
+        ItensVendas,
+        Produto,
+        Venda,
+    )
+}
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+async def _stream_rows(table, formato: str):
+    """
+    Lê a tabela com um cursor do lado do servidor (`stream_results`) e gera o
+    conteúdo em blocos de `EXPORT_BATCH_SIZE` linhas, sem montar objetos ORM
+    nem manter a tabela inteira em memória.
+    """
+    async with read_engine.connect() as connection:
+        result = await connection.stream(
+            select(table)
+            .order_by(table.c.id)
+            .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+
+        if formato == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(result.keys())
+            async for rows in result.partitions():
+                writer.writerows(rows)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            yield buffer.getvalue()
+        else:
+            columns = list(result.keys())
+            async for rows in result.partitions():
+                yield "".join(
+                    json.dumps(
+                        dict(zip(columns, row)),
+                        default=_json_default,
+                        ensure_ascii=False,
+                    )
+                    + "\n"
+                    for row in rows
+                )
+
+
+@router.get("/export/{recurso}")
+async def exportar_recurso(
+    recurso: str, formato: Literal["ndjson", "csv"] = "ndjson"
+):
+    """
+    Exporta uma tabela inteira em NDJSON ou CSV via streaming.
+    A memória usada é constante, independente do tamanho da tabela.
+    """
+    table = RECURSOS.get(recurso)
+    if table is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Recurso não encontrado"
+        )
+
+    return StreamingResponse(
+        _stream_rows(table, formato),
+        media_type=MEDIA_TYPES[formato],
+        headers={
+            "Content-Disposition": f'attachment; filename="{recurso}.{formato}"'
+        },
+    )
@@ -1,9 +1,27 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status  # type: ignore
-from sqlalchemy.orm import Session  # type: ignore
-
-from ...core.database import get_db
+from fastapi import (  # type: ignore
+    APIRouter,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy import select  # type: ignore
+from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore
+
+from ...core.bulk import bulk_insert, read_bulk_rows
+from ...core.cache import entity_cache
+from ...core.database import get_db, get_read_db
+from ...core.etag import conditional_get
+from ...core.generations import dataset_generations
+from ...core.pagination import paginate
+from ...core.search import fulltext_search
+from ...core.serialization import fast_json_response, select_response
+from ...core.snapshot import snapshot_get
+from ...core.timing import TimedRoute
+from ...models.bulk import BulkResponse
 from ...models.fornecedores import (
     Fornecedor,
     FornecedorCreate,
@@ -11,7 +29,7 @@ from ...models.fornecedores import (
     FornecedorUpdate,
 )
 
-router = APIRouter(tags=["Fornecedores"])
+router = APIRouter(tags=["Fornecedores"], route_class=TimedRoute)
 
 
 @router.post(
@@ -19,12 +37,14 @@ router = APIRouter(tags=["Fornecedores"])
     response_model=FornecedorResponse,
     status_code=status.HTTP_201_CREATED,
 )
-async def criar_fornecedor(fornecedor: FornecedorCreate, db: Session = Depends(get_db)):
+async def criar_fornecedor(
+    fornecedor: FornecedorCreate, db: AsyncSession = Depends(get_db)
+):
     """
     Cria um novo fornecedor.
     """
-    fornecedor_existente = (
-        db.query(Fornecedor).filter(Fornecedor.cnpj == fornecedor.cnpj).first()
+    fornecedor_existente = await db.scalar(
+        select(Fornecedor).where(Fornecedor.cnpj == fornecedor.cnpj)
     )
     if fornecedor_existente:
         raise HTTPException(
@@ -34,29 +54,108 @@ async def criar_fornecedor(fornecedor: FornecedorCreate, db: Session = Depends(g
 
     db_fornecedor = Fornecedor(**fornecedor.dict())
     db.add(db_fornecedor)
-    db.commit()
-    db.refresh(db_fornecedor)
+    await dataset_generations.bump(db, "fornecedores")
+    await db.commit()
+    await db.refresh(db_fornecedor)
 
     return db_fornecedor
 
 
-@router.get("/fornecedores", response_model=List[FornecedorResponse])
+@router.post("/fornecedores/bulk", response_model=BulkResponse)
+async def criar_fornecedores_em_lote(
+    request: Request, db: AsyncSession = Depends(get_db)
+):
+    """
+    Cria fornecedores em lote a partir de um array JSON ou de NDJSON.
+    Retorna a quantidade inserida e os erros por índice de registro.
+    """
+    rows = await read_bulk_rows(request)
+    return await bulk_insert(db, Fornecedor, FornecedorCreate, rows, "fornecedores")
+
+
+@router.get(
+    "/fornecedores",
+    response_model=List[FornecedorResponse],
+    dependencies=[conditional_get("fornecedores"), snapshot_get("fornecedores")],
+)
 async def listar_fornecedores(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Lista todos os fornecedores com paginação.
+    Para páginas profundas, envie o `cursor` recebido no cabeçalho `X-Next-Cursor`.
+    """
+    rows = await paginate(
+        db,
+        select_response(Fornecedor, FornecedorResponse),
+        response,
+        (Fornecedor.id,),
+        cursor,
+        skip,
+        limit,
+        mappings=True,
+    )
+    return fast_json_response(rows, response)
+
+
+@router.get(
+    "/fornecedores/buscar",
+    response_model=List[FornecedorResponse],
+    dependencies=[conditional_get("fornecedores")],
+)
+async def buscar_fornecedores(
+    q: Optional[str] = None,
+    nome: Optional[str] = None,
+    cnpj: Optional[str] = None,
+    email: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_read_db),
+):
     """
-    fornecedores = db.query(Fornecedor).offset(skip).limit(limit).all()
+    Busca fornecedores por texto (nome e email), CNPJ ou prefixo do email.
+    Resultados ordenados por relevância; `nome` é aceito como sinônimo de `q`.
+    """
+    query = select(Fornecedor)
+
+    if cnpj:
+        query = query.where(Fornecedor.cnpj == cnpj)
+    if email:
+        query = query.where(Fornecedor.email.like(f"{email}%"))
+
+    fornecedores = await fulltext_search(
+        db,
+        query,
+        (Fornecedor.nome, Fornecedor.email),
+        q or nome,
+        Fornecedor.id,
+        skip,
+        limit,
+    )
+    if not fornecedores:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Nenhum fornecedor encontrado"
+        )
+
     return fornecedores
 
 
-@router.get("/fornecedores/{fornecedor_id}", response_model=FornecedorResponse)
-async def obter_fornecedor(fornecedor_id: int, db: Session = Depends(get_db)):
+@router.get(
+    "/fornecedores/{fornecedor_id}",
+    response_model=FornecedorResponse,
+    dependencies=[conditional_get("fornecedores"), snapshot_get("fornecedores")],
+)
+async def obter_fornecedor(fornecedor_id: int, db: AsyncSession = Depends(get_read_db)):
     """
     Obtém um fornecedor específico pelo ID.
     """
-    fornecedor = db.query(Fornecedor).filter(Fornecedor.id == fornecedor_id).first()
+    fornecedor = await entity_cache.get_or_load(
+        db, Fornecedor, FornecedorResponse, fornecedor_id
+    )
     if not fornecedor:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Fornecedor não encontrado"
@@ -68,12 +167,12 @@ async def obter_fornecedor(fornecedor_id: int, db: Session = Depends(get_db)):
 async def atualizar_fornecedor(
     fornecedor_id: int,
     fornecedor_update: FornecedorUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Atualiza um cliente específico pelo ID.
     """
-    fornecedor = db.query(Fornecedor).filter(Fornecedor.id == fornecedor_id).first()
+    fornecedor = await db.get(Fornecedor, fornecedor_id)
     if not fornecedor:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Fornecedor não encontrado"
@@ -82,49 +181,27 @@ async def atualizar_fornecedor(
     for key, value in fornecedor_update.dict().items():
         setattr(fornecedor, key, value)
 
-    db.commit()
-    db.refresh(fornecedor)
+    await dataset_generations.bump(db, "fornecedores")
+    await db.commit()
+    entity_cache.invalidate("fornecedores", fornecedor_id)
+    await db.refresh(fornecedor)
     return fornecedor
 
 
 @router.delete("/fornecedores/{fornecedor_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def deletar_fornecedor(fornecedor_id: int, db: Session = Depends(get_db)):
+async def deletar_fornecedor(fornecedor_id: int, db: AsyncSession = Depends(get_db)):
     """
     Deleta um fornecedor específico pelo ID.
     """
-    fornecedor = db.query(Fornecedor).filter(Fornecedor.id == fornecedor_id).first()
+    fornecedor = await db.get(Fornecedor, fornecedor_id)
     if not fornecedor:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Fornecedor não encontrado"
         )
 
-    db.delete(fornecedor)
-    db.commit()
-
-
-@router.get("/clientes/buscar")
-async def buscar_fornecedores(
-    nome: Optional[str] = None,
-    cnpj: Optional[str] = None,
-    email: Optional[str] = None,
-    db: Session = Depends(get_db),
-):
-    """
-    Busca fornecedores por nome, CNPJ ou email.
-    """
-    query = db.query(Fornecedor)
-
-    if nome:
-        query = query.filter(Fornecedor.nome.ilike(f"%{nome}%"))
-    if cnpj:
-        query = query.filter(Fornecedor.cnpj == cnpj)
-    if email:
-        query = query.filter(Fornecedor.email.ilike(f"%{email}%"))
-
-    fornecedores = query.all()
-    if not fornecedores:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Nenhum fornecedor encontrado"
-        )
-
-    return fornecedores
+    await db.delete(fornecedor)
+    await dataset_generations.bump(db, "fornecedores", "produtos")
+    await db.commit()
+    entity_cache.invalidate("fornecedores", fornecedor_id)
+    # Produtos deste fornecedor ficam com fornecedor_id nulo
+    entity_cache.invalidate_namespace("produtos")
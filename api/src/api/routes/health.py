@@ -1,11 +1,23 @@
-from fastapi import APIRouter  # type: ignore
+from fastapi import APIRouter, Request, Response, status  # type: ignore
 
-from ...models.healthcheck import HealthResponse
+from ...core.timing import TimedRoute
+from ...models.healthcheck import HealthResponse, ReadinessResponse
 from ...services.health_check import HealthService
 
-router = APIRouter(tags=["Health"])
+router = APIRouter(tags=["Health"], route_class=TimedRoute)
 
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
-    return HealthService.get_health_status()
+    return await HealthService.get_health_status()
+
+
+@router.get("/health/ready", response_model=ReadinessResponse)
+async def readiness(request: Request, response: Response):
+    """
+    Retorna 503 até o aquecimento do lifespan terminar.
+    """
+    pronto = getattr(request.app.state, "ready", False)
+    if not pronto:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return ReadinessResponse(ready=pronto)
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Response  # type: ignore
+
+from ...core.metrics import render_metrics
+from ...core.timing import TimedRoute
+
+router = APIRouter(tags=["Métricas"], route_class=TimedRoute)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metricas():
+    """
+    Expõe as métricas da API no formato texto do Prometheus.
+    """
+    conteudo, content_type = render_metrics()
+    return Response(content=conteudo, media_type=content_type)
@@ -0,0 +1,16 @@
+from fastapi import APIRouter  # type: ignore
+
+from ...core.database import pool_stats
+from ...core.timing import TimedRoute
+from ...models.pool import PoolStatsResponse
+
+router = APIRouter(tags=["Pool"], route_class=TimedRoute)
+
+
+@router.get("/pool/stats", response_model=PoolStatsResponse)
+async def estatisticas_pool():
+    """
+    Retorna a configuração do pool de conexões, a ocupação atual e as esperas
+    por checkout.
+    """
+    return pool_stats()
@@ -1,46 +1,139 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status  # type: ignore
-from sqlalchemy.orm import Session  # type: ignore
-
-from ...core.database import get_db
+from fastapi import (  # type: ignore
+    APIRouter,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy import select  # type: ignore
+from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore
+
+from ...core.bulk import bulk_insert, read_bulk_rows
+from ...core.cache import entity_cache
+from ...core.database import get_db, get_read_db
+from ...core.etag import conditional_get
+from ...core.generations import dataset_generations
+from ...core.pagination import paginate
+from ...core.search import fulltext_search
+from ...core.serialization import fast_json_response, select_response
+from ...core.snapshot import snapshot_get
+from ...core.timing import TimedRoute
+from ...models.bulk import BulkResponse
+from ...models.categorias import Categoria
 from ...models.produtos import Produto, ProdutoCreate, ProdutoResponse, ProdutoUpdate
 
-router = APIRouter(tags=["Produtos"])
+router = APIRouter(tags=["Produtos"], route_class=TimedRoute)
 
 
 @router.post(
     "/produtos", response_model=ProdutoResponse, status_code=status.HTTP_201_CREATED
 )
-async def criar_produto(produto: ProdutoCreate, db: Session = Depends(get_db)):
+async def criar_produto(produto: ProdutoCreate, db: AsyncSession = Depends(get_db)):
     """
     Cria um novo produto.
     """
     db_produto = Produto(**produto.dict())
     db.add(db_produto)
-    db.commit()
-    db.refresh(db_produto)
+    await dataset_generations.bump(db, "produtos")
+    await db.commit()
+    await db.refresh(db_produto)
 
     return db_produto
 
 
-@router.get("/produtos", response_model=List[ProdutoResponse])
+@router.post("/produtos/bulk", response_model=BulkResponse)
+async def criar_produtos_em_lote(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Cria produtos em lote a partir de um array JSON ou de NDJSON.
+    Retorna a quantidade inserida e os erros por índice de registro.
+    """
+    rows = await read_bulk_rows(request)
+    return await bulk_insert(db, Produto, ProdutoCreate, rows, "produtos")
+
+
+@router.get(
+    "/produtos",
+    response_model=List[ProdutoResponse],
+    dependencies=[conditional_get("produtos"), snapshot_get("produtos")],
+)
 async def listar_produtos(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Lista todos os produtos com paginação.
+    Para páginas profundas, envie o `cursor` recebido no cabeçalho `X-Next-Cursor`.
     """
-    produtos = db.query(Produto).offset(skip).limit(limit).all()
+    rows = await paginate(
+        db,
+        select_response(Produto, ProdutoResponse),
+        response,
+        (Produto.id,),
+        cursor,
+        skip,
+        limit,
+        mappings=True,
+    )
+    return fast_json_response(rows, response)
+
+
+@router.get(
+    "/produtos/buscar",
+    response_model=List[ProdutoResponse],
+    dependencies=[conditional_get("produtos")],
+)
+async def buscar_produtos(
+    q: Optional[str] = None,
+    nome: Optional[str] = None,
+    categoria: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Busca produtos por texto (nome e descrição) e categoria.
+    Resultados ordenados por relevância; `nome` é aceito como sinônimo de `q`.
+    """
+    query = select(Produto)
+
+    if categoria:
+        query = query.join(Produto.categoria).where(
+            Categoria.nome.ilike(f"%{categoria}%")
+        )
+
+    produtos = await fulltext_search(
+        db,
+        query,
+        (Produto.nome, Produto.descricao),
+        q or nome,
+        Produto.id,
+        skip,
+        limit,
+    )
+    if not produtos:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Nenhum produto encontrado"
+        )
+
     return produtos
 
 
-@router.get("/produtos/{produto_id}", response_model=ProdutoResponse)
-async def obter_produto(produto_id: int, db: Session = Depends(get_db)):
+@router.get(
+    "/produtos/{produto_id}",
+    response_model=ProdutoResponse,
+    dependencies=[conditional_get("produtos"), snapshot_get("produtos")],
+)
+async def obter_produto(produto_id: int, db: AsyncSession = Depends(get_read_db)):
     """
     Obtém um produto específico pelo ID.
     """
-    produto = db.query(Produto).filter(Produto.id == produto_id).first()
+    produto = await entity_cache.get_or_load(db, Produto, ProdutoResponse, produto_id)
     if not produto:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Produto não encontrado"
@@ -49,28 +142,30 @@ async def obter_produto(produto_id: int, db: Session = Depends(get_db)):
 
 
 @router.delete("/produtos/{produto_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def deletar_produto(produto_id: int, db: Session = Depends(get_db)):
+async def deletar_produto(produto_id: int, db: AsyncSession = Depends(get_db)):
     """
     Deleta um produto específico pelo ID.
     """
-    produto = db.query(Produto).filter(Produto.id == produto_id).first()
+    produto = await db.get(Produto, produto_id)
     if not produto:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Produto não encontrado"
         )
 
-    db.delete(produto)
-    db.commit()
+    await db.delete(produto)
+    await dataset_generations.bump(db, "produtos", "itens_venda")
+    await db.commit()
+    entity_cache.invalidate("produtos", produto_id)
 
 
 @router.put("/produtos/{produto_id}", response_model=ProdutoResponse)
 async def atualizar_produto(
-    produto_id: int, produto: ProdutoUpdate, db: Session = Depends(get_db)
+    produto_id: int, produto: ProdutoUpdate, db: AsyncSession = Depends(get_db)
 ):
     """
     Atualiza um produto específico pelo ID.
     """
-    db_produto = db.query(Produto).filter(Produto.id == produto_id).first()
+    db_produto = await db.get(Produto, produto_id)
     if not db_produto:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Produto não encontrado"
@@ -79,31 +174,8 @@ async def atualizar_produto(
     for key, value in produto.dict(exclude_unset=True).items():
         setattr(db_produto, key, value)
 
-    db.commit()
-    db.refresh(db_produto)
+    await dataset_generations.bump(db, "produtos")
+    await db.commit()
+    entity_cache.invalidate("produtos", produto_id)
+    await db.refresh(db_produto)
     return db_produto
-
-
-@router.get("/produtos/buscar")
-async def buscar_produtos(
-    nome: Optional[str] = None,
-    categoria: Optional[str] = None,
-    db: Session = Depends(get_db),
-):
-    """
-    Busca endereços por cliente, CEP ou logradouro.
-    """
-    query = db.query(Produto)
-
-    if nome:
-        query = query.filter(Produto.nome.ilike(f"%{nome}%"))
-    if categoria:
-        query = query.filter(Produto.categoria.ilike(f"%{categoria}%"))
-
-    produtos = query.all()
-    if not produtos:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Nenhum produto encontrado"
-        )
-
-    return produtos
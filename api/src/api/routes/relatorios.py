@@ -0,0 +1,152 @@
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends  # type: ignore
+from sqlalchemy import func, select  # type: ignore
+from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore
+
+from ...core.database import get_read_db
+from ...core.etag import conditional_get
+from ...core.timing import TimedRoute
+from ...models.relatorios import (
+    RelatorioCategoriaResponse,
+    RelatorioFornecedorResponse,
+    RelatorioMetodoPagamentoResponse,
+    RelatorioVendasDiaResponse,
+    ResumoItensDia,
+    ResumoVendasDia,
+)
+
+router = APIRouter(tags=["Relatórios"], route_class=TimedRoute)
+
+
+def _filtrar_periodo(query, coluna, inicio: Optional[date], fim: Optional[date]):
+    if inicio:
+        query = query.where(coluna >= inicio)
+    if fim:
+        query = query.where(coluna <= fim)
+    return query
+
+
+def _filtrar_vendas(
+    query, inicio: Optional[date], fim: Optional[date], incluir_canceladas: bool
+):
+    query = _filtrar_periodo(query, ResumoVendasDia.dia, inicio, fim)
+    if not incluir_canceladas:
+        query = query.where(ResumoVendasDia.status != "Cancelado")
+    return query
+
+
+@router.get(
+    "/relatorios/vendas-diarias",
+    response_model=List[RelatorioVendasDiaResponse],
+    dependencies=[conditional_get("resumo_vendas_dia")],
+)
+async def relatorio_vendas_diarias(
+    inicio: Optional[date] = None,
+    fim: Optional[date] = None,
+    incluir_canceladas: bool = False,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Receita e quantidade de vendas por dia, lidas da tabela de resumo.
+
+    Os resumos de todas as rotas de relatórios são recalculados pela Lambda
+    diária: vendas feitas pela API depois da última execução só aparecem na
+    seguinte, e alterações ou exclusões de vendas mais antigas que
+    `RESUMOS_JANELA_DIAS` dias só aparecem quando os resumos são reconstruídos.
+    """
+    query = select(
+        ResumoVendasDia.dia,
+        func.sum(ResumoVendasDia.num_vendas).label("num_vendas"),
+        func.sum(ResumoVendasDia.subtotal).label("subtotal"),
+        func.sum(ResumoVendasDia.frete).label("frete"),
+        func.sum(ResumoVendasDia.total).label("total"),
+    )
+    query = _filtrar_vendas(query, inicio, fim, incluir_canceladas)
+    query = query.group_by(ResumoVendasDia.dia).order_by(ResumoVendasDia.dia)
+
+    return (await db.execute(query)).mappings().all()
+
+
+@router.get(
+    "/relatorios/metodos-pagamento",
+    response_model=List[RelatorioMetodoPagamentoResponse],
+    dependencies=[conditional_get("resumo_vendas_dia")],
+)
+async def relatorio_metodos_pagamento(
+    inicio: Optional[date] = None,
+    fim: Optional[date] = None,
+    incluir_canceladas: bool = False,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Receita e quantidade de vendas por método de pagamento no período.
+    """
+    query = select(
+        ResumoVendasDia.metodo_pagamento,
+        func.sum(ResumoVendasDia.num_vendas).label("num_vendas"),
+        func.sum(ResumoVendasDia.total).label("total"),
+    )
+    query = _filtrar_vendas(query, inicio, fim, incluir_canceladas)
+    query = query.group_by(ResumoVendasDia.metodo_pagamento).order_by(
+        ResumoVendasDia.metodo_pagamento
+    )
+
+    return (await db.execute(query)).mappings().all()
+
+
+@router.get(
+    "/relatorios/categorias",
+    response_model=List[RelatorioCategoriaResponse],
+    dependencies=[conditional_get("resumo_itens_dia")],
+)
+async def relatorio_categorias(
+    inicio: Optional[date] = None,
+    fim: Optional[date] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Itens vendidos, receita e custo por categoria no período.
+    Itens de produtos sem categoria aparecem com `categoria_id` nulo.
+    """
+    query = select(
+        func.nullif(ResumoItensDia.categoria_id, 0).label("categoria_id"),
+        func.sum(ResumoItensDia.quantidade).label("quantidade"),
+        func.sum(ResumoItensDia.receita).label("receita"),
+        func.sum(ResumoItensDia.custo).label("custo"),
+    )
+    query = _filtrar_periodo(query, ResumoItensDia.dia, inicio, fim)
+    query = query.group_by(ResumoItensDia.categoria_id).order_by(
+        ResumoItensDia.categoria_id
+    )
+
+    return (await db.execute(query)).mappings().all()
+
+
+@router.get(
+    "/relatorios/fornecedores",
+    response_model=List[RelatorioFornecedorResponse],
+    dependencies=[conditional_get("resumo_itens_dia")],
+)
+async def relatorio_fornecedores(
+    inicio: Optional[date] = None,
+    fim: Optional[date] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    Itens vendidos, receita e custo por fornecedor no período.
+    Itens de produtos sem fornecedor aparecem com `fornecedor_id` nulo.
+    """
+    query = select(
+        func.nullif(ResumoItensDia.fornecedor_id, 0).label("fornecedor_id"),
+        func.sum(ResumoItensDia.quantidade).label("quantidade"),
+        func.sum(ResumoItensDia.receita).label("receita"),
+        func.sum(ResumoItensDia.custo).label("custo"),
+    )
+    query = _filtrar_periodo(query, ResumoItensDia.dia, inicio, fim)
+    query = query.group_by(ResumoItensDia.fornecedor_id).order_by(
+        ResumoItensDia.fornecedor_id
+    )
+
+    return (await db.execute(query)).mappings().all()
@@ -1,24 +1,86 @@
-from typing import List
+from typing import List, Optional, Set
 
-from fastapi import APIRouter, Depends, HTTPException, status  # type: ignore
-from sqlalchemy.orm import Session  # type: ignore
+from fastapi import (  # type: ignore
+    APIRouter,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import JSONResponse  # type: ignore
+from sqlalchemy import select  # type: ignore
+from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore
+from sqlalchemy.orm import joinedload, noload, selectinload  # type: ignore
 
-from ...core.database import get_db
+from ...core.bulk import bulk_insert, read_bulk_rows
+from ...core.cache import entity_cache
+from ...core.database import get_db, get_read_db
+from ...core.etag import conditional_get
+from ...core.generations import dataset_generations
+from ...core.pagination import paginate
+from ...core.serialization import fast_json_response, select_response
+from ...core.snapshot import snapshot_get
+from ...core.timing import TimedRoute
+from ...models.bulk import BulkResponse
 from ...models.clientes import Cliente
 from ...models.itens_venda import ItensVendas, ItensVendasCreate
-from ...models.vendas import Venda, VendaCreate, VendaResponse
+from ...models.vendas import (
+    CheckoutCreate,
+    Venda,
+    VendaCheckoutResponse,
+    VendaCreate,
+    VendaDocumentoResponse,
+    VendaResponse,
+)
+from ...services.checkout import CheckoutService
+
+router = APIRouter(tags=["Vendas"], route_class=TimedRoute)
 
-router = APIRouter(tags=["Vendas"])
+# Valores aceitos em `expand` e o campo correspondente no documento da venda
+EXPANSOES = {"cliente": "cliente", "endereco": "endereco", "itens": "itens_venda"}
+TABELAS_DOCUMENTO = ("vendas", "itens_venda", "produtos", "clientes", "enderecos")
+# Tabelas que cada valor de `expand` acrescenta ao ETag
+TABELAS_EXPANSOES = {
+    "cliente": ("clientes",),
+    "endereco": ("enderecos",),
+    "itens": ("itens_venda", "produtos"),
+}
+
+
+async def carregar_documento_venda(
+    db: AsyncSession, venda_id: int, expand: Set[str]
+) -> Optional[Venda]:
+    """
+    Carrega a venda com os relacionamentos pedidos em `expand` usando eager
+    loading: cliente e endereço vêm no mesmo SELECT (JOIN) e os itens, junto
+    com os produtos, em um único SELECT adicional. Relacionamentos não pedidos
+    não são carregados.
+    """
+    opcoes = [
+        joinedload(Venda.cliente) if "cliente" in expand else noload(Venda.cliente),
+        (
+            joinedload(Venda.endereco)
+            if "endereco" in expand
+            else noload(Venda.endereco)
+        ),
+        (
+            selectinload(Venda.itens_venda).joinedload(ItensVendas.produto)
+            if "itens" in expand
+            else noload(Venda.itens_venda)
+        ),
+    ]
+    return await db.scalar(select(Venda).where(Venda.id == venda_id).options(*opcoes))
 
 
 @router.post(
     "/vendas", response_model=VendaResponse, status_code=status.HTTP_201_CREATED
 )
-async def criar_venda(venda: VendaCreate, db: Session = Depends(get_db)):
+async def criar_venda(venda: VendaCreate, db: AsyncSession = Depends(get_db)):
     """
     Cria uma nova venda.
     """
-    cliente = db.query(Cliente).filter(Cliente.id == venda.cliente_id).first()
+    cliente = await db.get(Cliente, venda.cliente_id)
     if not cliente:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Cliente não encontrado"
@@ -26,27 +88,106 @@ async def criar_venda(venda: VendaCreate, db: Session = Depends(get_db)):
 
     db_venda = Venda(**venda.dict())
     db.add(db_venda)
-    db.commit()
-    db.refresh(db_venda)
+    await dataset_generations.bump(db, "vendas")
+    await db.commit()
+    await db.refresh(db_venda)
 
     return db_venda
 
 
-@router.get("/vendas", response_model=List[VendaResponse])
-async def listar_vendas(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@router.post(
+    "/vendas/checkout",
+    response_model=VendaCheckoutResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def checkout_venda(pedido: CheckoutCreate, db: AsyncSession = Depends(get_db)):
+    """
+    Fecha um pedido de forma atômica: precifica os itens a partir de `produtos`,
+    cria a venda com todos os itens e baixa o estoque em uma única transação.
+    Retorna 409 se algum produto não tiver estoque suficiente.
+    """
+    return await CheckoutService.finalizar(db, pedido)
+
+
+@router.post("/vendas/bulk", response_model=BulkResponse)
+async def criar_vendas_em_lote(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Cria vendas em lote a partir de um array JSON ou de NDJSON.
+    Retorna a quantidade inserida e os erros por índice de registro.
+    """
+    rows = await read_bulk_rows(request)
+    return await bulk_insert(db, Venda, VendaCreate, rows, "vendas")
+
+
+@router.get(
+    "/vendas",
+    response_model=List[VendaResponse],
+    dependencies=[conditional_get("vendas"), snapshot_get("vendas")],
+)
+async def listar_vendas(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
     """
     Lista todas as vendas com paginação.
+    Para páginas profundas, envie o `cursor` recebido no cabeçalho `X-Next-Cursor`.
     """
-    vendas = db.query(Venda).offset(skip).limit(limit).all()
-    return vendas
+    rows = await paginate(
+        db,
+        select_response(Venda, VendaResponse),
+        response,
+        (Venda.id,),
+        cursor,
+        skip,
+        limit,
+        mappings=True,
+    )
+    return fast_json_response(rows, response)
 
 
-@router.get("/vendas/{venda_id}", response_model=VendaResponse)
-async def obter_venda(venda_id: int, db: Session = Depends(get_db)):
+@router.get(
+    "/vendas/{venda_id}",
+    response_model=VendaResponse,
+    dependencies=[
+        conditional_get("vendas", expansoes=TABELAS_EXPANSOES),
+        snapshot_get("vendas"),
+    ],
+)
+async def obter_venda(
+    venda_id: int,
+    response: Response,
+    expand: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
     """
     Obtém uma venda específica pelo ID.
+    Use `expand=cliente,endereco,itens` para incluir os relacionamentos na resposta.
     """
-    venda = db.query(Venda).filter(Venda.id == venda_id).first()
+    if expand:
+        expandir = {e.strip() for e in expand.split(",") if e.strip()}
+        invalidas = expandir - EXPANSOES.keys()
+        if invalidas:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Valores inválidos em expand: {', '.join(sorted(invalidas))}",
+            )
+
+        venda = await carregar_documento_venda(db, venda_id, expandir)
+        if not venda:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Venda não encontrada"
+            )
+        omitir = {campo for e, campo in EXPANSOES.items() if e not in expandir}
+        documento = VendaDocumentoResponse.model_validate(venda)
+        return JSONResponse(
+            content=documento.model_dump(mode="json", exclude=omitir),
+            headers=dict(response.headers),
+        )
+
+    venda = await entity_cache.get_or_load(db, Venda, VendaResponse, venda_id)
     if not venda:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Venda não encontrada"
@@ -54,18 +195,44 @@ async def obter_venda(venda_id: int, db: Session = Depends(get_db)):
     return venda
 
 
-@router.get("/vendas/cliente/{cliente_id}", response_model=List[VendaResponse])
-async def obter_venda_por_cliente(cliente_id: int, db: Session = Depends(get_db)):
+@router.get(
+    "/vendas/{venda_id}/documento",
+    response_model=VendaDocumentoResponse,
+    dependencies=[conditional_get(*TABELAS_DOCUMENTO)],
+)
+async def obter_documento_venda(venda_id: int, db: AsyncSession = Depends(get_read_db)):
+    """
+    Obtém o documento completo de uma venda: cliente, endereço de entrega e
+    itens com os respectivos produtos, em duas consultas ao banco.
+    """
+    venda = await carregar_documento_venda(db, venda_id, set(EXPANSOES))
+    if not venda:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Venda não encontrada"
+        )
+    return venda
+
+
+@router.get(
+    "/vendas/cliente/{cliente_id}",
+    response_model=List[VendaResponse],
+    dependencies=[conditional_get("vendas")],
+)
+async def obter_venda_por_cliente(
+    cliente_id: int, db: AsyncSession = Depends(get_read_db)
+):
     """
     Obtém a venda de um cliente específico.
     """
-    cliente = db.query(Cliente).filter(Cliente.id == cliente_id).first()
+    cliente = await db.get(Cliente, cliente_id)
     if not cliente:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Cliente não encontrado"
         )
 
-    vendas = db.query(Venda).filter(Venda.cliente_id == cliente_id).all()
+    vendas = (
+        await db.scalars(select(Venda).where(Venda.cliente_id == cliente_id))
+    ).all()
     if not vendas:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -75,68 +242,78 @@ async def obter_venda_por_cliente(cliente_id: int, db: Session = Depends(get_db)
 
 
 @router.delete("/vendas/{venda_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def deletar_venda(venda_id: int, db: Session = Depends(get_db)):
+async def deletar_venda(venda_id: int, db: AsyncSession = Depends(get_db)):
     """
     Deleta uma venda específica pelo ID.
     Os itens da venda serão deletados automaticamente devido ao CASCADE.
     """
-    venda = db.query(Venda).filter(Venda.id == venda_id).first()
+    venda = await db.get(Venda, venda_id)
     if not venda:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Venda não encontrada"
         )
 
-    db.delete(venda)
-    db.commit()
+    await db.delete(venda)
+    await dataset_generations.bump(db, "vendas", "itens_venda")
+    await db.commit()
+    entity_cache.invalidate("vendas", venda_id)
 
 
 @router.delete("/vendas/cliente/{cliente_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def deletar_venda_por_cliente(cliente_id: int, db: Session = Depends(get_db)):
+async def deletar_venda_por_cliente(
+    cliente_id: int, db: AsyncSession = Depends(get_db)
+):
     """
     Deleta a venda de um cliente específico.
     """
     # Verifica se o cliente existe
-    cliente = db.query(Cliente).filter(Cliente.id == cliente_id).first()
+    cliente = await db.get(Cliente, cliente_id)
     if not cliente:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Cliente não encontrado"
         )
 
-    venda = db.query(Venda).filter(Venda.cliente_id == cliente_id).first()
+    venda = await db.scalar(
+        select(Venda).where(Venda.cliente_id == cliente_id).limit(1)
+    )
     if not venda:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Venda não encontrada para este cliente",
         )
 
-    db.delete(venda)
-    db.commit()
+    await db.delete(venda)
+    await dataset_generations.bump(db, "vendas", "itens_venda")
+    await db.commit()
+    entity_cache.invalidate("vendas", venda.id)
 
 
-@router.get("/vendas/{venda_id}/itens")
-async def obter_itens_venda(venda_id: int, db: Session = Depends(get_db)):
+@router.get("/vendas/{venda_id}/itens", dependencies=[conditional_get("itens_venda")])
+async def obter_itens_venda(venda_id: int, db: AsyncSession = Depends(get_read_db)):
     """
     Obtém todos os itens de uma venda específica.
     """
     # Verifica se a venda existe
-    venda = db.query(Venda).filter(Venda.id == venda_id).first()
+    venda = await db.get(Venda, venda_id)
     if not venda:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Venda não encontrada"
         )
 
-    itens = db.query(ItensVendas).filter(ItensVendas.venda_id == venda_id).all()
-    return itens
+    itens = await db.scalars(
+        select(ItensVendas).where(ItensVendas.venda_id == venda_id)
+    )
+    return itens.all()
 
 
 @router.post("/vendas/{venda_id}/itens")
 async def adicionar_item_venda(
-    venda_id: int, item: ItensVendasCreate, db: Session = Depends(get_db)
+    venda_id: int, item: ItensVendasCreate, db: AsyncSession = Depends(get_db)
 ):
     """
     Adiciona um item à venda.
     """
-    venda = db.query(Venda).filter(Venda.id == venda_id).first()
+    venda = await db.get(Venda, venda_id)
     if not venda:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Venda não encontrada"
@@ -144,22 +321,35 @@ async def adicionar_item_venda(
 
     novo_item = ItensVendas(**item.dict(), venda_id=venda_id)
     db.add(novo_item)
-    db.commit()
-    db.refresh(novo_item)
+    await dataset_generations.bump(db, "itens_venda")
+    await db.commit()
+    await db.refresh(novo_item)
     return novo_item
 
 
+@router.post("/vendas/itens/bulk", response_model=BulkResponse)
+async def adicionar_itens_venda_em_lote(
+    request: Request, db: AsyncSession = Depends(get_db)
+):
+    """
+    Adiciona itens a vendas em lote a partir de um array JSON ou de NDJSON.
+    Cada registro informa o `venda_id` do item.
+    """
+    rows = await read_bulk_rows(request)
+    return await bulk_insert(db, ItensVendas, ItensVendasCreate, rows, "itens_venda")
+
+
 @router.delete("/vendas/{venda_id}/itens/{item_id}")
 async def remover_item_venda(
-    venda_id: int, item_id: int, db: Session = Depends(get_db)
+    venda_id: int, item_id: int, db: AsyncSession = Depends(get_db)
 ):
     """
     Remove um item específico da venda.
     """
-    item = (
-        db.query(ItensVendas)
-        .filter(ItensVendas.id == item_id, ItensVendas.venda_id == venda_id)
-        .first()
+    item = await db.scalar(
+        select(ItensVendas).where(
+            ItensVendas.id == item_id, ItensVendas.venda_id == venda_id
+        )
     )
     if not item:
         raise HTTPException(
@@ -167,6 +357,7 @@ async def remover_item_venda(
             detail="Item não encontrado na venda",
         )
 
-    db.delete(item)
-    db.commit()
+    await db.delete(item)
+    await dataset_generations.bump(db, "itens_venda")
+    await db.commit()
     return {"detail": "Item removido com sucesso"}
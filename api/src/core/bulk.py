@@ -0,0 +1,133 @@
+import json
+from typing import Any, Dict, List
+
+from fastapi import HTTPException, Request, status  # type: ignore
+from pydantic import TypeAdapter, ValidationError  # type: ignore
+from sqlalchemy import insert  # type: ignore
+from sqlalchemy.exc import DBAPIError  # type: ignore
+from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore
+
+from ..models.bulk import BulkErro, BulkResponse
+from .config import settings
+from .generations import dataset_generations
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson")
+
+
+async def read_bulk_rows(request: Request) -> List[Any]:
+    """
+    Lê o corpo de uma requisição em lote: um array JSON ou NDJSON (um objeto
+    por linha). Linhas NDJSON inválidas são mantidas como texto para serem
+    reportadas como erro da linha correspondente.
+    """
+    body = await request.body()
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+
+    if content_type in NDJSON_CONTENT_TYPES:
+        rows = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                rows.append(line.decode("utf-8", errors="replace"))
+    else:
+        try:
+            rows = json.loads(body)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="JSON inválido"
+            )
+        if not isinstance(rows, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="O corpo deve ser um array JSON ou NDJSON",
+            )
+
+    if len(rows) > settings.BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Máximo de {settings.BULK_MAX_ROWS} registros por requisição",
+        )
+    return rows
+
+
+def _validate_chunk(adapter: TypeAdapter, schema, chunk: List[Any], offset: int):
+    """
+    Valida o lote inteiro de uma vez; se houver erros, valida apenas as
+    linhas restantes individualmente para separar as válidas das inválidas.
+    """
+    try:
+        return list(enumerate(adapter.validate_python(chunk), offset)), []
+    except ValidationError as exc:
+        invalidas: Dict[int, str] = {}
+        for error in exc.errors():
+            indice = error["loc"][0]
+            campo = ".".join(str(p) for p in error["loc"][1:])
+            invalidas.setdefault(indice, f"{campo}: {error['msg']}".lstrip(": "))
+
+    validas = []
+    for i, row in enumerate(chunk):
+        if i in invalidas:
+            continue
+        try:
+            validas.append((offset + i, schema.model_validate(row)))
+        except ValidationError as exc:
+            invalidas[i] = str(exc)
+    erros = [BulkErro(indice=offset + i, erro=msg) for i, msg in invalidas.items()]
+    return validas, erros
+
+
+async def bulk_insert(
+    db: AsyncSession, model, schema, rows: List[Any], tabela: str
+) -> BulkResponse:
+    """
+    Insere `rows` em `model` em lotes de `BULK_CHUNK_SIZE`.
+
+    Cada lote é validado de uma vez e gravado com um único INSERT de várias
+    linhas (executemany) e um commit. Se o banco rejeitar o lote (ex.: CPF
+    duplicado ou chave estrangeira inexistente), somente esse lote é refeito
+    linha a linha, cada linha em um SAVEPOINT da mesma transação, para
+    identificar os registros com erro; as linhas aceitas são gravadas com um
+    único incremento de geração e um commit.
+    """
+    adapter = TypeAdapter(List[schema])
+    chunk_size = settings.BULK_CHUNK_SIZE
+    inseridos = 0
+    erros: List[BulkErro] = []
+
+    for offset in range(0, len(rows), chunk_size):
+        validas, erros_validacao = _validate_chunk(
+            adapter, schema, rows[offset : offset + chunk_size], offset
+        )
+        erros.extend(erros_validacao)
+        if not validas:
+            continue
+
+        try:
+            await db.execute(insert(model), [item.dict() for _, item in validas])
+            await dataset_generations.bump(db, tabela)
+            await db.commit()
+            inseridos += len(validas)
+            continue
+        except DBAPIError:
+            await db.rollback()
+
+        inseridos_lote = 0
+        for indice, item in validas:
+            try:
+                async with db.begin_nested():
+                    await db.execute(insert(model), [item.dict()])
+                inseridos_lote += 1
+            except DBAPIError as exc:
+                erros.append(BulkErro(indice=indice, erro=str(exc.orig)))
+        if inseridos_lote:
+            await dataset_generations.bump(db, tabela)
+            await db.commit()
+            inseridos += inseridos_lote
+        else:
+            await db.rollback()
+
+    erros.sort(key=lambda e: e.indice)
+    return BulkResponse(recebidos=len(rows), inseridos=inseridos, erros=erros)
@@ -0,0 +1,164 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore
+
+from .config import settings
+from .generations import dataset_generations
+
+
+class EntityCache:
+    """
+    Cache em memória, limitado e com LRU, para as consultas por ID.
+
+    As entradas são agrupadas por namespace (o nome da tabela) e cada namespace
+    pode ter o seu próprio TTL. O cache é local ao processo: as rotas de escrita
+    invalidam as entradas afetadas no próprio worker, e cada entrada guarda a
+    versão (a geração da tabela) em que foi lida, então escritas feitas por
+    outros workers ou pela carga diária a descartam assim que a nova geração
+    é vista, em até GENERATION_REFRESH_SECONDS.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        default_ttl: int,
+        ttls: Optional[Dict[str, int]] = None,
+        enabled: bool = True,
+    ):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls or {})
+        self.enabled = enabled
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any, Any]]" = (
+            OrderedDict()
+        )
+        # Engines (primário e réplica) que já tiveram entradas carregadas
+        self._origens: Set[Any] = set()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def ttl_for(self, namespace: str) -> int:
+        return self.ttls.get(namespace, self.default_ttl)
+
+    def get(
+        self, namespace: str, key: Hashable, version: Any = None
+    ) -> Optional[Any]:
+        """
+        Com `version`, entradas gravadas com outra versão contam como falha.
+        """
+        if not self.enabled:
+            return None
+
+        entry = self._entries.get((namespace, key))
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, entry_version, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[(namespace, key)]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        if version is not None and entry_version != version:
+            del self._entries[(namespace, key)]
+            self.invalidations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end((namespace, key))
+        self.hits += 1
+        return value
+
+    def set(
+        self, namespace: str, key: Hashable, value: Any, version: Any = None
+    ) -> Any:
+        if not self.enabled:
+            return value
+
+        self._entries[(namespace, key)] = (
+            time.monotonic() + self.ttl_for(namespace),
+            version,
+            value,
+        )
+        self._entries.move_to_end((namespace, key))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def invalidate(self, namespace: str, key: Hashable) -> None:
+        chaves = [(namespace, key)]
+        chaves += [(namespace, (origem, key)) for origem in self._origens]
+        for chave in chaves:
+            if self._entries.pop(chave, None) is not None:
+                self.invalidations += 1
+
+    def invalidate_namespace(self, namespace: str) -> None:
+        keys = [k for k in self._entries if k[0] == namespace]
+        for k in keys:
+            del self._entries[k]
+        self.invalidations += len(keys)
+
+    def clear(self) -> None:
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    async def get_or_load(self, db: AsyncSession, model, schema, entity_id: int):
+        """
+        Leitura com read-through: devolve o schema de resposta em cache ou
+        carrega a linha pelo ID, valida com `schema` e armazena o resultado.
+        Linhas inexistentes não são armazenadas.
+
+        A chave inclui o engine da sessão, então linhas lidas de uma réplica
+        atrasada nunca são servidas a leituras no primário, e a versão é a
+        geração da tabela lida desse mesmo engine, a mesma usada no ETag.
+        """
+        namespace = model.__tablename__
+        geracao = await dataset_generations.get(db, namespace)
+        cached = self.get(namespace, (db.bind, entity_id), geracao)
+        if cached is not None:
+            return cached
+
+        obj = await db.get(model, entity_id)
+        if obj is None:
+            return None
+        return self.set_entity(
+            db, namespace, entity_id, schema.model_validate(obj), geracao
+        )
+
+    def set_entity(
+        self, db: AsyncSession, namespace: str, entity_id: int, value: Any, geracao
+    ) -> Any:
+        """
+        Armazena uma entidade lida por `db` na geração `geracao` da tabela.
+        """
+        self._origens.add(db.bind)
+        return self.set(namespace, (db.bind, entity_id), value, geracao)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+entity_cache = EntityCache(
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    default_ttl=settings.CACHE_TTL_SECONDS,
+    ttls=settings.CACHE_TTLS,
+    enabled=settings.CACHE_ENABLED,
+)
@@ -0,0 +1,230 @@
+import gzip
+import zlib
+from typing import List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders  # type: ignore
+from starlette.responses import Response  # type: ignore
+
+from .cache import EntityCache
+from .config import settings
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # pragma: no cover - brotli é opcional
+    brotli = None
+
+# Cabeçalhos guardados junto com o corpo comprimido; os de CORS e o
+# Server-Timing são recalculados pelos middlewares a cada resposta.
+CABECALHOS_CACHEADOS = ("content-type", "etag", "cache-control", "x-next-cursor")
+
+
+CODIFICACOES = ("br", "gzip")
+
+
+def etag_codificado(etag: str, encoding: Optional[str]) -> str:
+    """
+    ETag da representação em `encoding`: o ETag da resposta sem codificação
+    com o sufixo da codificação (`"<etag>-br"`), para que cada representação
+    tenha um validador forte próprio.
+    """
+    if encoding is None:
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Escolhe brotli ou gzip a partir do Accept-Encoding, preferindo brotli.
+    Codificações com `q=0` são ignoradas.
+    """
+    aceitas = set()
+    for parte in accept_encoding.lower().split(","):
+        nome, _, params = parte.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        aceitas.add(nome.strip())
+    if brotli is not None and "br" in aceitas:
+        return "br"
+    if "gzip" in aceitas:
+        return "gzip"
+    return None
+
+
+def compressible(content_type: str) -> bool:
+    tipo = content_type.split(";")[0].strip().lower()
+    return tipo in settings.COMPRESSION_CONTENT_TYPES
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL)
+
+
+class _StreamCompressor:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(
+                quality=settings.COMPRESSION_BROTLI_QUALITY
+            )
+            self._process = self._compressor.process
+            self._finish = self._compressor.finish
+        else:
+            self._compressor = zlib.compressobj(
+                settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31
+            )
+            self._process = self._compressor.compress
+            self._finish = self._compressor.flush
+
+    def process(self, chunk: bytes) -> bytes:
+        return self._process(chunk)
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+class ReadyResponse(Exception):
+    """
+    Levantada por dependências que já têm a resposta pronta (corpo comprimido
+    em cache, snapshot diário); o handler em `main.py` devolve `response` sem
+    rodar a rota.
+    """
+
+    def __init__(self, response: Response):
+        self.response = response
+
+
+class CompressedCache(EntityCache):
+    """
+    Corpos de resposta já comprimidos, indexados por (codificação, ETag da
+    resposta sem codificação). Os cabeçalhos guardados já trazem o ETag com o
+    sufixo da codificação.
+
+    O ETag muda a cada nova geração das tabelas, então uma entrada nunca é
+    servida desatualizada; o TTL e o limite de entradas só limitam a memória.
+    """
+
+    def store(
+        self, encoding: str, etag: str, body: bytes, headers: List[Tuple[str, str]]
+    ) -> None:
+        self.set(encoding, etag, (body, headers))
+
+    def response_for(self, encoding: Optional[str], etag: str) -> Optional[Response]:
+        if encoding is None:
+            return None
+        cached = self.get(encoding, etag)
+        if cached is None:
+            return None
+        body, headers = cached
+        response = Response(content=body)
+        response.headers.update(dict(headers))
+        response.headers["Content-Encoding"] = encoding
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+
+compressed_cache = CompressedCache(
+    max_entries=settings.COMPRESSION_CACHE_ENTRIES,
+    default_ttl=settings.COMPRESSION_CACHE_TTL_SECONDS,
+    enabled=settings.COMPRESSION_CACHE_ENABLED,
+)
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI que comprime com brotli ou gzip as respostas de tipos
+    textuais acima de `COMPRESSION_MIN_SIZE` bytes.
+
+    O ETag de uma resposta comprimida recebe o sufixo da codificação
+    (`etag_codificado`). Respostas completas são comprimidas de uma vez e, se
+    tiverem ETag, o resultado é guardado em `compressed_cache`. Respostas em streaming (sem
+    Content-Length) são comprimidas incrementalmente.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", "")
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        estado = {"start": None, "compressor": None, "passthrough": False}
+
+        async def send_comprimido(message):
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" in headers or not compressible(
+                    headers.get("content-type", "")
+                ):
+                    estado["passthrough"] = True
+                    await send(message)
+                else:
+                    estado["start"] = message
+                return
+
+            if message["type"] != "http.response.body" or estado["passthrough"]:
+                await send(message)
+                return
+
+            start = estado["start"]
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start is not None and not more_body:
+                estado["start"] = None
+                if len(body) < settings.COMPRESSION_MIN_SIZE:
+                    await send(start)
+                    await send(message)
+                    return
+                comprimido = compress(body, encoding)
+                headers = MutableHeaders(raw=start["headers"])
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(comprimido))
+                headers.add_vary_header("Accept-Encoding")
+                if "etag" in headers:
+                    etag = headers["etag"]
+                    headers["ETag"] = etag_codificado(etag, encoding)
+                if start["status"] == 200 and "etag" in headers:
+                    compressed_cache.store(
+                        encoding,
+                        etag,
+                        comprimido,
+                        [
+                            (nome, headers[nome])
+                            for nome in CABECALHOS_CACHEADOS
+                            if nome in headers
+                        ],
+                    )
+                await send(start)
+                await send({"type": "http.response.body", "body": comprimido})
+                return
+
+            if start is not None:
+                estado["start"] = None
+                estado["compressor"] = _StreamCompressor(encoding)
+                headers = MutableHeaders(raw=start["headers"])
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if "etag" in headers:
+                    headers["ETag"] = etag_codificado(headers["etag"], encoding)
+                if "content-length" in headers:
+                    del headers["content-length"]
+                await send(start)
+
+            compressor = estado["compressor"]
+            dados = compressor.process(body)
+            if not more_body:
+                dados += compressor.finish()
+            await send(
+                {"type": "http.response.body", "body": dados, "more_body": more_body}
+            )
+
+        await self.app(scope, receive, send_comprimido)
@@ -1,4 +1,5 @@
 import os
+from typing import Dict, List
 
 from pydantic_settings import BaseSettings  # type: ignore
 
@@ -19,13 +20,74 @@ class Settings(BaseSettings):
     DB_NAME: str = "ecommerce"
     DB_USER: str = os.getenv("DB_USER", "user")
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "password")
+    DB_DRIVER: str = "aiomysql"
+    DB_READ_URL: str = os.getenv("DB_READ_URL", "")
+    DB_REPLICA_LAG_SECONDS: float = 2.0
+
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_USE_LIFO: bool = True
+    DB_POOL_WAIT_LOG_MS: float = 100.0
 
     API_PREFIX: str = "/api/v1"
 
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    WORKERS: int = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+    WARMUP_ENABLED: bool = True
+    WARMUP_CONNECTIONS: int = 5
+    WARMUP_CACHE_LIMIT: int = 1000
+    WARMUP_RETRY_SECONDS: float = 5.0
+
+    CACHE_ENABLED: bool = True
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_TTL_SECONDS: int = 300
+    CACHE_TTLS: Dict[str, int] = {
+        "categorias": 3600,
+        "fornecedores": 3600,
+        "produtos": 900,
+        "clientes": 900,
+    }
+
+    GENERATION_REFRESH_SECONDS: float = 5.0
+
+    BULK_CHUNK_SIZE: int = 1000
+    BULK_MAX_ROWS: int = 50000
+
+    EXPORT_BATCH_SIZE: int = 1000
+
+    SNAPSHOT_ENABLED: bool = False
+    SNAPSHOT_DIR: str = "/tmp/snapshots"
+    SNAPSHOT_BUCKET: str = os.getenv("SNAPSHOT_BUCKET", "")
+    SNAPSHOT_PREFIX: str = "snapshots"
+    SNAPSHOT_REFRESH_SECONDS: float = 300.0
+
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_CONTENT_TYPES: List[str] = [
+        "application/json",
+        "application/x-ndjson",
+        "text/csv",
+        "text/plain",
+        "text/html",
+    ]
+    COMPRESSION_CACHE_ENABLED: bool = True
+    COMPRESSION_CACHE_ENTRIES: int = 2000
+    COMPRESSION_CACHE_TTL_SECONDS: int = 3600
+
+    SLOW_QUERY_MS: float = 200.0
+    QUERY_BUDGET: int = 10
+
     @property
     def DB_URL(self) -> str:
-        """Constrói a URL de conexão para MySQL usando PyMySQL."""
-        return f"mysql+pymysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+        """Constrói a URL de conexão assíncrona para MySQL (aiomysql por padrão)."""
+        return f"mysql+{self.DB_DRIVER}://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
     class Config:
         env_file = ".env"
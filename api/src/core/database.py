@@ -1,18 +1,152 @@
-from sqlalchemy import create_engine  # type: ignore
-from sqlalchemy.orm import sessionmaker  # type: ignore
+import math
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Request  # type: ignore
+from sqlalchemy import event  # type: ignore
+from sqlalchemy.ext.asyncio import (  # type: ignore
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session  # type: ignore
 
 from .config import settings
+from .metrics import InstrumentedQueuePool, instrument_engine
+
+ULTIMA_ESCRITA_COOKIE = "ultima_escrita"
+
+
+def _criar_engine(url: str):
+    return create_async_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_use_lifo=settings.DB_POOL_USE_LIFO,
+    )
+
+
+engine = _criar_engine(settings.DB_URL)
+instrument_engine(engine)
+SessionLocal = async_sessionmaker(
+    bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# Sem DB_READ_URL, as leituras usam o próprio primário
+if settings.DB_READ_URL:
+    read_engine = _criar_engine(settings.DB_READ_URL)
+    instrument_engine(read_engine, "replica")
+    ReadSessionLocal = async_sessionmaker(
+        bind=read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+else:
+    read_engine = engine
+    ReadSessionLocal = SessionLocal
+
+# Marca, por requisição, se alguma sessão fez commit
+_escrita_na_requisicao: ContextVar[Optional[dict]] = ContextVar(
+    "escrita_na_requisicao", default=None
+)
 
-engine = create_engine(settings.DB_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+@event.listens_for(Session, "after_commit")
+def _registrar_escrita(session):
+    estado = _escrita_na_requisicao.get()
+    if estado is not None:
+        estado["escreveu"] = True
 
-def get_db():
+
+async def get_db():
+    """
+    Cria uma sessão assíncrona de banco de dados para cada requisição.
+    """
+    async with SessionLocal() as db:
+        yield db
+
+
+def leitura_no_primario(request: Request) -> bool:
     """
-    Cria uma sessão de banco de dados para cada requisição.
+    Indica se a leitura deve ir ao primário: o cliente escreveu há menos de
+    DB_REPLICA_LAG_SECONDS e a réplica pode ainda não ter a escrita.
     """
-    db = SessionLocal()
+    if not settings.DB_READ_URL:
+        return True
     try:
+        ultima = float(request.cookies.get(ULTIMA_ESCRITA_COOKIE, 0))
+    except ValueError:
+        return False
+    return time.time() - ultima < settings.DB_REPLICA_LAG_SECONDS
+
+
+async def get_read_db(request: Request):
+    """
+    Sessão para as rotas GET: usa a réplica de leitura, exceto logo após uma
+    escrita do mesmo cliente (read-your-writes), quando usa o primário.
+    """
+    sessao = SessionLocal if leitura_no_primario(request) else ReadSessionLocal
+    async with sessao() as db:
         yield db
-    finally:
-        db.close()
+
+
+class ReadYourWritesMiddleware:
+    """
+    Middleware ASGI que, em respostas de requisições que fizeram commit,
+    grava o cookie `ultima_escrita` com validade de DB_REPLICA_LAG_SECONDS.
+    Enquanto o cookie existir, `get_read_db` direciona as leituras do cliente
+    para o primário.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.DB_READ_URL:
+            await self.app(scope, receive, send)
+            return
+
+        estado = {"escreveu": False}
+
+        async def send_com_cookie(message):
+            if message["type"] == "http.response.start" and estado["escreveu"]:
+                validade = max(1, math.ceil(settings.DB_REPLICA_LAG_SECONDS))
+                cookie = (
+                    f"{ULTIMA_ESCRITA_COOKIE}={time.time():.3f}; Max-Age={validade}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"set-cookie", cookie.encode())
+                ]
+            await send(message)
+
+        token = _escrita_na_requisicao.set(estado)
+        try:
+            await self.app(scope, receive, send_com_cookie)
+        finally:
+            _escrita_na_requisicao.reset(token)
+
+
+def pool_stats():
+    """
+    Retorna a configuração e a ocupação atual do pool de conexões.
+    """
+    pool = engine.pool
+    return {
+        "size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "timeout": settings.DB_POOL_TIMEOUT,
+        "recycle": settings.DB_POOL_RECYCLE,
+        "pre_ping": settings.DB_POOL_PRE_PING,
+        "use_lifo": settings.DB_POOL_USE_LIFO,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "checkouts": getattr(pool, "checkouts", 0),
+        "slow_checkouts": getattr(pool, "esperas_lentas", 0),
+        "timeouts": getattr(pool, "timeouts", 0),
+        "max_wait_ms": round(getattr(pool, "maior_espera", 0.0) * 1000, 3),
+    }
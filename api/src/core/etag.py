@@ -0,0 +1,89 @@
+import hashlib
+from typing import Dict, Optional, Sequence
+
+from fastapi import Depends, HTTPException, Request, Response, status  # type: ignore
+from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore
+
+from .compression import (
+    CODIFICACOES,
+    ReadyResponse,
+    compressed_cache,
+    etag_codificado,
+    negotiate_encoding,
+)
+from .database import get_read_db
+from .generations import dataset_generations
+
+
+def make_etag(geracoes: Dict[str, int], request: Request) -> str:
+    """Monta um ETag forte a partir das gerações das tabelas e da URL requisitada."""
+    recurso = f"{request.url.path}?{request.url.query}".encode("utf-8")
+    digest = hashlib.sha1(recurso).hexdigest()[:16]
+    versao = "-".join(f"{tabela}.{geracao}" for tabela, geracao in geracoes.items())
+    return f'"{versao}.{digest}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> Optional[str]:
+    """
+    Validador de `If-None-Match` que corresponde a `etag` em qualquer
+    representação (sem codificação ou com o sufixo de uma codificação), ou
+    None se nenhum corresponder.
+    """
+    validos = {etag, *(etag_codificado(etag, c) for c in CODIFICACOES)}
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return etag
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in validos:
+            return candidate
+    return None
+
+
+def conditional_get(
+    *tabelas: str, expansoes: Optional[Dict[str, Sequence[str]]] = None
+):
+    """
+    Dependência para GETs condicionais sobre `tabelas`. Com `expansoes`, cada
+    valor do parâmetro `expand` da requisição acrescenta as tabelas mapeadas,
+    então o ETag só depende das tabelas que a resposta de fato inclui.
+
+    Se o `If-None-Match` do cliente corresponde ao ETag atual, a requisição é
+    respondida com 304 antes do handler rodar, sem consultar linhas nem
+    serializar nada. Se já existe um corpo comprimido para esse ETag na
+    codificação aceita pelo cliente, ele é devolvido sem rodar o handler.
+    Caso contrário o ETag é adicionado à resposta.
+    """
+
+    async def dependency(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_read_db),
+    ):
+        usadas = list(tabelas)
+        if expansoes and request.query_params.get("expand"):
+            for valor in request.query_params["expand"].split(","):
+                for tabela in expansoes.get(valor.strip(), ()):
+                    if tabela not in usadas:
+                        usadas.append(tabela)
+        geracoes = await dataset_generations.get_many(db, usadas)
+        etag = make_etag(geracoes, request)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if_none_match = request.headers.get("if-none-match")
+        validador = etag_matches(if_none_match, etag) if if_none_match else None
+        if validador:
+            # O 304 repete o validador da representação que o cliente guardou
+            raise HTTPException(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={**headers, "ETag": validador},
+            )
+
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+        cached = compressed_cache.response_for(encoding, etag)
+        if cached is not None:
+            raise ReadyResponse(cached)
+        response.headers.update(headers)
+
+    return Depends(dependency)
@@ -0,0 +1,120 @@
+import time
+from typing import Any, Dict, Sequence, Tuple
+
+from sqlalchemy import select, update  # type: ignore
+from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore
+
+from ..models.geracoes_dataset import GeracaoDataset
+from .config import settings
+
+
+class DatasetGenerations:
+    """
+    Contadores de geração por tabela, usados para montar os ETags.
+
+    A geração de uma tabela é incrementada na mesma transação de qualquer
+    escrita feita pela API e pela Lambda de atualização diária. O valor lido é
+    mantido em memória por `refresh_seconds`, de modo que requisições
+    condicionais não precisam consultar o banco.
+
+    O cache é separado por engine (primário e réplica): a geração usada no
+    ETag é sempre lida da mesma fonte que os dados da resposta.
+    """
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._cache: Dict[Tuple[Any, str], Tuple[float, int]] = {}
+
+    async def get(self, db: AsyncSession, tabela: str) -> int:
+        chave = (db.bind, tabela)
+        cached = self._cache.get(chave)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        geracao = await db.scalar(
+            select(GeracaoDataset.geracao).where(GeracaoDataset.tabela == tabela)
+        )
+        geracao = geracao or 0
+        self._cache[chave] = (time.monotonic() + self.refresh_seconds, geracao)
+        return geracao
+
+    async def get_many(
+        self, db: AsyncSession, tabelas: Sequence[str]
+    ) -> Dict[str, int]:
+        """
+        Gerações de `tabelas`, na ordem recebida. As que não estão em cache
+        são lidas em uma única consulta.
+        """
+        agora = time.monotonic()
+        geracoes: Dict[str, int] = {}
+        faltantes = []
+        for tabela in tabelas:
+            cached = self._cache.get((db.bind, tabela))
+            if cached is not None and cached[0] > agora:
+                geracoes[tabela] = cached[1]
+            else:
+                faltantes.append(tabela)
+
+        if faltantes:
+            lidas = dict(
+                (
+                    await db.execute(
+                        select(GeracaoDataset.tabela, GeracaoDataset.geracao).where(
+                            GeracaoDataset.tabela.in_(faltantes)
+                        )
+                    )
+                ).all()
+            )
+            expira = time.monotonic() + self.refresh_seconds
+            for tabela in faltantes:
+                geracoes[tabela] = lidas.get(tabela) or 0
+                self._cache[(db.bind, tabela)] = (expira, geracoes[tabela])
+
+        return {tabela: geracoes[tabela] for tabela in tabelas}
+
+    async def carregar(self, db: AsyncSession) -> Dict[str, int]:
+        """
+        Carrega a geração de todas as tabelas em uma única consulta.
+        """
+        expira = time.monotonic() + self.refresh_seconds
+        linhas = (
+            await db.execute(select(GeracaoDataset.tabela, GeracaoDataset.geracao))
+        ).all()
+        for tabela, geracao in linhas:
+            self._cache[(db.bind, tabela)] = (expira, geracao)
+        return {tabela: geracao for tabela, geracao in linhas}
+
+    async def bump(self, db: AsyncSession, *tabelas: str) -> None:
+        """
+        Incrementa a geração das tabelas na transação corrente de `db`.
+        O commit fica a cargo de quem chama. As linhas são atualizadas em
+        ordem de chave, então transações concorrentes as bloqueiam sempre na
+        mesma ordem e não entram em deadlock.
+        """
+        tabelas = tuple(sorted(set(tabelas)))
+        result = await db.execute(
+            update(GeracaoDataset)
+            .where(GeracaoDataset.tabela.in_(tabelas))
+            .values(geracao=GeracaoDataset.geracao + 1)
+        )
+        if result.rowcount != len(tabelas):
+            existentes = set(
+                (
+                    await db.scalars(
+                        select(GeracaoDataset.tabela).where(
+                            GeracaoDataset.tabela.in_(tabelas)
+                        )
+                    )
+                ).all()
+            )
+            for tabela in tabelas:
+                if tabela not in existentes:
+                    db.add(GeracaoDataset(tabela=tabela, geracao=1))
+
+        for chave in [chave for chave in self._cache if chave[1] in tabelas]:
+            del self._cache[chave]
+
+
+dataset_generations = DatasetGenerations(
+    refresh_seconds=settings.GENERATION_REFRESH_SECONDS
+)
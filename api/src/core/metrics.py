@@ -0,0 +1,259 @@
+import logging
+import os
+import tempfile
+import time
+
+from prometheus_client import (  # type: ignore
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily  # type: ignore
+from sqlalchemy import event, exc  # type: ignore
+from sqlalchemy.pool import AsyncAdaptedQueuePool  # type: ignore
+
+from .config import settings
+from .timing import (
+    SERVER_TIMING_HEADER,
+    RequestStats,
+    registrar_consulta,
+    request_stats,
+    verificar_orcamento,
+)
+
+logger = logging.getLogger(__name__)
+
+MULTIPROC_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+registry = CollectorRegistry(auto_describe=True)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "Total de requisições HTTP por rota, método e status.",
+    ["method", "route", "status"],
+    registry=registry,
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Latência das requisições HTTP por rota e método.",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    registry=registry,
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requisições HTTP em andamento.",
+    multiprocess_mode="livesum",
+    registry=registry,
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "Duração de cada comando SQL executado.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+    registry=registry,
+)
+DB_QUERIES = Counter(
+    "db_queries_total",
+    "Comandos SQL executados por rota.",
+    ["route"],
+    registry=registry,
+)
+DB_REQUEST_TIME = Histogram(
+    "db_request_time_seconds",
+    "Tempo total gasto no banco por requisição, por rota.",
+    ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+    registry=registry,
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Tempo de espera para obter uma conexão do pool.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+    registry=registry,
+)
+POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Checkouts que excederam o pool_timeout.",
+    registry=registry,
+)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Pool assíncrono que mede o tempo de espera de cada checkout e registra
+    no log as esperas acima de DB_POOL_WAIT_LOG_MS e os timeouts.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.esperas_lentas = 0
+        self.timeouts = 0
+        self.maior_espera = 0.0
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            POOL_TIMEOUTS.inc()
+            logger.warning(
+                "Timeout ao obter conexão do pool após %.0f ms (%s)",
+                (time.perf_counter() - inicio) * 1000,
+                self.status(),
+            )
+            raise
+        finally:
+            espera = time.perf_counter() - inicio
+            POOL_CHECKOUT_WAIT.observe(espera)
+            self.checkouts += 1
+            self.maior_espera = max(self.maior_espera, espera)
+            if espera * 1000 >= settings.DB_POOL_WAIT_LOG_MS:
+                self.esperas_lentas += 1
+                logger.warning(
+                    "Checkout do pool esperou %.1f ms (%s)",
+                    espera * 1000,
+                    self.status(),
+                )
+
+
+class PoolCollector:
+    """
+    Exporta a ocupação dos pools (primário e réplica) no momento da coleta.
+    """
+
+    METRICAS = {
+        "db_pool_size": ("Tamanho configurado do pool.", "size"),
+        "db_pool_checked_out": ("Conexões em uso.", "checkedout"),
+        "db_pool_checked_in": ("Conexões ociosas no pool.", "checkedin"),
+        "db_pool_overflow": ("Conexões abertas além do tamanho.", "overflow"),
+    }
+
+    def __init__(self):
+        self.engines = {}
+
+    def collect(self):
+        for nome, (descricao, metodo) in self.METRICAS.items():
+            familia = GaugeMetricFamily(nome, descricao, labels=["engine"])
+            for rotulo, engine in self.engines.items():
+                pool = engine.pool
+                if hasattr(pool, metodo):
+                    familia.add_metric([rotulo], getattr(pool, metodo)())
+            yield familia
+
+
+pool_collector = PoolCollector()
+registry.register(pool_collector)
+
+
+def instrument_engine(engine, nome: str = "primary"):
+    """
+    Registra os eventos de execução e de pool do engine nas métricas.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _antes_execucao(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _depois_execucao(conn, cursor, statement, parameters, context, executemany):
+        inicios = conn.info.get("query_start")
+        if not inicios:
+            return
+        duracao = time.perf_counter() - inicios.pop()
+        DB_QUERY_LATENCY.observe(duracao)
+        registrar_consulta(statement, parameters, duracao)
+
+    pool_collector.engines[nome] = sync_engine
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mede latência, status e requisições em andamento,
+    e devolve o cabeçalho Server-Timing com o uso do banco da requisição.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        status = {"code": 500}
+
+        async def send_com_timing(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                timing = stats.server_timing(time.perf_counter())
+                message["headers"] = list(message.get("headers", [])) + [
+                    (SERVER_TIMING_HEADER.lower().encode(), timing.encode())
+                ]
+            await send(message)
+
+        token = request_stats.set(stats)
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_com_timing)
+        finally:
+            duracao = time.perf_counter() - stats.inicio
+            HTTP_IN_FLIGHT.dec()
+            request_stats.reset(token)
+            rota = stats.rota
+            metodo = scope["method"]
+            HTTP_REQUESTS.labels(metodo, rota, str(status["code"])).inc()
+            HTTP_LATENCY.labels(metodo, rota).observe(duracao)
+            if stats.queries:
+                DB_QUERIES.labels(rota).inc(stats.queries)
+                DB_REQUEST_TIME.labels(rota).observe(stats.db_time)
+                verificar_orcamento(stats)
+
+
+def multiprocesso_ativo() -> bool:
+    return bool(os.environ.get(MULTIPROC_ENV))
+
+
+def preparar_multiprocesso(workers: int) -> None:
+    """
+    Com mais de um worker, as métricas são gravadas em arquivos por processo
+    e agregadas na coleta. Deve ser chamada antes de os workers subirem.
+    """
+    if workers <= 1:
+        return
+    diretorio = os.environ.get(MULTIPROC_ENV)
+    if not diretorio:
+        diretorio = tempfile.mkdtemp(prefix="prometheus-")
+        os.environ[MULTIPROC_ENV] = diretorio
+    for arquivo in os.listdir(diretorio):
+        os.remove(os.path.join(diretorio, arquivo))
+
+
+def encerrar_processo() -> None:
+    """
+    Descarta os gauges do worker que está encerrando.
+    """
+    if multiprocesso_ativo():
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def render_metrics():
+    """
+    Serializa o registro no formato de exposição texto do Prometheus.
+    Com vários workers, agrega os arquivos de todos os processos; a ocupação
+    do pool é a do worker que atendeu a coleta.
+    """
+    if not multiprocesso_ativo():
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+
+    agregado = CollectorRegistry()
+    multiprocess.MultiProcessCollector(agregado)
+    agregado.register(pool_collector)
+    return generate_latest(agregado), CONTENT_TYPE_LATEST
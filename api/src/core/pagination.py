@@ -0,0 +1,96 @@
+import base64
+import json
+from typing import Any, Dict, Optional, Sequence
+
+from fastapi import HTTPException, Response, status  # type: ignore
+from sqlalchemy import Select, tuple_  # type: ignore
+from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Serializa os valores das chaves de ordenação em um cursor opaco."""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Recupera os valores das chaves de ordenação a partir de um cursor opaco."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido"
+        )
+    if not isinstance(values, dict):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido"
+        )
+    return values
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    response: Response,
+    key_columns: Sequence,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+    mappings: bool = False,
+):
+    """
+    Executa a consulta paginada por keyset sobre `key_columns`.
+
+    Com `cursor`, a consulta busca diretamente a partir da última chave vista
+    (`WHERE (chaves) > (valores) ORDER BY chaves LIMIT n`), então o custo de uma
+    página não depende da sua profundidade. Sem cursor, `skip` continua
+    funcionando via OFFSET por compatibilidade. Em ambos os modos o cursor da
+    próxima página é enviado no cabeçalho `X-Next-Cursor`.
+
+    Com `mappings=True` a consulta deve selecionar colunas (Core) e as linhas
+    são devolvidas como `RowMapping`, em vez de instâncias ORM.
+    """
+    if cursor:
+        values = decode_cursor(cursor)
+        try:
+            last = [values[column.key] for column in key_columns]
+        except KeyError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido"
+            )
+        # Valores nulos, listas ou objetos quebrariam a comparação no SQL
+        if any(
+            isinstance(value, bool) or not isinstance(value, (int, str, float))
+            for value in last
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido"
+            )
+        if len(key_columns) == 1:
+            query = query.where(key_columns[0] > last[0])
+        else:
+            query = query.where(tuple_(*key_columns) > tuple_(*last))
+    elif skip:
+        query = query.offset(skip)
+
+    query = query.order_by(*key_columns).limit(limit + 1)
+    if mappings:
+        rows = (await db.execute(query)).mappings().all()
+    else:
+        rows = (await db.scalars(query)).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_row = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            {
+                column.key: (
+                    last_row[column.key] if mappings else getattr(last_row, column.key)
+                )
+                for column in key_columns
+            }
+        )
+    return rows
@@ -0,0 +1,47 @@
+import re
+from typing import Optional, Sequence
+
+from sqlalchemy import Select, and_, or_  # type: ignore
+from sqlalchemy.dialects.mysql import match  # type: ignore
+from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore
+
+_OPERADORES_BOOLEANOS = re.compile(r'[+\-<>()~*"@]+')
+
+
+def termos_busca(termo: str):
+    """Separa o termo em palavras, descartando operadores do modo booleano."""
+    return _OPERADORES_BOOLEANOS.sub(" ", termo).split()
+
+
+async def fulltext_search(
+    db: AsyncSession,
+    query: Select,
+    columns: Sequence,
+    termo: Optional[str],
+    key_column,
+    skip: int = 0,
+    limit: int = 100,
+):
+    """
+    Aplica busca textual sobre `columns` e pagina o resultado por relevância.
+
+    No MySQL usa `MATCH ... AGAINST` em modo booleano sobre o índice FULLTEXT
+    das colunas, exigindo todas as palavras e aceitando prefixos. Em outros
+    bancos (ex.: SQLite nos testes) cai para `ILIKE` sem ordenação por
+    relevância.
+    """
+    palavras = termos_busca(termo) if termo else []
+
+    if palavras and db.bind.dialect.name == "mysql":
+        relevancia = match(
+            *columns, against=" ".join(f"+{p}*" for p in palavras)
+        ).in_boolean_mode()
+        query = query.where(relevancia).order_by(relevancia.desc(), key_column)
+    elif palavras:
+        query = query.where(
+            and_(*[or_(*[c.ilike(f"%{p}%") for c in columns]) for p in palavras])
+        ).order_by(key_column)
+    else:
+        query = query.order_by(key_column)
+
+    return (await db.scalars(query.offset(skip).limit(limit))).all()
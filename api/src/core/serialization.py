@@ -0,0 +1,52 @@
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Sequence
+
+import orjson  # type: ignore
+from fastapi import Response  # type: ignore
+from fastapi.responses import JSONResponse  # type: ignore
+from sqlalchemy import Select, select  # type: ignore
+
+
+def _default(obj: Any):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Resposta JSON serializada com orjson. `Decimal` vira float, como nos
+    schemas de resposta, e datas seguem o ISO 8601 usado pelo Pydantic.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default)
+
+
+@lru_cache(maxsize=None)
+def response_columns(model, schema) -> tuple:
+    """
+    Colunas de `model` na ordem dos campos de `schema`, para que as linhas do
+    Core produzam o mesmo JSON que o schema de resposta.
+    """
+    columns = model.__table__.c
+    return tuple(columns[name] for name in schema.model_fields)
+
+
+def select_response(model, schema) -> Select:
+    """
+    SELECT apenas das colunas expostas pelo schema de resposta.
+    """
+    return select(*response_columns(model, schema))
+
+
+def fast_json_response(rows: Sequence, response: Response) -> FastJSONResponse:
+    """
+    Serializa linhas do Core (`RowMapping`) direto para JSON, sem instanciar
+    ORM nem validar cada linha com Pydantic. Os cabeçalhos já definidos na
+    resposta injetada (ETag, X-Next-Cursor) são preservados.
+    """
+    return FastJSONResponse(
+        content=[dict(row) for row in rows], headers=dict(response.headers)
+    )
@@ -0,0 +1,284 @@
+import asyncio
+import json
+import logging
+import mmap
+import os
+import shutil
+import struct
+from bisect import bisect_left, bisect_right
+from typing import Dict, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, Response  # type: ignore
+from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore
+
+from .compression import ReadyResponse
+from .config import settings
+from .database import get_read_db
+from .generations import dataset_generations
+from .pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+# Formato dos arquivos `<recurso>.snap`, gerados por data/update_data.py
+# (inteiros little-endian):
+#   MAGIC (8 bytes) | quantidade n (uint64)
+#   ids (n x int64, ordenados) | offsets (n + 1 x uint64)
+#   dados: os registros JSON, cada um seguido de ","
+# Os registros são contíguos e ordenados por id, então qualquer página é uma
+# única fatia do arquivo.
+MAGIC = b"ECSNAP01"
+LATEST = "LATEST"
+PARAMETROS_LISTAGEM = {"skip", "limit", "cursor"}
+
+
+class SnapshotFile:
+    """
+    Arquivo de snapshot de um recurso, lido via mmap.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:8] != MAGIC:
+            self.close()
+            raise ValueError(f"Arquivo de snapshot inválido: {path}")
+
+        (self.count,) = struct.unpack_from("<Q", self._mmap, 8)
+        view = memoryview(self._mmap)
+        inicio = 16
+        self.ids = view[inicio : inicio + 8 * self.count].cast("q")
+        inicio += 8 * self.count
+        self.offsets = view[inicio : inicio + 8 * (self.count + 1)].cast("Q")
+        self._dados = inicio + 8 * (self.count + 1)
+
+    def posicao(self, entity_id: int) -> Optional[int]:
+        i = bisect_left(self.ids, entity_id)
+        if i < self.count and self.ids[i] == entity_id:
+            return i
+        return None
+
+    def posicao_apos(self, entity_id: int) -> int:
+        return bisect_right(self.ids, entity_id)
+
+    def _fatia(self, inicio: int, fim: int) -> bytes:
+        # O último registro da fatia é seguido de "," que não entra na resposta
+        return self._mmap[
+            self._dados + self.offsets[inicio] : self._dados + self.offsets[fim] - 1
+        ]
+
+    def registro(self, i: int) -> bytes:
+        return self._fatia(i, i + 1)
+
+    def pagina(self, inicio: int, fim: int) -> bytes:
+        if inicio >= fim:
+            return b"[]"
+        return b"".join((b"[", self._fatia(inicio, fim), b"]"))
+
+    def close(self) -> None:
+        for view in ("ids", "offsets"):
+            if hasattr(self, view):
+                getattr(self, view).release()
+        self._mmap.close()
+        self._file.close()
+
+
+class SnapshotStore:
+    """
+    Snapshot diário pré-renderizado dos recursos, servido sem banco.
+
+    Cada versão guarda, por recurso, a geração da tabela no momento em que foi
+    gerada. Uma escrita pela API incrementa a geração, o que marca o recurso
+    como desatualizado: as leituras dele voltam ao banco até a próxima versão.
+    """
+
+    def __init__(self, diretorio: str, bucket: str = "", prefixo: str = "snapshots"):
+        self.diretorio = diretorio
+        self.bucket = bucket
+        self.prefixo = prefixo.strip("/")
+        self.versao: Optional[str] = None
+        self.geracoes: Dict[str, int] = {}
+        self._arquivos: Dict[str, SnapshotFile] = {}
+
+    def _versao_publicada(self) -> Optional[str]:
+        if self.bucket:
+            import boto3  # type: ignore
+
+            objeto = boto3.client("s3").get_object(
+                Bucket=self.bucket, Key=f"{self.prefixo}/{LATEST}"
+            )
+            return objeto["Body"].read().decode("utf-8").strip()
+
+        try:
+            with open(os.path.join(self.diretorio, LATEST)) as arquivo:
+                return arquivo.read().strip()
+        except FileNotFoundError:
+            return None
+
+    def _baixar(self, versao: str) -> None:
+        """
+        Copia a versão do S3 para o diretório local. O download é feito em um
+        diretório temporário e renomeado, para que workers concorrentes nunca
+        abram uma versão incompleta.
+        """
+        destino = os.path.join(self.diretorio, versao)
+        if not self.bucket or os.path.isdir(destino):
+            return
+
+        import boto3  # type: ignore
+
+        s3 = boto3.client("s3")
+        temporario = f"{destino}.tmp-{os.getpid()}"
+        os.makedirs(temporario, exist_ok=True)
+        paginas = s3.get_paginator("list_objects_v2").paginate(
+            Bucket=self.bucket, Prefix=f"{self.prefixo}/{versao}/"
+        )
+        for pagina in paginas:
+            for objeto in pagina.get("Contents", []):
+                nome = objeto["Key"].rsplit("/", 1)[-1]
+                s3.download_file(
+                    self.bucket, objeto["Key"], os.path.join(temporario, nome)
+                )
+        try:
+            os.rename(temporario, destino)
+        except OSError:
+            shutil.rmtree(temporario, ignore_errors=True)
+
+    def _preparar(self) -> Optional[str]:
+        versao = self._versao_publicada()
+        if versao and versao != self.versao:
+            self._baixar(versao)
+            return versao
+        return None
+
+    def abrir(self, versao: str) -> None:
+        """
+        Abre os arquivos da versão e troca a versão servida.
+        """
+        base = os.path.join(self.diretorio, versao)
+        with open(os.path.join(base, "manifest.json")) as arquivo:
+            manifesto = json.load(arquivo)
+
+        arquivos = {}
+        try:
+            for recurso, info in manifesto["recursos"].items():
+                arquivos[recurso] = SnapshotFile(os.path.join(base, info["arquivo"]))
+        except Exception:
+            for arquivo in arquivos.values():
+                arquivo.close()
+            raise
+
+        antigos = self._arquivos
+        self._arquivos = arquivos
+        self.geracoes = {
+            recurso: info["geracao"] for recurso, info in manifesto["recursos"].items()
+        }
+        self.versao = versao
+        for arquivo in antigos.values():
+            arquivo.close()
+        logger.info("Snapshot %s carregado (%s)", versao, ", ".join(arquivos))
+
+    async def sincronizar(self) -> bool:
+        """
+        Carrega a versão publicada mais recente, se for nova. O download roda em
+        uma thread; a troca dos arquivos acontece no loop de eventos.
+        """
+        versao = await asyncio.to_thread(self._preparar)
+        if versao is None:
+            return False
+        self.abrir(versao)
+        return True
+
+    async def atualizar_periodicamente(self) -> None:
+        while True:
+            try:
+                await self.sincronizar()
+            except Exception:
+                logger.exception("Falha ao sincronizar o snapshot")
+            await asyncio.sleep(settings.SNAPSHOT_REFRESH_SECONDS)
+
+    def resposta(
+        self, recurso: str, request: Request
+    ) -> Optional[Tuple[bytes, Optional[str]]]:
+        """
+        Corpo JSON já serializado para a listagem ou a busca por ID, e o cursor
+        da próxima página. Retorna None quando a requisição precisa do banco.
+        """
+        arquivo = self._arquivos.get(recurso)
+        if arquivo is None:
+            return None
+
+        params = request.query_params
+        if request.path_params:
+            if params or len(request.path_params) != 1:
+                return None
+            try:
+                entity_id = int(next(iter(request.path_params.values())))
+            except ValueError:
+                return None
+            i = arquivo.posicao(entity_id)
+            return (arquivo.registro(i), None) if i is not None else None
+
+        if not set(params) <= PARAMETROS_LISTAGEM:
+            return None
+        try:
+            skip = int(params.get("skip", 0))
+            limit = int(params.get("limit", 100))
+        except ValueError:
+            return None
+        if skip < 0 or limit < 0:
+            return None
+
+        if params.get("cursor"):
+            try:
+                ultimo = int(decode_cursor(params["cursor"])["id"])
+            except (HTTPException, KeyError, TypeError, ValueError):
+                return None
+            inicio = arquivo.posicao_apos(ultimo)
+        else:
+            inicio = skip
+        inicio = min(inicio, arquivo.count)
+        fim = min(inicio + limit, arquivo.count)
+
+        proximo = None
+        if fim < arquivo.count and fim > inicio:
+            proximo = encode_cursor({"id": arquivo.ids[fim - 1]})
+        return arquivo.pagina(inicio, fim), proximo
+
+
+snapshot_store = SnapshotStore(
+    diretorio=settings.SNAPSHOT_DIR,
+    bucket=settings.SNAPSHOT_BUCKET,
+    prefixo=settings.SNAPSHOT_PREFIX,
+)
+
+
+def snapshot_get(recurso: str):
+    """
+    Dependência que responde com o snapshot quando ele está carregado e a
+    geração do recurso não mudou desde que foi gerado. Deve vir depois de
+    `conditional_get`, para que o ETag e o 304 continuem valendo.
+    """
+
+    async def dependency(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_read_db),
+    ):
+        esperada = snapshot_store.geracoes.get(recurso)
+        if esperada is None:
+            return
+        if await dataset_generations.get(db, recurso) != esperada:
+            return
+
+        encontrado = snapshot_store.resposta(recurso, request)
+        if encontrado is None:
+            return
+        corpo, proximo = encontrado
+        headers = dict(response.headers)
+        if proximo:
+            headers[NEXT_CURSOR_HEADER] = proximo
+        raise ReadyResponse(
+            Response(content=corpo, media_type="application/json", headers=headers)
+        )
+
+    return Depends(dependency)
@@ -0,0 +1,129 @@
+import functools
+import inspect
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi.routing import APIRoute, request_response  # type: ignore
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+
+class RequestStats:
+    """
+    Acumula o uso do banco e os marcos de tempo de uma requisição.
+    """
+
+    __slots__ = ("scope", "inicio", "queries", "db_time", "fim_endpoint")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.inicio = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.fim_endpoint: Optional[float] = None
+
+    @property
+    def rota(self) -> str:
+        return rota_da_requisicao(self.scope)
+
+    def server_timing(self, fim: float) -> str:
+        """
+        Monta o cabeçalho Server-Timing com banco, serialização e total (ms).
+        """
+        total = (fim - self.inicio) * 1000
+        partes = [f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"']
+        if self.fim_endpoint is not None:
+            partes.append(f"serialization;dur={(fim - self.fim_endpoint) * 1000:.1f}")
+        partes.append(f"total;dur={total:.1f}")
+        return ", ".join(partes)
+
+
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "request_stats", default=None
+)
+
+ROTA_DESCONHECIDA = "unmatched"
+
+
+def rota_da_requisicao(scope) -> str:
+    """
+    Usa o template da rota (ex.: /ecomm/v1/produtos/{produto_id}) como label.
+    """
+    rota = scope.get("route")
+    return getattr(rota, "path", None) or ROTA_DESCONHECIDA
+
+
+def redigir_parametros(parameters):
+    """
+    Substitui os valores dos parâmetros pelos seus tipos para não vazar dados.
+    """
+    if isinstance(parameters, dict):
+        return {chave: type(valor).__name__ for chave, valor in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"<{len(parameters)} linhas>"
+        return [type(valor).__name__ for valor in parameters]
+    return type(parameters).__name__
+
+
+def registrar_consulta(statement, parameters, duracao: float):
+    """
+    Contabiliza um comando SQL na requisição atual e registra os lentos.
+    """
+    stats = request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += duracao
+
+    if duracao * 1000 >= settings.SLOW_QUERY_MS:
+        logger.warning(
+            "Consulta lenta (%.1f ms) em %s: %s | parâmetros: %s",
+            duracao * 1000,
+            stats.rota if stats is not None else "-",
+            " ".join(statement.split()),
+            redigir_parametros(parameters),
+        )
+
+
+def verificar_orcamento(stats: RequestStats):
+    """
+    Avisa quando a requisição excede o orçamento de comandos SQL.
+    """
+    if settings.QUERY_BUDGET and stats.queries > settings.QUERY_BUDGET:
+        logger.warning(
+            "Rota %s executou %d comandos SQL (orçamento: %d, %.1f ms no banco)",
+            stats.rota,
+            stats.queries,
+            settings.QUERY_BUDGET,
+            stats.db_time * 1000,
+        )
+
+
+class TimedRoute(APIRoute):
+    """
+    Rota que marca o fim do endpoint para separar o tempo de serialização.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        call = self.dependant.call
+        if not inspect.iscoroutinefunction(call):
+            return
+
+        @functools.wraps(call)
+        async def endpoint_cronometrado(*a, **kw):
+            try:
+                return await call(*a, **kw)
+            finally:
+                stats = request_stats.get()
+                if stats is not None:
+                    stats.fim_endpoint = time.perf_counter()
+
+        self.dependant.call = endpoint_cronometrado
+        self.app = request_response(self.get_route_handler())
@@ -1,14 +1,54 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 import uvicorn  # type: ignore
-from fastapi import FastAPI  # type: ignore
+from fastapi import FastAPI, Request  # type: ignore
 from fastapi.middleware.cors import CORSMiddleware  # type: ignore
 
 from .api.routes.api_router import api_router
+from .core.compression import CompressionMiddleware, ReadyResponse
 from .core.config import settings
+from .core.database import ReadYourWritesMiddleware, engine, read_engine
+from .core.metrics import MetricsMiddleware, encerrar_processo
+from .core.pagination import NEXT_CURSOR_HEADER
+from .core.snapshot import snapshot_store
+from .core.timing import SERVER_TIMING_HEADER
+from .services.warmup import WarmupService
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Aquece conexões, schemas, caches e o snapshot diário antes de aceitar
+    tráfego e libera o pool ao encerrar.
+    """
+    app.state.ready = False
+    if settings.WARMUP_ENABLED:
+        await WarmupService.executar(app)
+    else:
+        app.state.ready = True
+
+    sincronizacao = None
+    if settings.SNAPSHOT_ENABLED:
+        sincronizacao = asyncio.create_task(snapshot_store.atualizar_periodicamente())
+    yield
+    app.state.ready = False
+    aquecimento = getattr(app.state, "aquecimento", None)
+    if aquecimento is not None:
+        aquecimento.cancel()
+    if sincronizacao is not None:
+        sincronizacao.cancel()
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
+    encerrar_processo()
+
 
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     debug=settings.DEBUG,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -17,8 +57,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, SERVER_TIMING_HEADER],
 )
 
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(ReadyResponse)
+async def ready_response_handler(request: Request, exc: ReadyResponse):
+    return exc.response
+
+
 app.include_router(api_router)
 
 # if __name__ == "__main__":
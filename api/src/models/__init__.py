@@ -3,8 +3,10 @@ from .categorias import Categoria
 from .clientes import Cliente
 from .enderecos import Endereco
 from .fornecedores import Fornecedor
+from .geracoes_dataset import GeracaoDataset
 from .itens_venda import ItensVendas
 from .produtos import Produto
+from .relatorios import ResumoItensDia, ResumoVendasDia
 from .vendas import Venda
 
 __all__ = [
@@ -16,4 +18,7 @@ __all__ = [
     "Produto",
     "Venda",
     "ItensVendas",
+    "GeracaoDataset",
+    "ResumoVendasDia",
+    "ResumoItensDia",
 ]
@@ -0,0 +1,14 @@
+from typing import List
+
+from pydantic import BaseModel  # type: ignore
+
+
+class BulkErro(BaseModel):
+    indice: int
+    erro: str
+
+
+class BulkResponse(BaseModel):
+    recebidos: int
+    inseridos: int
+    erros: List[BulkErro]
@@ -0,0 +1,13 @@
+from pydantic import BaseModel  # type: ignore
+
+
+class CacheStatsResponse(BaseModel):
+    enabled: bool
+    entries: int
+    max_entries: int
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int
+    expirations: int
+    invalidations: int
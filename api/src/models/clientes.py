@@ -2,7 +2,15 @@ from datetime import date, datetime
 from typing import List, Literal, Optional
 
 from pydantic import BaseModel, EmailStr, validator  # type: ignore
-from sqlalchemy import TIMESTAMP, Column, Date, Enum, String, func  # type: ignore
+from sqlalchemy import (  # type: ignore
+    TIMESTAMP,
+    Column,
+    Date,
+    Enum,
+    Index,
+    String,
+    func,
+)
 from sqlalchemy.orm import relationship  # type: ignore
 
 from .base import BaseModel as SQLAlchemyBase
@@ -11,6 +19,15 @@ from .base import BaseModel as SQLAlchemyBase
 # SQLAlchemy Model
 class Cliente(SQLAlchemyBase):
     __tablename__ = "clientes"
+    __table_args__ = (
+        Index(
+            "ft_clientes_busca",
+            "nome",
+            "sobrenome",
+            "email",
+            mysql_prefix="FULLTEXT",
+        ),
+    )
 
     nome = Column(String(100), nullable=False)
     sobrenome = Column(String(100), nullable=False)
@@ -6,6 +6,7 @@ from sqlalchemy import (  # type: ignore
     Boolean,
     Column,
     ForeignKey,
+    Index,
     Integer,
     String,
     func,
@@ -18,6 +19,15 @@ from .base import BaseModel as SQLAlchemyBase
 # SQLAlchemy Model
 class Endereco(SQLAlchemyBase):
     __tablename__ = "enderecos"
+    __table_args__ = (
+        Index(
+            "ft_enderecos_busca",
+            "logradouro",
+            "bairro",
+            "cidade",
+            mysql_prefix="FULLTEXT",
+        ),
+    )
 
     cliente_id = Column(
         Integer, ForeignKey("clientes.id", ondelete="CASCADE"), nullable=False
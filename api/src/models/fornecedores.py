@@ -2,7 +2,15 @@ from datetime import datetime
 from typing import Optional
 
 from pydantic import BaseModel, EmailStr, validator  # type: ignore
-from sqlalchemy import TIMESTAMP, Boolean, Column, String, Text, func  # type: ignore
+from sqlalchemy import (  # type: ignore
+    TIMESTAMP,
+    Boolean,
+    Column,
+    Index,
+    String,
+    Text,
+    func,
+)
 from sqlalchemy.orm import relationship  # type: ignore
 
 from .base import BaseModel as SQLAlchemyBase
@@ -11,6 +19,9 @@ from .base import BaseModel as SQLAlchemyBase
 # SQLAlchemy Model
 class Fornecedor(SQLAlchemyBase):
     __tablename__ = "fornecedores"
+    __table_args__ = (
+        Index("ft_fornecedores_busca", "nome", "email", mysql_prefix="FULLTEXT"),
+    )
 
     nome = Column(String(100), nullable=False)
     email = Column(String(100), unique=True, nullable=False, index=True)
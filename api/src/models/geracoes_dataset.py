@@ -0,0 +1,14 @@
+from sqlalchemy import BigInteger, Column, String  # type: ignore
+
+from .base import Base
+
+
+# SQLAlchemy Model
+class GeracaoDataset(Base):
+    __tablename__ = "geracoes_dataset"
+
+    tabela = Column(String(64), primary_key=True)
+    geracao = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<GeracaoDataset(tabela='{self.tabela}', geracao={self.geracao})>"
@@ -12,3 +12,7 @@ class HealthResponse(BaseModel):
 
     class Config:
         json_encoders = {datetime: lambda v: v.isoformat()}
+
+
+class ReadinessResponse(BaseModel):
+    ready: bool
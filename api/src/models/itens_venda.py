@@ -6,6 +6,7 @@ from sqlalchemy import Column, ForeignKey, Integer, Numeric  # type: ignore
 from sqlalchemy.orm import relationship  # type: ignore
 
 from .base import BaseModel as SQLAlchemyBase
+from .produtos import ProdutoResponse
 
 
 # SQLAlchemy Model
@@ -46,3 +47,14 @@ class ItensVendasUpdate(ItensVendasBase):
     produto_id: Optional[int] = None
     quantidade: Optional[int] = None
     subtotal: Optional[float] = None
+
+
+class ItensVendasResponse(ItensVendasBase):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+
+class ItensVendasDetalheResponse(ItensVendasResponse):
+    produto: Optional[ProdutoResponse] = None
@@ -0,0 +1,17 @@
+from pydantic import BaseModel  # type: ignore
+
+
+class PoolStatsResponse(BaseModel):
+    size: int
+    max_overflow: int
+    timeout: float
+    recycle: int
+    pre_ping: bool
+    use_lifo: bool
+    checked_out: int
+    checked_in: int
+    overflow: int
+    checkouts: int
+    slow_checkouts: int
+    timeouts: int
+    max_wait_ms: float
@@ -8,6 +8,7 @@ from sqlalchemy import (  # type: ignore
     Column,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -22,6 +23,9 @@ from .base import BaseModel as SQLAlchemyBase
 # SQLAlchemy Model
 class Produto(SQLAlchemyBase):
     __tablename__ = "produtos"
+    __table_args__ = (
+        Index("ft_produtos_busca", "nome", "descricao", mysql_prefix="FULLTEXT"),
+    )
 
     nome = Column(String(200), nullable=False)
     descricao = Column(Text)
@@ -0,0 +1,66 @@
+from datetime import date
+from typing import Optional
+
+from pydantic import BaseModel  # type: ignore
+from sqlalchemy import Column, Date, Integer, Numeric, String  # type: ignore
+
+from .base import Base
+
+
+# SQLAlchemy Models
+class ResumoVendasDia(Base):
+    __tablename__ = "resumo_vendas_dia"
+
+    dia = Column(Date, primary_key=True)
+    metodo_pagamento = Column(String(20), primary_key=True)
+    status = Column(String(20), primary_key=True)
+    num_vendas = Column(Integer, nullable=False, default=0)
+    subtotal = Column(Numeric(14, 2), nullable=False, default=0)
+    frete = Column(Numeric(14, 2), nullable=False, default=0)
+    total = Column(Numeric(14, 2), nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ResumoVendasDia(dia={self.dia}, metodo_pagamento='{self.metodo_pagamento}', status='{self.status}')>"
+
+
+class ResumoItensDia(Base):
+    __tablename__ = "resumo_itens_dia"
+
+    dia = Column(Date, primary_key=True)
+    categoria_id = Column(Integer, primary_key=True, default=0)
+    fornecedor_id = Column(Integer, primary_key=True, default=0)
+    quantidade = Column(Integer, nullable=False, default=0)
+    receita = Column(Numeric(14, 2), nullable=False, default=0)
+    custo = Column(Numeric(14, 2), nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ResumoItensDia(dia={self.dia}, categoria_id={self.categoria_id}, fornecedor_id={self.fornecedor_id})>"
+
+
+# Pydantic Schemas
+class RelatorioVendasDiaResponse(BaseModel):
+    dia: date
+    num_vendas: int
+    subtotal: float
+    frete: float
+    total: float
+
+
+class RelatorioMetodoPagamentoResponse(BaseModel):
+    metodo_pagamento: str
+    num_vendas: int
+    total: float
+
+
+class RelatorioCategoriaResponse(BaseModel):
+    categoria_id: Optional[int] = None
+    quantidade: int
+    receita: float
+    custo: float
+
+
+class RelatorioFornecedorResponse(BaseModel):
+    fornecedor_id: Optional[int] = None
+    quantidade: int
+    receita: float
+    custo: float
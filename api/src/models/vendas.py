@@ -15,6 +15,9 @@ from sqlalchemy import (  # type: ignore
 from sqlalchemy.orm import relationship  # type: ignore
 
 from .base import BaseModel as SQLAlchemyBase
+from .clientes import ClienteResponse
+from .enderecos import EnderecoResponse
+from .itens_venda import ItensVendasBase, ItensVendasDetalheResponse
 
 
 # SQLAlchemy Model
@@ -91,3 +94,45 @@ class VendaResponse(VendaBase):
 
     class Config:
         from_attributes = True
+
+
+class VendaDocumentoResponse(VendaResponse):
+    cliente: Optional[ClienteResponse] = None
+    endereco: Optional[EnderecoResponse] = None
+    itens_venda: Optional[List[ItensVendasDetalheResponse]] = None
+
+
+class CheckoutItem(BaseModel):
+    produto_id: int
+    quantidade: int = 1
+
+    @validator("quantidade")
+    def validate_quantidade(cls, v):
+        if v < 1:
+            raise ValueError("Quantidade deve ser maior que zero")
+        return v
+
+
+class CheckoutCreate(BaseModel):
+    cliente_id: int
+    endereco_entrega_id: Optional[int] = None
+    metodo_pagamento: Literal["Cartao_Credito", "Cartao_Debito", "PIX", "Boleto"]
+    frete: float = 0.0
+    data_entrega_prevista: Optional[date] = None
+    itens: List[CheckoutItem]
+
+    @validator("itens")
+    def validate_itens(cls, v):
+        if not v:
+            raise ValueError("O carrinho deve ter ao menos um item")
+        return v
+
+    @validator("frete")
+    def validate_frete(cls, v):
+        if v < 0:
+            raise ValueError("Frete não pode ser negativo")
+        return v
+
+
+class VendaCheckoutResponse(VendaResponse):
+    itens_venda: List[ItensVendasBase]
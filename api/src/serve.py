@@ -0,0 +1,13 @@
+import uvicorn  # type: ignore
+
+from .core.config import settings
+from .core.metrics import preparar_multiprocesso
+
+if __name__ == "__main__":
+    preparar_multiprocesso(settings.WORKERS)
+    uvicorn.run(
+        "src.main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=settings.WORKERS,
+    )
@@ -0,0 +1,141 @@
+from collections import Counter
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict
+
+from fastapi import HTTPException, status  # type: ignore
+from sqlalchemy import and_, case, insert, select, update  # type: ignore
+from sqlalchemy.ext.asyncio import AsyncSession  # type: ignore
+
+from ..core.cache import entity_cache
+from ..core.generations import dataset_generations
+from ..models.clientes import Cliente
+from ..models.enderecos import Endereco
+from ..models.itens_venda import ItensVendas, ItensVendasBase
+from ..models.produtos import Produto
+from ..models.vendas import (
+    CheckoutCreate,
+    Venda,
+    VendaCheckoutResponse,
+    VendaResponse,
+)
+
+CENTAVOS = Decimal("0.01")
+
+
+class CheckoutService:
+    @staticmethod
+    async def finalizar(
+        db: AsyncSession, pedido: CheckoutCreate
+    ) -> VendaCheckoutResponse:
+        """
+        Fecha um pedido em uma única transação: precifica o carrinho com uma
+        consulta, baixa o estoque com um único UPDATE condicional, grava a
+        venda e todos os itens e faz um único commit.
+
+        O UPDATE só decrementa linhas com estoque suficiente; se alguma ficar
+        de fora, a transação inteira é desfeita. Como a verificação e a baixa
+        acontecem no mesmo comando, checkouts concorrentes não perdem
+        atualizações de estoque. As gerações de vendas, itens e produtos são
+        incrementadas no fim da mesma transação.
+        """
+        cliente = await db.get(Cliente, pedido.cliente_id)
+        if not cliente:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Cliente não encontrado"
+            )
+        if pedido.endereco_entrega_id is not None:
+            endereco = await db.get(Endereco, pedido.endereco_entrega_id)
+            if not endereco or endereco.cliente_id != pedido.cliente_id:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Endereço não encontrado para este cliente",
+                )
+
+        quantidades: Dict[int, int] = Counter()
+        for item in pedido.itens:
+            quantidades[item.produto_id] += item.quantidade
+
+        precos = dict(
+            (
+                await db.execute(
+                    select(Produto.id, Produto.preco).where(
+                        Produto.id.in_(quantidades), Produto.ativo.is_(True)
+                    )
+                )
+            ).all()
+        )
+        indisponiveis = sorted(set(quantidades) - set(precos))
+        if indisponiveis:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Produtos não encontrados ou inativos: {indisponiveis}",
+            )
+
+        baixa = case(quantidades, value=Produto.id)
+        result = await db.execute(
+            update(Produto)
+            .where(
+                and_(
+                    Produto.id.in_(quantidades),
+                    Produto.quantidade_estoque >= baixa,
+                )
+            )
+            .ordered_values(
+                (Produto.em_estoque, Produto.quantidade_estoque - baixa > 0),
+                (Produto.quantidade_estoque, Produto.quantidade_estoque - baixa),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != len(quantidades):
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Estoque insuficiente para um ou mais produtos",
+            )
+
+        itens = [
+            ItensVendasBase(
+                venda_id=0,
+                produto_id=produto_id,
+                quantidade=quantidade,
+                preco_unitario=precos[produto_id],
+                subtotal=(precos[produto_id] * quantidade).quantize(CENTAVOS),
+            )
+            for produto_id, quantidade in quantidades.items()
+        ]
+        subtotal = sum(
+            (precos[i.produto_id] * i.quantidade for i in itens), Decimal("0")
+        ).quantize(CENTAVOS)
+        frete = Decimal(str(pedido.frete)).quantize(CENTAVOS)
+
+        venda = Venda(
+            cliente_id=pedido.cliente_id,
+            endereco_entrega_id=pedido.endereco_entrega_id,
+            status="Pendente",
+            subtotal=subtotal,
+            frete=frete,
+            total=subtotal + frete,
+            metodo_pagamento=pedido.metodo_pagamento,
+            status_pagamento="Pendente",
+            data_venda=datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0),
+            data_entrega_prevista=pedido.data_entrega_prevista,
+        )
+        db.add(venda)
+        await db.flush()
+
+        for item in itens:
+            item.venda_id = venda.id
+        await db.execute(insert(ItensVendas), [item.dict() for item in itens])
+
+        # As gerações são linhas quentes, disputadas por todos os checkouts:
+        # incrementá-las por último, logo antes do commit, encurta o tempo em
+        # que ficam bloqueadas sem tirá-las da transação da venda.
+        await dataset_generations.bump(db, "vendas", "itens_venda", "produtos")
+        await db.commit()
+
+        for produto_id in quantidades:
+            entity_cache.invalidate("produtos", produto_id)
+
+        venda_resposta = VendaResponse.model_validate(venda)
+        return VendaCheckoutResponse(**venda_resposta.dict(), itens_venda=itens)
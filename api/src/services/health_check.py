@@ -8,11 +8,11 @@ from ..models.healthcheck import HealthResponse
 
 class HealthService:
     @staticmethod
-    def get_health_status() -> HealthResponse:
+    async def get_health_status() -> HealthResponse:
         try:
 
-            with engine.connect() as connection:
-                connection.execute(text("SELECT 1"))
+            async with engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
 
             return HealthResponse(
                 response_code=200,
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import time
+from typing import Dict
+
+from sqlalchemy import select, text  # type: ignore
+from sqlalchemy.orm import configure_mappers  # type: ignore
+
+from ..core.cache import entity_cache
+from ..core.config import settings
+from ..core.database import SessionLocal, engine, read_engine
+from ..core.generations import dataset_generations
+from ..core.snapshot import snapshot_store
+from ..models.categorias import Categoria, CategoriaResponse
+from ..models.fornecedores import Fornecedor, FornecedorResponse
+
+logger = logging.getLogger(__name__)
+
+# Tabelas pequenas e muito lidas, carregadas inteiras no cache de entidades
+TABELAS_AQUECIDAS = [
+    (Categoria, CategoriaResponse),
+    (Fornecedor, FornecedorResponse),
+]
+
+
+class WarmupService:
+    @staticmethod
+    def compilar(app) -> None:
+        """
+        Configura os mappers do SQLAlchemy e gera o schema OpenAPI, o que
+        compila os validadores e serializadores Pydantic de todas as rotas.
+        """
+        configure_mappers()
+        app.openapi()
+
+    @staticmethod
+    async def abrir_conexoes(quantidade: int) -> int:
+        """
+        Abre `quantidade` conexões em paralelo e as devolve ao pool (no primário
+        e, se configurada, na réplica de leitura).
+        """
+        engines = [engine] if read_engine is engine else [engine, read_engine]
+
+        async def abrir(alvo):
+            async with alvo.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+
+        await asyncio.gather(
+            *(abrir(alvo) for alvo in engines for _ in range(quantidade))
+        )
+        return quantidade * len(engines)
+
+    @staticmethod
+    async def aquecer_caches() -> int:
+        """
+        Carrega as gerações das tabelas e as tabelas pequenas no cache.
+        """
+        carregadas = 0
+        async with SessionLocal() as db:
+            geracoes = await dataset_generations.carregar(db)
+            for model, schema in TABELAS_AQUECIDAS:
+                tabela = model.__tablename__
+                objs = await db.scalars(
+                    select(model).order_by(model.id).limit(settings.WARMUP_CACHE_LIMIT)
+                )
+                for obj in objs:
+                    entity_cache.set_entity(
+                        db,
+                        tabela,
+                        obj.id,
+                        schema.model_validate(obj),
+                        geracoes.get(tabela, 0),
+                    )
+                    carregadas += 1
+        return carregadas
+
+    @staticmethod
+    async def aquecer_banco(tempos: Dict[str, float]) -> None:
+        """
+        Abre as conexões do pool e aquece os caches, registrando o tempo de
+        cada etapa em `tempos`. Propaga qualquer falha de banco.
+        """
+        etapa = time.perf_counter()
+        await WarmupService.abrir_conexoes(
+            min(settings.WARMUP_CONNECTIONS, settings.DB_POOL_SIZE)
+        )
+        tempos["conexoes"] = time.perf_counter() - etapa
+
+        etapa = time.perf_counter()
+        await WarmupService.aquecer_caches()
+        tempos["caches"] = time.perf_counter() - etapa
+
+    @staticmethod
+    async def aguardar_banco(app) -> None:
+        """
+        Repete o aquecimento do banco a cada `WARMUP_RETRY_SECONDS` até ele
+        funcionar e só então marca a aplicação como pronta.
+        """
+        while True:
+            await asyncio.sleep(settings.WARMUP_RETRY_SECONDS)
+            try:
+                await WarmupService.aquecer_banco({})
+            except Exception:
+                logger.warning("Banco de dados ainda indisponível", exc_info=True)
+                continue
+            app.state.ready = True
+            logger.info("Conexão com o banco de dados estabelecida")
+            return
+
+    @staticmethod
+    async def executar(app) -> Dict[str, float]:
+        """
+        Executa o aquecimento antes de a API receber tráfego. A aplicação só é
+        marcada como pronta se a conexão com o banco funcionar; se falhar, a
+        subida continua com `/health/ready` em 503 e o aquecimento do banco é
+        repetido em segundo plano (`app.state.aquecimento`). Uma falha no
+        snapshot não impede a prontidão, já que a API pode ler do banco.
+        """
+        tempos: Dict[str, float] = {}
+        inicio = time.perf_counter()
+        WarmupService.compilar(app)
+        tempos["compilacao"] = time.perf_counter() - inicio
+
+        if settings.SNAPSHOT_ENABLED:
+            etapa = time.perf_counter()
+            try:
+                await snapshot_store.sincronizar()
+            except Exception:
+                logger.exception("Falha ao carregar o snapshot diário")
+            tempos["snapshot"] = time.perf_counter() - etapa
+
+        try:
+            await WarmupService.aquecer_banco(tempos)
+            app.state.ready = True
+        except Exception:
+            logger.exception("Falha ao aquecer a conexão com o banco de dados")
+            app.state.aquecimento = asyncio.create_task(
+                WarmupService.aguardar_banco(app)
+            )
+
+        tempos["total"] = time.perf_counter() - inicio
+        logger.info(
+            "Aquecimento concluído: %s",
+            ", ".join(f"{k}={v * 1000:.0f} ms" for k, v in tempos.items()),
+        )
+        return tempos
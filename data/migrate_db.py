@@ -0,0 +1,140 @@
+import os
+
+import pymysql  # type: ignore
+from dotenv import load_dotenv  # type: ignore
+
+from update_data import atualizar_resumos
+
+# Tabelas criadas depois da primeira versão do schema.sql; todas com
+# IF NOT EXISTS e linhas iniciais com INSERT IGNORE, então a migração pode
+# ser executada mais de uma vez sem apagar dados.
+TABELAS = [
+    """
+    CREATE TABLE IF NOT EXISTS geracoes_dataset (
+        tabela VARCHAR(64) PRIMARY KEY,
+        geracao BIGINT NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    INSERT IGNORE INTO geracoes_dataset (tabela, geracao)
+    VALUES ('fornecedores', 0),
+        ('categorias', 0),
+        ('clientes', 0),
+        ('enderecos', 0),
+        ('produtos', 0),
+        ('vendas', 0),
+        ('itens_venda', 0),
+        ('resumo_vendas_dia', 0),
+        ('resumo_itens_dia', 0)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS resumo_vendas_dia (
+        dia DATE NOT NULL,
+        metodo_pagamento VARCHAR(20) NOT NULL,
+        status VARCHAR(20) NOT NULL,
+        num_vendas INT NOT NULL DEFAULT 0,
+        subtotal DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+        frete DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+        total DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+        PRIMARY KEY (dia, metodo_pagamento, status)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS resumo_itens_dia (
+        dia DATE NOT NULL,
+        categoria_id INT NOT NULL DEFAULT 0,
+        fornecedor_id INT NOT NULL DEFAULT 0,
+        quantidade INT NOT NULL DEFAULT 0,
+        receita DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+        custo DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+        PRIMARY KEY (dia, categoria_id, fornecedor_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS resumos_marcas (
+        tabela VARCHAR(64) PRIMARY KEY,
+        ultimo_id INT NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    INSERT IGNORE INTO resumos_marcas (tabela, ultimo_id)
+    VALUES ('vendas', 0),
+        ('itens_venda', 0)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS cargas_checkpoints (
+        carga_id INT NOT NULL,
+        etapa VARCHAR(32) NOT NULL,
+        resultado TEXT,
+        concluida_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (carga_id, etapa)
+    )
+    """,
+]
+
+# Índices FULLTEXT usados pelas rotas de busca da API e o índice por data
+# usado no recálculo dos resumos, criados só se faltarem
+INDICES = {
+    "idx_vendas_data": ("vendas", "INDEX", "data_venda"),
+    "ft_produtos_busca": ("produtos", "FULLTEXT INDEX", "nome, descricao"),
+    "ft_clientes_busca": ("clientes", "FULLTEXT INDEX", "nome, sobrenome, email"),
+    "ft_fornecedores_busca": ("fornecedores", "FULLTEXT INDEX", "nome, email"),
+    "ft_enderecos_busca": (
+        "enderecos",
+        "FULLTEXT INDEX",
+        "logradouro, bairro, cidade",
+    ),
+}
+
+
+def resumos_vazios(cursor):
+    cursor.execute("SELECT EXISTS(SELECT 1 FROM resumo_vendas_dia)")
+    return not cursor.fetchone()[0]
+
+
+def migrar(connection):
+    """
+    Atualiza um banco criado com uma versão anterior do schema.sql sem
+    apagar dados: cria as tabelas e índices que faltam e, se os resumos
+    estiverem vazios, agrega neles todo o histórico de vendas.
+    """
+    with connection.cursor() as cursor:
+        for comando in TABELAS:
+            cursor.execute(comando)
+
+        cursor.execute(
+            """
+            SELECT DISTINCT index_name FROM information_schema.statistics
+            WHERE table_schema = DATABASE()
+        """
+        )
+        existentes = {row[0] for row in cursor.fetchall()}
+        for nome, (tabela, tipo, colunas) in INDICES.items():
+            if nome not in existentes:
+                print(f"Criando índice {nome} em {tabela}...")
+                cursor.execute(f"ALTER TABLE {tabela} ADD {tipo} {nome} ({colunas})")
+
+        if resumos_vazios(cursor):
+            atualizar_resumos(cursor, reconstruir=True)
+        connection.commit()
+    print("Migração concluída")
+
+
+def main():
+    load_dotenv()
+    connection = pymysql.connect(
+        host=os.environ.get("DB_HOST"),
+        user=os.environ.get("DB_USER", "admin"),
+        password=os.environ.get("DB_PASSWORD"),
+        database=os.environ.get("DB_NAME", "ecommerce"),
+        charset="utf8mb4",
+        autocommit=False,
+    )
+    try:
+        migrar(connection)
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
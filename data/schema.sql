@@ -1,4 +1,9 @@
 -- schema_mysql.sql - E-commerce Simplificado
+DROP TABLE IF EXISTS cargas_checkpoints;
+DROP TABLE IF EXISTS geracoes_dataset;
+DROP TABLE IF EXISTS resumos_marcas;
+DROP TABLE IF EXISTS resumo_itens_dia;
+DROP TABLE IF EXISTS resumo_vendas_dia;
 DROP TABLE IF EXISTS itens_venda;
 DROP TABLE IF EXISTS vendas;
 DROP TABLE IF EXISTS produtos;
@@ -113,9 +118,66 @@ CREATE TABLE IF NOT EXISTS itens_venda (
     FOREIGN KEY (venda_id) REFERENCES vendas(id) ON DELETE CASCADE,
     FOREIGN KEY (produto_id) REFERENCES produtos(id) ON DELETE CASCADE
 );
+-- Tabela de Gerações do Dataset (usada nos ETags da API)
+CREATE TABLE IF NOT EXISTS geracoes_dataset (
+    tabela VARCHAR(64) PRIMARY KEY,
+    geracao BIGINT NOT NULL DEFAULT 0
+);
+INSERT INTO geracoes_dataset (tabela, geracao)
+VALUES ('fornecedores', 0),
+    ('categorias', 0),
+    ('clientes', 0),
+    ('enderecos', 0),
+    ('produtos', 0),
+    ('vendas', 0),
+    ('itens_venda', 0),
+    ('resumo_vendas_dia', 0),
+    ('resumo_itens_dia', 0);
+-- Tabelas de resumo de vendas (mantidas incrementalmente pela Lambda diária)
+CREATE TABLE IF NOT EXISTS resumo_vendas_dia (
+    dia DATE NOT NULL,
+    metodo_pagamento VARCHAR(20) NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    num_vendas INT NOT NULL DEFAULT 0,
+    subtotal DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    frete DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    total DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    PRIMARY KEY (dia, metodo_pagamento, status)
+);
+CREATE TABLE IF NOT EXISTS resumo_itens_dia (
+    dia DATE NOT NULL,
+    categoria_id INT NOT NULL DEFAULT 0,
+    fornecedor_id INT NOT NULL DEFAULT 0,
+    quantidade INT NOT NULL DEFAULT 0,
+    receita DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    custo DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    PRIMARY KEY (dia, categoria_id, fornecedor_id)
+);
+-- Último ID já agregado nas tabelas de resumo
+CREATE TABLE IF NOT EXISTS resumos_marcas (
+    tabela VARCHAR(64) PRIMARY KEY,
+    ultimo_id INT NOT NULL DEFAULT 0
+);
+INSERT INTO resumos_marcas (tabela, ultimo_id)
+VALUES ('vendas', 0),
+    ('itens_venda', 0);
+-- Checkpoints da carga diária (cada etapa commitada, para retomar após falhas)
+CREATE TABLE IF NOT EXISTS cargas_checkpoints (
+    carga_id INT NOT NULL,
+    etapa VARCHAR(32) NOT NULL,
+    resultado TEXT,
+    concluida_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (carga_id, etapa)
+);
 -- Índices para melhor performance
 CREATE INDEX idx_produtos_categoria ON produtos(categoria_id);
 CREATE INDEX idx_produtos_fornecedor ON produtos(fornecedor_id);
 CREATE INDEX idx_vendas_cliente ON vendas(cliente_id);
 CREATE INDEX idx_vendas_status ON vendas(status);
-CREATE INDEX idx_enderecos_cliente ON enderecos(cliente_id);
\ No newline at end of file
+CREATE INDEX idx_vendas_data ON vendas(data_venda);
+CREATE INDEX idx_enderecos_cliente ON enderecos(cliente_id);
+-- Índices FULLTEXT usados pelas rotas de busca da API
+CREATE FULLTEXT INDEX ft_produtos_busca ON produtos(nome, descricao);
+CREATE FULLTEXT INDEX ft_clientes_busca ON clientes(nome, sobrenome, email);
+CREATE FULLTEXT INDEX ft_fornecedores_busca ON fornecedores(nome, email);
+CREATE FULLTEXT INDEX ft_enderecos_busca ON enderecos(logradouro, bairro, cidade);
\ No newline at end of file
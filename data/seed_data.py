@@ -0,0 +1,459 @@
+import argparse
+import os
+import random
+import time
+from array import array
+from datetime import datetime
+from multiprocessing import Pool
+
+import numpy as np  # type: ignore
+import pymysql  # type: ignore
+from dotenv import load_dotenv  # type: ignore
+
+from update_data import (
+    CESTA_MAXIMA,
+    CESTA_MEDIA,
+    COLUNAS_INSERCAO,
+    SAZONALIDADE,
+    ZIPF_CLIENTES,
+    ZIPF_PRODUTOS,
+    Generator,
+    atualizar_resumos,
+    formatar_cnpj,
+    formatar_cpf,
+    incrementar_geracoes,
+    montar_cestas,
+    sortear_datas_venda,
+    sortear_ids_populares,
+    tamanhos_cesta,
+)
+
+# Linhas por tabela com fator de escala 1; SF=100 gera ~1M de clientes
+ESCALA = {
+    "fornecedores": 100,
+    "clientes": 10_000,
+    "produtos": 5_000,
+    "vendas": 50_000,
+}
+
+CATEGORIAS = [
+    "Eletrônicos",
+    "Roupas",
+    "Casa e Jardim",
+    "Esportes",
+    "Livros",
+    "Beleza",
+    "Automóveis",
+    "Brinquedos",
+    "Alimentação",
+    "Saúde",
+]
+
+TABELAS_SEMEADAS = [
+    "categorias",
+    "fornecedores",
+    "clientes",
+    "enderecos",
+    "produtos",
+    "vendas",
+    "itens_venda",
+]
+
+# Índices secundários que não sustentam chaves estrangeiras: são removidos
+# antes da carga e recriados no fim, o que é bem mais rápido do que mantê-los
+# linha a linha (principalmente os FULLTEXT).
+INDICES_POS_CARGA = {
+    "idx_vendas_status": ("vendas", "CREATE INDEX idx_vendas_status ON vendas(status)"),
+    "idx_vendas_data": ("vendas", "CREATE INDEX idx_vendas_data ON vendas(data_venda)"),
+    "ft_produtos_busca": (
+        "produtos",
+        "CREATE FULLTEXT INDEX ft_produtos_busca ON produtos(nome, descricao)",
+    ),
+    "ft_clientes_busca": (
+        "clientes",
+        "CREATE FULLTEXT INDEX ft_clientes_busca ON clientes(nome, sobrenome, email)",
+    ),
+    "ft_fornecedores_busca": (
+        "fornecedores",
+        "CREATE FULLTEXT INDEX ft_fornecedores_busca ON fornecedores(nome, email)",
+    ),
+    "ft_enderecos_busca": (
+        "enderecos",
+        "CREATE FULLTEXT INDEX ft_enderecos_busca "
+        "ON enderecos(logradouro, bairro, cidade)",
+    ),
+}
+
+# Na carga em massa os ids são atribuídos pelo gerador, para que os blocos
+# das tabelas dependentes possam ser gerados em paralelo.
+COLUNAS_CARGA = {
+    "fornecedores": ("id",) + COLUNAS_INSERCAO["fornecedores"],
+    "categorias": ("id",) + COLUNAS_INSERCAO["categorias"],
+    "clientes": ("id",) + COLUNAS_INSERCAO["clientes"],
+    "enderecos": ("id",) + COLUNAS_INSERCAO["enderecos"],
+    "produtos": ("id",) + COLUNAS_INSERCAO["produtos"],
+    "vendas": ("id",) + COLUNAS_INSERCAO["vendas"] + ("data_venda",),
+    "itens_venda": COLUNAS_INSERCAO["itens_venda"],
+}
+
+DIAS_DE_HISTORICO = 365
+
+# Padrões das distribuições das vendas, lidos do ambiente em update_data
+DISTRIBUICOES = {
+    "zipf_produtos": ZIPF_PRODUTOS,
+    "zipf_clientes": ZIPF_CLIENTES,
+    "cesta_media": CESTA_MEDIA,
+    "sazonalidade": SAZONALIDADE,
+}
+
+
+def email_unico(email, n):
+    usuario, dominio = email.split("@", 1)
+    return f"{usuario}.{n}@{dominio}"
+
+
+def semear_aleatoriedade(semente, tabela, inicio):
+    """
+    Semente própria de cada bloco, aplicada ao `random` e devolvida para o
+    rng NumPy do Generator: o resultado não depende de quantos workers
+    existem nem de qual deles gerou o bloco.
+    """
+    semente_bloco = random.Random(f"{semente}:{tabela}:{inicio}").getrandbits(64)
+    random.seed(semente_bloco)
+    return semente_bloco
+
+
+def linha(registro, colunas):
+    return tuple(registro[coluna] for coluna in colunas)
+
+
+def linhas_colunares(valores, colunas):
+    return list(zip(*(valores[coluna] for coluna in colunas)))
+
+
+def sortear_populares(rng, n, expoente, quantidade):
+    """
+    Sorteia `quantidade` ids de [1, n] com popularidade Zipf. Os ids da carga
+    são contíguos, então só os candidatos além de `n` são sorteados de novo.
+    """
+    ids = np.empty(0, dtype=np.int64)
+    while len(ids) < quantidade:
+        candidatos = sortear_ids_populares(rng, 1, n, expoente, 2 * quantidade)
+        ids = np.concatenate([ids, candidatos[candidatos > 0]])
+    return ids[:quantidade]
+
+
+def sortear_itens(rng, quantidade, num_produtos, contexto):
+    """
+    Monta a cesta de cada uma de `quantidade` vendas, de forma vetorizada:
+    tamanhos pela distribuição de cestas e produtos pela popularidade Zipf.
+    Retorna (índice da venda, produto_id) de cada item.
+    """
+    tamanhos = tamanhos_cesta(rng, quantidade, contexto["cesta_media"])
+    sorteios = 4 * CESTA_MAXIMA
+    candidatos = sortear_ids_populares(
+        rng, 1, num_produtos, contexto["zipf_produtos"], quantidade * sorteios
+    )
+    return montar_cestas(candidatos.reshape(quantidade, sorteios), tamanhos)
+
+
+def gerar_bloco(tarefa):
+    """
+    Gera, em um processo do pool, as linhas de um bloco de ids consecutivos
+    [inicio, inicio + quantidade) de `tabela`. Retorna {tabela: [linhas]}.
+
+    Blocos de clientes trazem também os endereços (sem id, atribuído na
+    carga); blocos de vendas trazem os itens e, no lugar do endereço de
+    entrega, um sorteio em [0, 1) resolvido na carga.
+    """
+    tabela, inicio, quantidade, semente, contexto = tarefa
+    generator = Generator(semear_aleatoriedade(semente, tabela, inicio))
+    ids = range(inicio, inicio + quantidade)
+
+    if tabela == "fornecedores":
+        linhas = []
+        for fornecedor_id in ids:
+            fornecedor = generator.gerar_fornecedor()
+            fornecedor["id"] = fornecedor_id
+            fornecedor["email"] = email_unico(fornecedor["email"], fornecedor_id)
+            fornecedor["cnpj"] = formatar_cnpj(fornecedor_id)
+            linhas.append(linha(fornecedor, COLUNAS_CARGA["fornecedores"]))
+        return {"fornecedores": linhas}
+
+    if tabela == "clientes":
+        clientes, enderecos = [], []
+        for cliente_id in ids:
+            cliente = generator.gerar_cliente()
+            cliente["id"] = cliente_id
+            cliente["email"] = email_unico(cliente["email"], cliente_id)
+            cliente["cpf"] = formatar_cpf(cliente_id)
+            clientes.append(linha(cliente, COLUNAS_CARGA["clientes"]))
+            for i in range(1 if random.random() < 0.7 else 2):
+                endereco = generator.gerar_endereco(cliente_id)
+                endereco["id"] = None
+                endereco["endereco_principal"] = i == 0
+                enderecos.append(linha(endereco, COLUNAS_CARGA["enderecos"]))
+        return {"clientes": clientes, "enderecos": enderecos}
+
+    if tabela == "produtos":
+        produtos = generator.gerar_produtos(
+            quantidade,
+            np.arange(1, contexto["categorias"] + 1),
+            np.arange(1, contexto["fornecedores"] + 1),
+        )
+        produtos["id"] = list(ids)
+        return {"produtos": linhas_colunares(produtos, COLUNAS_CARGA["produtos"])}
+
+    rng = generator.rng
+    datas_venda = sortear_datas_venda(
+        rng,
+        contexto["referencia"],
+        DIAS_DE_HISTORICO,
+        quantidade,
+        sazonal=contexto["sazonalidade"],
+    )
+    vendas = generator.gerar_vendas(
+        sortear_populares(
+            rng, contexto["clientes"], contexto["zipf_clientes"], quantidade
+        ),
+        rng.random(quantidade),
+        datas_venda=datas_venda,
+    )
+    vendas["id"] = list(ids)
+
+    indices, produtos_ids = sortear_itens(
+        rng, quantidade, contexto["produtos"], contexto
+    )
+    itens = generator.gerar_itens_venda(inicio + indices, produtos_ids)
+    return {
+        "vendas": linhas_colunares(vendas, COLUNAS_CARGA["vendas"]),
+        "itens_venda": linhas_colunares(itens, COLUNAS_CARGA["itens_venda"]),
+    }
+
+
+def planejar_blocos(quantidades, semente, tamanho_bloco, contexto):
+    """
+    Tarefas do pool, na ordem em que precisam ser carregadas: os endereços
+    dos clientes têm que estar carregados antes das vendas que os usam.
+    """
+    tarefas = []
+    for tabela in ("fornecedores", "clientes", "produtos", "vendas"):
+        for inicio in range(1, quantidades[tabela] + 1, tamanho_bloco):
+            quantidade = min(tamanho_bloco, quantidades[tabela] + 1 - inicio)
+            tarefas.append((tabela, inicio, quantidade, semente, contexto))
+    return tarefas
+
+
+class IndiceEnderecosCarga:
+    """
+    Endereços atribuídos durante a carga: os do cliente `c` são os ids
+    [primeiro[c - 1], primeiro[c - 1] + quantidade[c - 1]).
+    """
+
+    def __init__(self):
+        self.primeiro = array("i")
+        self.quantidade = array("b")
+        self.proximo_id = 1
+
+    def atribuir(self, enderecos):
+        linhas = []
+        for endereco in enderecos:
+            cliente_id = endereco[1]
+            if len(self.primeiro) < cliente_id:
+                self.primeiro.append(self.proximo_id)
+                self.quantidade.append(0)
+            self.quantidade[cliente_id - 1] += 1
+            linhas.append((self.proximo_id,) + endereco[1:])
+            self.proximo_id += 1
+        return linhas
+
+    def resolver(self, vendas):
+        posicao = COLUNAS_CARGA["vendas"].index("endereco_entrega_id")
+        linhas = []
+        for venda in vendas:
+            indice = venda[1] - 1
+            endereco_id = self.primeiro[indice] + int(
+                venda[posicao] * self.quantidade[indice]
+            )
+            linhas.append(venda[:posicao] + (endereco_id,) + venda[posicao + 1 :])
+        return linhas
+
+
+def carregar(cursor, tabela, linhas):
+    """
+    Grava as linhas com executemany, que o PyMySQL agrupa em INSERTs
+    multi-linhas de até ~1 MB.
+    """
+    colunas = COLUNAS_CARGA[tabela]
+    cursor.executemany(
+        f"INSERT INTO {tabela} ({', '.join(colunas)}) "
+        f"VALUES ({', '.join(['%s'] * len(colunas))})",
+        linhas,
+    )
+
+
+def verificar_tabelas_vazias(cursor):
+    for tabela in TABELAS_SEMEADAS:
+        cursor.execute(f"SELECT EXISTS(SELECT 1 FROM {tabela})")
+        if cursor.fetchone()[0]:
+            raise ValueError(
+                f"A tabela {tabela} já tem dados; a carga em massa exige um banco "
+                "recém-criado (python init_db.py)"
+            )
+
+
+def remover_indices(cursor):
+    cursor.execute(
+        """
+        SELECT DISTINCT index_name FROM information_schema.statistics
+        WHERE table_schema = DATABASE()
+    """
+    )
+    existentes = {row[0] for row in cursor.fetchall()}
+    for nome, (tabela, _) in INDICES_POS_CARGA.items():
+        if nome in existentes:
+            cursor.execute(f"ALTER TABLE {tabela} DROP INDEX {nome}")
+
+
+def recriar_indices(cursor):
+    for nome, (_, ddl) in INDICES_POS_CARGA.items():
+        inicio = time.perf_counter()
+        cursor.execute(ddl)
+        print(f"Índice {nome} criado em {time.perf_counter() - inicio:.1f}s")
+
+
+def semear(
+    connection,
+    fator_escala=1.0,
+    workers=None,
+    semente=42,
+    tamanho_bloco=2000,
+    distribuicoes=None,
+):
+    """
+    Popula um banco recém-criado com ~10k clientes por unidade de
+    `fator_escala`. Os blocos são gerados em paralelo por um pool de
+    processos, cada um com semente determinística, e gravados em ordem por
+    este processo, com um commit por bloco. `distribuicoes` sobrescreve as
+    chaves de DISTRIBUICOES (popularidade, cestas e sazonalidade).
+    """
+    quantidades = {
+        tabela: max(1, round(linhas * fator_escala))
+        for tabela, linhas in ESCALA.items()
+    }
+    contexto = {
+        "categorias": len(CATEGORIAS),
+        "fornecedores": quantidades["fornecedores"],
+        "clientes": quantidades["clientes"],
+        "produtos": quantidades["produtos"],
+        "referencia": datetime.now().replace(hour=0, minute=0, second=0, microsecond=0),
+        **DISTRIBUICOES,
+        **(distribuicoes or {}),
+    }
+    inicio = time.perf_counter()
+    totais = dict.fromkeys(TABELAS_SEMEADAS, 0)
+
+    with connection.cursor() as cursor:
+        verificar_tabelas_vazias(cursor)
+        cursor.execute("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+        remover_indices(cursor)
+
+        generator = Generator(semear_aleatoriedade(semente, "categorias", 1))
+        categorias = []
+        for categoria_id, nome in enumerate(CATEGORIAS, start=1):
+            categoria = generator.gerar_categoria()
+            categoria.update(id=categoria_id, nome=nome, ativa=True)
+            categorias.append(linha(categoria, COLUNAS_CARGA["categorias"]))
+        carregar(cursor, "categorias", categorias)
+        totais["categorias"] = len(categorias)
+        connection.commit()
+
+        enderecos = IndiceEnderecosCarga()
+        tarefas = planejar_blocos(quantidades, semente, tamanho_bloco, contexto)
+        with Pool(processes=workers) as pool:
+            for bloco in pool.imap(gerar_bloco, tarefas):
+                if "enderecos" in bloco:
+                    bloco["enderecos"] = enderecos.atribuir(bloco["enderecos"])
+                if "vendas" in bloco:
+                    bloco["vendas"] = enderecos.resolver(bloco["vendas"])
+                for tabela, linhas in bloco.items():
+                    carregar(cursor, tabela, linhas)
+                    totais[tabela] += len(linhas)
+                connection.commit()
+                print(
+                    f"{', '.join(f'{t}={n}' for t, n in totais.items())} "
+                    f"({time.perf_counter() - inicio:.1f}s)"
+                )
+
+        cursor.execute("SET SESSION foreign_key_checks = 1, unique_checks = 1")
+        recriar_indices(cursor)
+        atualizar_resumos(cursor, reconstruir=True)
+        incrementar_geracoes(cursor)
+        connection.commit()
+
+    duracao = time.perf_counter() - inicio
+    print(f"Carga concluída em {duracao:.1f}s: {totais}")
+    return {"linhas": totais, "segundos": round(duracao, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Popula o banco com um dataset sintético em larga escala."
+    )
+    parser.add_argument(
+        "--sf", type=float, default=1.0, help="fator de escala (1 = ~10k clientes)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="processos (padrão: CPUs)"
+    )
+    parser.add_argument("--seed", type=int, default=42, help="semente base")
+    parser.add_argument(
+        "--bloco", type=int, default=2000, help="linhas por bloco de geração"
+    )
+    parser.add_argument(
+        "--zipf-produtos",
+        type=float,
+        default=ZIPF_PRODUTOS,
+        help="expoente Zipf da popularidade dos produtos (0 = uniforme)",
+    )
+    parser.add_argument(
+        "--zipf-clientes",
+        type=float,
+        default=ZIPF_CLIENTES,
+        help="expoente Zipf da frequência de compra dos clientes (0 = uniforme)",
+    )
+    parser.add_argument(
+        "--cesta-media", type=float, default=CESTA_MEDIA, help="produtos por venda"
+    )
+    parser.add_argument(
+        "--sem-sazonalidade",
+        action="store_true",
+        help="distribui as vendas uniformemente pelos dias e horas",
+    )
+    args = parser.parse_args()
+
+    load_dotenv()
+    connection = pymysql.connect(
+        host=os.environ.get("DB_HOST"),
+        user=os.environ.get("DB_USER", "admin"),
+        password=os.environ.get("DB_PASSWORD"),
+        database=os.environ.get("DB_NAME", "ecommerce"),
+        charset="utf8mb4",
+        autocommit=False,
+    )
+    try:
+        distribuicoes = {
+            "zipf_produtos": args.zipf_produtos,
+            "zipf_clientes": args.zipf_clientes,
+            "cesta_media": args.cesta_media,
+            "sazonalidade": SAZONALIDADE and not args.sem_sazonalidade,
+        }
+        semear(
+            connection, args.sf, args.workers, args.seed, args.bloco, distribuicoes
+        )
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
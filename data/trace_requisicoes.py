@@ -0,0 +1,320 @@
+import argparse
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from urllib.parse import quote, urlsplit
+
+import numpy as np  # type: ignore
+import pymysql  # type: ignore
+from dotenv import load_dotenv  # type: ignore
+
+from update_data import (
+    PRODUTOS,
+    ZIPF_CLIENTES,
+    ZIPF_PRODUTOS,
+    sortear_populares,
+    sortear_ranks,
+)
+
+PREFIXO = "/ecomm/v1"
+
+# Fração das requisições de cada rota no trace
+MISTURA = {
+    "produto": 0.35,
+    "listagem_produtos": 0.10,
+    "busca_produtos": 0.05,
+    "cliente": 0.08,
+    "vendas_cliente": 0.12,
+    "venda": 0.10,
+    "itens_venda": 0.08,
+    "categorias": 0.04,
+    "relatorio": 0.08,
+}
+
+# Páginas da listagem e vendas consultadas também seguem leis de potência:
+# a primeira página e as vendas mais recentes são as mais acessadas
+ZIPF_PAGINAS = 1.5
+ZIPF_VENDAS = 1.2
+PAGINAS_LISTAGEM = 100
+LIMITE_LISTAGEM = 50
+PERIODOS_RELATORIO = (7, 30, 90)
+
+
+def sortear_recentes(cursor, rng, tabela, quantidade, expoente):
+    """
+    Sorteia ids de `tabela` com popularidade Zipf pela recência: o rank 1 é
+    o maior id. Ids removidos viram requisições 404, como em tráfego real.
+    """
+    cursor.execute(f"SELECT MIN(id), MAX(id) FROM {tabela}")
+    menor, maior = cursor.fetchone()
+    if menor is None:
+        return np.ones(quantidade, dtype=np.int64)
+    return maior + 1 - sortear_ranks(rng, maior - menor + 1, expoente, quantidade)
+
+
+def sortear_existentes(cursor, rng, tabela, quantidade, expoente, filtro="TRUE"):
+    """
+    `sortear_populares` com os candidatos em lacunas sorteados de novo.
+    """
+    ids = np.empty(0, dtype=np.int64)
+    for _ in range(5):
+        faltam = quantidade - len(ids)
+        if faltam <= 0:
+            break
+        candidatos = sortear_populares(
+            cursor, rng, tabela, 2 * faltam, expoente, filtro
+        )
+        ids = np.concatenate([ids, candidatos[candidatos > 0][:faltam]])
+    if len(ids) < quantidade:
+        raise RuntimeError(f"Não há linhas suficientes em {tabela} para o trace")
+    return ids
+
+
+def gerar_trace(cursor, requisicoes, rps, semente=None, mistura=MISTURA):
+    """
+    Gera `requisicoes` GETs com chegadas de Poisson a `rps` requisições por
+    segundo. Produtos e clientes seguem a mesma popularidade Zipf usada na
+    geração das vendas (ZIPF_PRODUTOS, ZIPF_CLIENTES), então o conjunto
+    quente do trace é o mesmo dos dados. Retorna [(instante, rota, path)].
+    """
+    rng = np.random.default_rng(semente)
+    rotas = list(mistura)
+    pesos = np.array([mistura[rota] for rota in rotas])
+    escolhidas = rng.choice(len(rotas), requisicoes, p=pesos / pesos.sum())
+    instantes = np.cumsum(rng.exponential(1 / rps, requisicoes))
+    quantidades = Counter(rotas[i] for i in escolhidas)
+
+    produtos = sortear_existentes(
+        cursor, rng, "produtos", quantidades["produto"], ZIPF_PRODUTOS
+    )
+    clientes = sortear_existentes(
+        cursor,
+        rng,
+        "clientes",
+        quantidades["cliente"] + quantidades["vendas_cliente"],
+        ZIPF_CLIENTES,
+    )
+    vendas = sortear_recentes(
+        cursor,
+        rng,
+        "vendas",
+        quantidades["venda"] + quantidades["itens_venda"],
+        ZIPF_VENDAS,
+    )
+    paginas = sortear_ranks(
+        rng, PAGINAS_LISTAGEM, ZIPF_PAGINAS, quantidades["listagem_produtos"]
+    )
+    termos = sortear_ranks(
+        rng, len(PRODUTOS), ZIPF_PRODUTOS, quantidades["busca_produtos"]
+    )
+    periodos = rng.choice(PERIODOS_RELATORIO, quantidades["relatorio"])
+
+    hoje = date.today()
+    caminhos = {
+        "produto": (f"/produtos/{i}" for i in produtos),
+        "listagem_produtos": (
+            f"/produtos?skip={(p - 1) * LIMITE_LISTAGEM}&limit={LIMITE_LISTAGEM}"
+            for p in paginas
+        ),
+        "busca_produtos": (
+            f"/produtos/buscar?q={quote(PRODUTOS[t - 1])}" for t in termos
+        ),
+        "cliente": (f"/clientes/{i}" for i in clientes[: quantidades["cliente"]]),
+        "vendas_cliente": (
+            f"/vendas/cliente/{i}" for i in clientes[quantidades["cliente"] :]
+        ),
+        "venda": (f"/vendas/{i}" for i in vendas[: quantidades["venda"]]),
+        "itens_venda": (
+            f"/vendas/{i}/itens" for i in vendas[quantidades["venda"] :]
+        ),
+        "categorias": ("/categorias" for _ in range(quantidades["categorias"])),
+        "relatorio": (
+            f"/relatorios/vendas-diarias?inicio={hoje - timedelta(days=int(d))}"
+            for d in periodos
+        ),
+    }
+    return [
+        (round(float(instante), 6), rotas[i], PREFIXO + next(caminhos[rotas[i]]))
+        for instante, i in zip(instantes, escolhidas)
+    ]
+
+
+class Reprodutor:
+    """
+    Reproduz um trace em malha aberta: cada requisição é disparada no seu
+    instante, e a latência é medida a partir dele, então o tempo na fila
+    (quando todos os workers estão ocupados) também é contabilizado. Cada
+    thread mantém uma conexão keep-alive. Com `etag`, o cliente guarda o
+    ETag de cada path e revalida com If-None-Match, como um navegador ou CDN.
+    """
+
+    def __init__(self, url, concorrencia, etag=False):
+        partes = urlsplit(url)
+        self.classe_conexao = (
+            http.client.HTTPSConnection
+            if partes.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self.host = partes.netloc
+        self.concorrencia = concorrencia
+        self.etag = etag
+        self.etags = {}
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.latencias = defaultdict(list)
+        self.status = defaultdict(Counter)
+
+    def get(self, path, cabecalhos=None):
+        """
+        GET na conexão da thread; reconecta uma vez se ela tiver caído.
+        Retorna (resposta, corpo).
+        """
+        for tentativa in range(2):
+            if getattr(self.local, "conexao", None) is None:
+                self.local.conexao = self.classe_conexao(self.host, timeout=30)
+            try:
+                self.local.conexao.request("GET", path, headers=cabecalhos or {})
+                resposta = self.local.conexao.getresponse()
+                return resposta, resposta.read()
+            except (http.client.HTTPException, OSError):
+                self.local.conexao.close()
+                self.local.conexao = None
+                if tentativa:
+                    raise
+
+    def _executar(self, agendado, rota, path):
+        cabecalhos = {"Accept-Encoding": "gzip"}
+        if self.etag and path in self.etags:
+            cabecalhos["If-None-Match"] = self.etags[path]
+        try:
+            resposta, _ = self.get(path, cabecalhos)
+            status = resposta.status
+            if self.etag and resposta.getheader("ETag"):
+                self.etags[path] = resposta.getheader("ETag")
+        except (http.client.HTTPException, OSError):
+            status = "erro"
+        latencia = time.perf_counter() - agendado
+        with self.lock:
+            self.latencias[rota].append(latencia)
+            self.status[rota][status] += 1
+
+    def reproduzir(self, trace, velocidade=1.0):
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concorrencia) as executor:
+            for instante, rota, path in trace:
+                agendado = inicio + instante / velocidade
+                espera = agendado - time.perf_counter()
+                if espera > 0:
+                    time.sleep(espera)
+                executor.submit(self._executar, agendado, rota, path)
+        return time.perf_counter() - inicio
+
+    def estatisticas_cache(self):
+        """
+        Contadores do cache de entidades da API, ou None se indisponíveis.
+        """
+        try:
+            resposta, corpo = self.get(f"{PREFIXO}/cache/stats")
+        except (http.client.HTTPException, OSError):
+            return None
+        return json.loads(corpo) if resposta.status == 200 else None
+
+
+def imprimir_relatorio(reprodutor, duracao, cache_antes, cache_depois):
+    total = sum(len(latencias) for latencias in reprodutor.latencias.values())
+    print(f"{total} requisições em {duracao:.1f}s ({total / duracao:.0f} req/s)")
+    print(f"{'rota':<20}{'n':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}  status")
+    por_volume = sorted(reprodutor.latencias.items(), key=lambda item: -len(item[1]))
+    for rota, latencias in por_volume:
+        p50, p95, p99 = np.percentile(np.array(latencias) * 1000, [50, 95, 99])
+        status = ", ".join(
+            f"{codigo}={n}"
+            for codigo, n in sorted(reprodutor.status[rota].items(), key=str)
+        )
+        print(
+            f"{rota:<20}{len(latencias):>8}{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}"
+            f"  {status}"
+        )
+
+    if cache_antes and cache_depois:
+        acertos = cache_depois["hits"] - cache_antes["hits"]
+        falhas = cache_depois["misses"] - cache_antes["misses"]
+        taxa = acertos / (acertos + falhas) if acertos + falhas else 0.0
+        print(
+            f"Cache de entidades: {acertos} acertos, {falhas} falhas "
+            f"(taxa {taxa:.1%}), {cache_depois['entries']} entradas"
+        )
+
+
+def ler_trace(arquivo):
+    for linha in arquivo:
+        if linha.strip():
+            registro = json.loads(linha)
+            yield registro["t"], registro["rota"], registro["path"]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Gera e reproduz traces de GETs com popularidade Zipf."
+    )
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    gerar = comandos.add_parser("gerar", help="gera um trace a partir do banco")
+    gerar.add_argument("--requisicoes", type=int, default=100_000)
+    gerar.add_argument("--rps", type=float, default=200.0, help="taxa média")
+    gerar.add_argument("--seed", type=int, default=None, help="semente")
+    gerar.add_argument(
+        "--saida", default="-", help="arquivo JSON Lines (padrão: stdout)"
+    )
+
+    reproduzir = comandos.add_parser("reproduzir", help="reproduz um trace na API")
+    reproduzir.add_argument("trace", help="arquivo gerado por `gerar`")
+    reproduzir.add_argument("--url", default="http://localhost:8000")
+    reproduzir.add_argument("--concorrencia", type=int, default=32)
+    reproduzir.add_argument(
+        "--velocidade", type=float, default=1.0, help="multiplica a taxa do trace"
+    )
+    reproduzir.add_argument(
+        "--etag", action="store_true", help="revalida com If-None-Match"
+    )
+    args = parser.parse_args()
+
+    if args.comando == "gerar":
+        load_dotenv()
+        connection = pymysql.connect(
+            host=os.environ.get("DB_HOST"),
+            user=os.environ.get("DB_USER", "admin"),
+            password=os.environ.get("DB_PASSWORD"),
+            database=os.environ.get("DB_NAME", "ecommerce"),
+            charset="utf8mb4",
+        )
+        try:
+            with connection.cursor() as cursor:
+                trace = gerar_trace(cursor, args.requisicoes, args.rps, args.seed)
+        finally:
+            connection.close()
+
+        saida = sys.stdout if args.saida == "-" else open(args.saida, "w")
+        with saida:
+            for instante, rota, path in trace:
+                saida.write(json.dumps({"t": instante, "rota": rota, "path": path}))
+                saida.write("\n")
+        return
+
+    with open(args.trace) as arquivo:
+        trace = list(ler_trace(arquivo))
+    reprodutor = Reprodutor(args.url, args.concorrencia, etag=args.etag)
+    cache_antes = reprodutor.estatisticas_cache()
+    duracao = reprodutor.reproduzir(trace, args.velocidade)
+    cache_depois = reprodutor.estatisticas_cache()
+    imprimir_relatorio(reprodutor, duracao, cache_antes, cache_depois)
+
+
+if __name__ == "__main__":
+    main()
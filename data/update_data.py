@@ -1,31 +1,387 @@
+import hashlib
 import json
+import math
 import os
 import random
-from datetime import datetime
-
+import shutil
+import struct
+import sys
+import tempfile
+import unicodedata
+from array import array
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from functools import lru_cache
+
+import numpy as np  # type: ignore
 import pymysql  # type: ignore
 from dotenv import load_dotenv  # type: ignore
 from faker import Faker  # type: ignore
 
-fake = Faker("pt_BR")
+PRODUTOS = [
+    "Smartphone",
+    "Notebook",
+    "Camiseta",
+    "Tênis",
+    "Livro",
+    "Perfume",
+    "Relógio",
+    "Fone de Ouvido",
+    "Mochila",
+    "Mesa",
+]
+STATUS_VENDA = ["Pendente", "Confirmado", "Enviado", "Entregue", "Cancelado"]
+METODOS_PAGAMENTO = ["Cartao_Credito", "Cartao_Debito", "PIX", "Boleto"]
+STATUS_PAGAMENTO = ["Pendente", "Aprovado", "Recusado"]
+
+
+# Campos de texto sorteados de pools pré-gerados: (método do Faker, kwargs)
+CAMPOS_POOL = {
+    "nome": ("first_name", {}),
+    "sobrenome": ("last_name", {}),
+    "empresa": ("company", {}),
+    "dominio": ("free_email_domain", {}),
+    "dominio_empresa": ("domain_name", {}),
+    "telefone": ("phone_number", {}),
+    "endereco": ("address", {}),
+    "cep": ("postcode", {}),
+    "logradouro": ("street_name", {}),
+    "numero": ("building_number", {}),
+    "bairro": ("neighborhood", {}),
+    "cidade": ("city", {}),
+    "estado": ("state_abbr", {}),
+    "descricao_categoria": ("text", {"max_nb_chars": 200}),
+    "descricao_produto": ("text", {"max_nb_chars": 300}),
+}
+POOL_TAMANHO = int(os.environ.get("FAKER_POOL_SIZE", 1000))
+POOL_CACHE = os.environ.get(
+    "FAKER_POOL_CACHE", os.path.join(tempfile.gettempdir(), "faker_pools_pt_BR.json")
+)
+
+
+@lru_cache(maxsize=None)
+def carregar_pools(caminho=POOL_CACHE, tamanho=POOL_TAMANHO):
+    """
+    Pools de valores do Faker para os campos de texto, gerados uma única vez
+    com semente fixa e guardados em `caminho` (JSON). Execuções seguintes (e
+    os workers da carga em massa) só leem o arquivo.
+    """
+    try:
+        with open(caminho, encoding="utf-8") as arquivo:
+            cache = json.load(arquivo)
+        if cache["tamanho"] == tamanho and set(cache["valores"]) == set(CAMPOS_POOL):
+            return cache["valores"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    gerador = Faker("pt_BR")
+    gerador.seed_instance(0)
+    valores = {
+        campo: [getattr(gerador, metodo)(**kwargs) for _ in range(tamanho)]
+        for campo, (metodo, kwargs) in CAMPOS_POOL.items()
+    }
+    try:
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            json.dump({"tamanho": tamanho, "valores": valores}, arquivo)
+        os.replace(temporario, caminho)
+    except OSError as e:
+        print(f"Aviso: não foi possível gravar o cache de pools em {caminho}: {e}")
+    return valores
+
+
+def formatar_cpf(base):
+    """
+    CPF com dígitos verificadores válidos para os 9 dígitos de `base`.
+    """
+    digitos = [int(d) for d in f"{base:09d}"]
+    for tamanho in (9, 10):
+        soma = sum(d * (tamanho + 1 - i) for i, d in enumerate(digitos[:tamanho]))
+        resto = soma * 10 % 11
+        digitos.append(resto if resto < 10 else 0)
+    cpf = "".join(map(str, digitos))
+    return f"{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}"
+
+
+def formatar_cnpj(raiz):
+    """
+    CNPJ da matriz (filial 0001) com dígitos verificadores válidos para os
+    8 dígitos de `raiz`.
+    """
+    digitos = [int(d) for d in f"{raiz:08d}0001"]
+    pesos = [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+    for pesos_digito in (pesos, [6] + pesos):
+        resto = sum(d * p for d, p in zip(digitos, pesos_digito)) % 11
+        digitos.append(0 if resto < 2 else 11 - resto)
+    cnpj = "".join(map(str, digitos))
+    return f"{cnpj[:2]}.{cnpj[2:5]}.{cnpj[5:8]}/{cnpj[8:12]}-{cnpj[12:]}"
+
+
+def slug(texto):
+    ascii_ = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode()
+    return "".join(c for c in ascii_.lower() if c.isalnum())
+
+
+class FiltroBloom:
+    """
+    Conjunto compacto e aproximado: `in` nunca dá falso negativo, e os falsos
+    positivos (taxa ~`erro`) só fazem o alocador sortear outro valor.
+    """
+
+    def __init__(self, capacidade, erro=0.001):
+        capacidade = max(capacidade, 1)
+        self.m = math.ceil(-capacidade * math.log(erro) / math.log(2) ** 2)
+        self.k = max(1, round(self.m / capacidade * math.log(2)))
+        self.bits = bytearray((self.m + 7) // 8)
+
+    def _posicoes(self, valor):
+        digest = hashlib.blake2b(valor.encode("utf-8"), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "little")
+        b = int.from_bytes(digest[8:], "little") | 1
+        return ((a + i * b) % self.m for i in range(self.k))
+
+    def add(self, valor):
+        for posicao in self._posicoes(valor):
+            self.bits[posicao >> 3] |= 1 << (posicao & 7)
+
+    def __contains__(self, valor):
+        return all(
+            self.bits[posicao >> 3] & (1 << (posicao & 7))
+            for posicao in self._posicoes(valor)
+        )
+
+
+class AlocadorUnico:
+    """
+    Garante valores inéditos para as colunas UNIQUE de `tabela`. Cada valor
+    gerado é registrado em um filtro de Bloom por coluna, que só cobre os
+    valores desta carga; antes do INSERT, `resolver` confere os novos valores
+    no banco com consultas `IN` por lote e sorteia outro valor apenas para os
+    que já existem, então o custo acompanha o número de linhas novas e nenhum
+    INSERT é rejeitado por duplicidade. A comparação ignora maiúsculas, como
+    a collation do MySQL.
+    """
+
+    def __init__(self, cursor, tabela, colunas, novos):
+        self.cursor = cursor
+        self.tabela = tabela
+        self.filtros = {coluna: FiltroBloom(novos) for coluna in colunas}
+        self.geradores = {coluna: {} for coluna in colunas}
+
+    def reservar(self, coluna, gerar, tentativas=100):
+        filtro = self.filtros[coluna]
+        for _ in range(tentativas):
+            valor = gerar()
+            if valor.lower() not in filtro:
+                filtro.add(valor.lower())
+                self.geradores[coluna][valor.lower()] = gerar
+                return valor
+        raise RuntimeError(f"Não foi possível gerar um valor único para {coluna}")
+
+    def _existentes(self, coluna, valores):
+        existentes = set()
+        for inicio in range(0, len(valores), LOTE_MAX_LINHAS):
+            lote = valores[inicio : inicio + LOTE_MAX_LINHAS]
+            self.cursor.execute(
+                f"SELECT {coluna} FROM {self.tabela} "
+                f"WHERE {coluna} IN ({', '.join(['%s'] * len(lote))})",
+                lote,
+            )
+            existentes.update(row[0].lower() for row in self.cursor.fetchall())
+        return existentes
+
+    def resolver(self, registros):
+        """
+        Troca, nos `registros` gerados com `reservar`, os valores que já
+        existem no banco, conferindo de novo só os valores trocados.
+        """
+        for coluna, geradores in self.geradores.items():
+            pendentes = registros
+            while pendentes:
+                existentes = self._existentes(
+                    coluna, [registro[coluna] for registro in pendentes]
+                )
+                pendentes = [
+                    registro
+                    for registro in pendentes
+                    if registro[coluna].lower() in existentes
+                ]
+                for registro in pendentes:
+                    gerar = geradores.pop(registro[coluna].lower())
+                    registro[coluna] = self.reservar(coluna, gerar)
+            geradores.clear()
+        return registros
+
+
+def _unico(unicos, coluna, gerar):
+    return unicos.reservar(coluna, gerar) if unicos is not None else gerar()
+
+
+def registros(colunas):
+    """
+    Converte a saída colunar do Generator ({coluna: valores}) em registros.
+    """
+    return [dict(zip(colunas, valores)) for valores in zip(*colunas.values())]
+
+
+# Popularidade de produtos e clientes segue uma lei de potência (Zipf) com
+# estes expoentes; 0 deixa o sorteio uniforme
+ZIPF_PRODUTOS = float(os.environ.get("ZIPF_PRODUTOS", 1.1))
+ZIPF_CLIENTES = float(os.environ.get("ZIPF_CLIENTES", 0.8))
+# Tamanho médio e máximo da cesta (produtos distintos por venda) e
+# quantidade média por item; ambos seguem distribuições geométricas
+CESTA_MEDIA = float(os.environ.get("CESTA_MEDIA", 2.0))
+CESTA_MAXIMA = int(os.environ.get("CESTA_MAXIMA", 8))
+QUANTIDADE_MEDIA = float(os.environ.get("QUANTIDADE_MEDIA", 1.5))
+SAZONALIDADE = os.environ.get("SAZONALIDADE", "1") != "0"
+
+# Pesos relativos de vendas por dia da semana (segunda a domingo), por mês e
+# por hora do dia; a Black Friday (sexta após a 4ª quinta de novembro) vale
+# PESO_BLACK_FRIDAY dias comuns
+PESO_DIA_SEMANA = np.array([1.10, 1.08, 1.05, 1.00, 0.95, 0.80, 0.85])
+PESO_MES = np.array(
+    [0.85, 0.85, 0.95, 0.95, 1.05, 1.00, 0.95, 1.00, 0.95, 1.00, 1.35, 1.45]
+)
+PESO_HORA = np.array(
+    [3, 2, 1, 1, 1, 1, 2, 3, 5, 6, 7, 8, 9, 8, 7, 7, 7, 8, 9, 10, 11, 11, 9, 6],
+    dtype=float,
+)
+PESO_BLACK_FRIDAY = 4.0
+
+# Multiplicador ímpar: (rank * M) mod 2^k é uma bijeção que espalha os ranks
+POPULARIDADE_MULTIPLICADOR = np.uint64(0x9E3779B97F4A7C15)
+
+
+def sortear_ranks(rng, n, expoente, quantidade):
+    """
+    Sorteia ranks em [1, n] com P(r) proporcional a r^-expoente, pela inversa
+    da CDF da lei de potência contínua truncada em [1, n + 1).
+    """
+    u = rng.random(quantidade)
+    if abs(expoente - 1) < 1e-9:
+        x = (n + 1.0) ** u
+    else:
+        a = 1 - expoente
+        x = (((n + 1.0) ** a - 1) * u + 1) ** (1 / a)
+    return np.clip(x.astype(np.int64), 1, n)
+
+
+def sortear_ids_populares(rng, menor, maior, expoente, quantidade):
+    """
+    Sorteia ids de [menor, maior] com popularidade Zipf. O rank é mapeado no
+    id por uma bijeção módulo a potência de 2 que cobre o intervalo, então os
+    ids populares ficam espalhados pela tabela e são os mesmos enquanto ela
+    cresce (até o intervalo dobrar). Posições além de `maior` viram 0.
+    """
+    modulo = 1 << max(maior - menor, 1).bit_length()
+    ranks = sortear_ranks(rng, modulo, expoente, quantidade).astype(np.uint64)
+    deslocamento = ((ranks - np.uint64(1)) * POPULARIDADE_MULTIPLICADOR) & np.uint64(
+        modulo - 1
+    )
+    ids = menor + deslocamento.astype(np.int64)
+    return np.where(ids <= maior, ids, 0)
+
+
+def pesos_sazonais(dias):
+    """
+    Peso relativo de vendas de cada dia (array datetime64[D]).
+    """
+    numeros = dias.astype("datetime64[D]").astype(np.int64)
+    meses = dias.astype("datetime64[M]")
+    dia_semana = (numeros + 3) % 7  # 1970-01-01 foi quinta-feira
+    mes = meses.astype(np.int64) % 12
+    dia_mes = numeros - meses.astype("datetime64[D]").astype(np.int64) + 1
+    pesos = PESO_DIA_SEMANA[dia_semana] * PESO_MES[mes]
+    black_friday = (mes == 10) & (dia_semana == 4) & (dia_mes >= 23) & (dia_mes <= 29)
+    return np.where(black_friday, pesos * PESO_BLACK_FRIDAY, pesos)
+
+
+def sortear_datas_venda(rng, referencia, dias, quantidade, sazonal=SAZONALIDADE):
+    """
+    Sorteia instantes de venda nos `dias` dias anteriores a `referencia`,
+    ponderando os dias por `pesos_sazonais` e as horas por PESO_HORA.
+    """
+    candidatos = np.datetime64(referencia, "D") - np.arange(1, dias + 1)
+    if sazonal:
+        pesos = pesos_sazonais(candidatos)
+        dia = rng.choice(candidatos, quantidade, p=pesos / pesos.sum())
+        hora = rng.choice(24, quantidade, p=PESO_HORA / PESO_HORA.sum())
+    else:
+        dia = rng.choice(candidatos, quantidade)
+        hora = rng.integers(0, 24, quantidade)
+    segundos = hora * 3600 + rng.integers(0, 3600, quantidade)
+    return dia.astype("datetime64[s]") + segundos.astype("timedelta64[s]")
+
+
+def tamanhos_cesta(rng, quantidade, media=CESTA_MEDIA, maximo=CESTA_MAXIMA):
+    """
+    Número de produtos distintos de cada venda: geométrica com média `media`
+    (a maioria das cestas tem um item), limitada a `maximo`.
+    """
+    return np.minimum(rng.geometric(1 / max(media, 1.0), quantidade), maximo)
+
+
+def montar_cestas(candidatos, tamanhos):
+    """
+    Recebe uma matriz (vendas, sorteios) de produtos candidatos, na ordem do
+    sorteio e com 0 nas posições inválidas, e fica com os primeiros
+    `tamanhos[i]` produtos distintos de cada linha. Retorna (índice da venda,
+    produto_id) de cada item; cestas com candidatos insuficientes ficam
+    menores.
+    """
+    ordem = np.argsort(candidatos, axis=1, kind="stable")
+    ordenados = np.take_along_axis(candidatos, ordem, axis=1)
+    repetidos_ordenados = np.zeros_like(ordenados, dtype=bool)
+    repetidos_ordenados[:, 1:] = ordenados[:, 1:] == ordenados[:, :-1]
+    repetidos = np.empty_like(repetidos_ordenados)
+    np.put_along_axis(repetidos, ordem, repetidos_ordenados, axis=1)
+
+    validos = (candidatos > 0) & ~repetidos
+    escolhidos = validos & (np.cumsum(validos, axis=1) <= tamanhos[:, None])
+    vendas, colunas = np.nonzero(escolhidos)
+    return vendas, candidatos[vendas, colunas]
 
 
 class Generator:
+    """
+    Campos de texto são sorteados dos pools de `carregar_pools`, e CPF, CNPJ
+    e email são montados a partir deles; com um AlocadorUnico, esses valores
+    são garantidamente inéditos. Produtos, vendas e itens são gerados em
+    lote, coluna a coluna: preços, quantidades e enums são sorteados como
+    arrays NumPy com `rng`.
+    """
 
-    def __init__(self):
-        pass
+    def __init__(self, semente=None, pools=None):
+        self.rng = np.random.default_rng(semente)
+        self.pools = pools or carregar_pools()
+
+    def _sortear(self, campo):
+        return random.choice(self.pools[campo])
+
+    def _sortear_lote(self, campo, quantidade):
+        pool = self.pools[campo]
+        return [pool[i] for i in self.rng.integers(0, len(pool), quantidade)]
 
     # FORNECEDORES
-    def gerar_fornecedor(self):
+    def gerar_fornecedor(self, unicos=None):
+        dominio = self._sortear("dominio_empresa")
         return {
-            "nome": fake.company(),
-            "email": fake.company_email(),
-            "telefone": fake.phone_number(),
-            "cnpj": fake.cnpj(),  # Requer faker brasileira
-            "endereco": fake.address(),
-            "cidade": fake.city(),
-            "estado": fake.state_abbr(),
-            "cep": fake.postcode(),
+            "nome": self._sortear("empresa"),
+            "email": _unico(
+                unicos,
+                "email",
+                lambda: f"{slug(self._sortear('nome'))}{random.randint(1, 999)}"
+                f"@{dominio}",
+            ),
+            "telefone": self._sortear("telefone"),
+            "cnpj": _unico(
+                unicos, "cnpj", lambda: formatar_cnpj(random.randrange(10**8))
+            ),
+            "endereco": self._sortear("endereco"),
+            "cidade": self._sortear("cidade"),
+            "estado": self._sortear("estado"),
+            "cep": self._sortear("cep"),
             "ativo": random.choice([True, False]),
         }
 
@@ -45,19 +401,27 @@ class Generator:
         ]
         return {
             "nome": random.choice(categorias),
-            "descricao": fake.text(max_nb_chars=200),
+            "descricao": self._sortear("descricao_categoria"),
             "ativa": random.choice([True, False]),
         }
 
     # CLIENTES
-    def gerar_cliente(self):
+    def gerar_cliente(self, unicos=None):
+        nome = self._sortear("nome")
+        sobrenome = self._sortear("sobrenome")
         return {
-            "nome": fake.first_name(),
-            "sobrenome": fake.last_name(),
-            "email": fake.email(),
-            "telefone": fake.phone_number(),
-            "cpf": fake.cpf(),  # Requer faker brasileira
-            "data_nascimento": fake.date_of_birth(minimum_age=18, maximum_age=80),
+            "nome": nome,
+            "sobrenome": sobrenome,
+            "email": _unico(
+                unicos,
+                "email",
+                lambda: f"{slug(nome)}.{slug(sobrenome)}{random.randint(1, 9999)}"
+                f"@{self._sortear('dominio')}",
+            ),
+            "telefone": self._sortear("telefone"),
+            "cpf": _unico(unicos, "cpf", lambda: formatar_cpf(random.randrange(10**9))),
+            "data_nascimento": date.today()
+            - timedelta(days=random.randint(18 * 365, 80 * 365)),
             "genero": random.choice(["M", "F", "Outro"]),
         }
 
@@ -65,9 +429,9 @@ class Generator:
     def gerar_endereco(self, cliente_id):
         return {
             "cliente_id": cliente_id,
-            "cep": fake.postcode(),
-            "logradouro": fake.street_name(),
-            "numero": fake.building_number(),
+            "cep": self._sortear("cep"),
+            "logradouro": self._sortear("logradouro"),
+            "numero": self._sortear("numero"),
             "complemento": (
                 random.choice(
                     [
@@ -82,86 +446,253 @@ class Generator:
                 if random.choice([True, False])
                 else None
             ),
-            "bairro": fake.neighborhood(),
-            "cidade": fake.city(),
-            "estado": fake.state_abbr(),
+            "bairro": self._sortear("bairro"),
+            "cidade": self._sortear("cidade"),
+            "estado": self._sortear("estado"),
             "endereco_principal": random.choice([True, False]),
         }
 
     # PRODUTOS
-    def gerar_produto(self, categoria_id, fornecedor_id):
-
-        produtos = [
-            "Smartphone",
-            "Notebook",
-            "Camiseta",
-            "Tênis",
-            "Livro",
-            "Perfume",
-            "Relógio",
-            "Fone de Ouvido",
-            "Mochila",
-            "Mesa",
-        ]
-        nome_produto = random.choice(produtos)
-
-        preco = round(random.uniform(10.00, 1000.00), 2)
-        custo = round(preco * random.uniform(0.4, 0.7), 2)
-
+    def gerar_produtos(self, quantidade, categorias_ids, fornecedores_ids):
+        rng = self.rng
+        preco = np.round(rng.uniform(10.00, 1000.00, quantidade), 2)
         return {
-            "nome": nome_produto,
-            "descricao": fake.text(max_nb_chars=300),
-            "categoria_id": categoria_id,
-            "fornecedor_id": fornecedor_id,
-            "preco": preco,
-            "custo": custo,
-            "peso": round(random.uniform(0.1, 10.0), 3),
-            "quantidade_estoque": random.randint(0, 100),
-            "em_estoque": random.choice([True, False]),
-            "ativo": random.choice([True, False]),
+            "nome": rng.choice(PRODUTOS, quantidade).tolist(),
+            "descricao": self._sortear_lote("descricao_produto", quantidade),
+            "categoria_id": rng.choice(categorias_ids, quantidade).tolist(),
+            "fornecedor_id": rng.choice(fornecedores_ids, quantidade).tolist(),
+            "preco": preco.tolist(),
+            "custo": np.round(preco * rng.uniform(0.4, 0.7, quantidade), 2).tolist(),
+            "peso": np.round(rng.uniform(0.1, 10.0, quantidade), 3).tolist(),
+            "quantidade_estoque": rng.integers(0, 101, quantidade).tolist(),
+            "em_estoque": (rng.random(quantidade) < 0.5).tolist(),
+            "ativo": (rng.random(quantidade) < 0.5).tolist(),
         }
 
     # VENDAS
-    def gerar_venda(self, cliente_id, endereco_id):
-        subtotal = round(random.uniform(50.00, 500.00), 2)
-        frete = round(random.uniform(5.00, 30.00), 2)
+    def gerar_vendas(self, clientes_ids, enderecos_ids, datas_venda=None):
+        """
+        Com `datas_venda` (array datetime64) a entrega prevista é de 1 a 30
+        dias depois de cada venda; sem, as vendas são de agora e a entrega,
+        de hoje a 30 dias.
+        """
+        rng = self.rng
+        quantidade = len(clientes_ids)
+        subtotal = np.round(rng.uniform(50.00, 500.00, quantidade), 2)
+        frete = np.round(rng.uniform(5.00, 30.00, quantidade), 2)
+
+        if datas_venda is None:
+            data_venda = [datetime.now()] * quantidade
+            entrega = np.datetime64(date.today(), "D") + rng.integers(
+                0, 30, quantidade, endpoint=True
+            )
+        else:
+            data_venda = datas_venda.tolist()
+            entrega = datas_venda.astype("datetime64[D]") + rng.integers(
+                1, 30, quantidade, endpoint=True
+            )
 
         return {
-            "cliente_id": cliente_id,
-            "endereco_entrega_id": endereco_id,
-            "status": random.choice(
-                ["Pendente", "Confirmado", "Enviado", "Entregue", "Cancelado"]
-            ),
-            "subtotal": subtotal,
-            "frete": frete,
-            "total": subtotal + frete,
-            "metodo_pagamento": random.choice(
-                ["Cartao_Credito", "Cartao_Debito", "PIX", "Boleto"]
-            ),
-            "status_pagamento": random.choice(["Pendente", "Aprovado", "Recusado"]),
-            "data_venda": datetime.now(),
-            "data_entrega_prevista": fake.date_between(
-                start_date="today", end_date="+30d"
-            ),
+            "cliente_id": np.asarray(clientes_ids).tolist(),
+            "endereco_entrega_id": np.asarray(enderecos_ids).tolist(),
+            "status": rng.choice(STATUS_VENDA, quantidade).tolist(),
+            "subtotal": subtotal.tolist(),
+            "frete": frete.tolist(),
+            "total": np.round(subtotal + frete, 2).tolist(),
+            "metodo_pagamento": rng.choice(METODOS_PAGAMENTO, quantidade).tolist(),
+            "status_pagamento": rng.choice(STATUS_PAGAMENTO, quantidade).tolist(),
+            "data_venda": data_venda,
+            "data_entrega_prevista": entrega.tolist(),
         }
 
     # ITENS VENDA
-    def gerar_item_venda(self, venda_id, produto_id):
-        quantidade = random.randint(1, 5)
-        preco_unitario = round(random.uniform(10.00, 200.00), 2)
-
+    def gerar_itens_venda(self, vendas_ids, produtos_ids):
+        rng = self.rng
+        quantidade = np.minimum(
+            rng.geometric(1 / max(QUANTIDADE_MEDIA, 1.0), len(vendas_ids)), 5
+        )
+        preco_unitario = np.round(rng.uniform(10.00, 200.00, len(vendas_ids)), 2)
         return {
-            "venda_id": venda_id,
-            "produto_id": produto_id,
-            "quantidade": quantidade,
-            "preco_unitario": preco_unitario,
-            "subtotal": quantidade * preco_unitario,
+            "venda_id": np.asarray(vendas_ids).tolist(),
+            "produto_id": np.asarray(produtos_ids).tolist(),
+            "quantidade": quantidade.tolist(),
+            "preco_unitario": preco_unitario.tolist(),
+            "subtotal": np.round(quantidade * preco_unitario, 2).tolist(),
         }
 
 
-def insert_fake_data(cursor):
-    generator = Generator()
+# Colunas gravadas por tabela, na ordem dos INSERTs em lote
+COLUNAS_INSERCAO = {
+    "fornecedores": (
+        "nome",
+        "email",
+        "telefone",
+        "cnpj",
+        "endereco",
+        "cidade",
+        "estado",
+        "cep",
+        "ativo",
+    ),
+    "categorias": ("nome", "descricao", "ativa"),
+    "clientes": (
+        "nome",
+        "sobrenome",
+        "email",
+        "telefone",
+        "cpf",
+        "data_nascimento",
+        "genero",
+    ),
+    "enderecos": (
+        "cliente_id",
+        "cep",
+        "logradouro",
+        "numero",
+        "complemento",
+        "bairro",
+        "cidade",
+        "estado",
+        "endereco_principal",
+    ),
+    "produtos": (
+        "nome",
+        "descricao",
+        "categoria_id",
+        "fornecedor_id",
+        "preco",
+        "custo",
+        "peso",
+        "quantidade_estoque",
+        "em_estoque",
+        "ativo",
+    ),
+    "vendas": (
+        "cliente_id",
+        "endereco_entrega_id",
+        "status",
+        "subtotal",
+        "frete",
+        "total",
+        "metodo_pagamento",
+        "status_pagamento",
+        "data_entrega_prevista",
+    ),
+    "itens_venda": (
+        "venda_id",
+        "produto_id",
+        "quantidade",
+        "preco_unitario",
+        "subtotal",
+    ),
+}
+
+LOTE_MAX_LINHAS = 1000
+
+
+def inserir_em_lote(cursor, tabela, registros):
+    """
+    Grava os registros do Generator com INSERTs multi-linhas de até
+    LOTE_MAX_LINHAS linhas e retorna os ids gerados, na ordem dos registros.
+
+    O LAST_INSERT_ID de um INSERT multi-linhas é o id da primeira linha, e o
+    InnoDB reserva ids consecutivos para inserts com número de linhas
+    conhecido, então os ids do lote são [LAST_INSERT_ID, LAST_INSERT_ID + n).
+    """
+    colunas = COLUNAS_INSERCAO[tabela]
+    linha = "(" + ", ".join(["%s"] * len(colunas)) + ")"
+    ids = []
+    for inicio in range(0, len(registros), LOTE_MAX_LINHAS):
+        lote = registros[inicio : inicio + LOTE_MAX_LINHAS]
+        cursor.execute(
+            f"INSERT INTO {tabela} ({', '.join(colunas)}) VALUES "
+            + ", ".join([linha] * len(lote)),
+            [registro[coluna] for registro in lote for coluna in colunas],
+        )
+        ids.extend(range(cursor.lastrowid, cursor.lastrowid + len(lote)))
+    return ids
+
+
+def sortear_populares(cursor, rng, tabela, quantidade, expoente, filtro="TRUE"):
+    """
+    Sorteia `quantidade` ids de `tabela` (com repetição) com popularidade Zipf
+    de `expoente`, na ordem do sorteio, sem carregar a lista de ids: os
+    candidatos vêm do intervalo [MIN(id), MAX(id)] e são confirmados pela
+    chave primária. Os que caem em lacunas (linhas removidas ou fora do
+    filtro) viram 0, então o resultado pode ser usado direto em
+    `montar_cestas`, e o custo não cresce com a tabela.
+    """
+    cursor.execute(f"SELECT MIN(id), MAX(id) FROM {tabela}")
+    menor, maior = cursor.fetchone()
+    if menor is None:
+        return np.zeros(quantidade, dtype=np.int64)
+
+    ids = sortear_ids_populares(rng, menor, maior, expoente, quantidade)
+    distintos = np.unique(ids[ids > 0]).tolist()
+    validos = []
+    for inicio in range(0, len(distintos), LOTE_MAX_LINHAS):
+        lote = distintos[inicio : inicio + LOTE_MAX_LINHAS]
+        cursor.execute(
+            f"SELECT id FROM {tabela} WHERE {filtro} "
+            f"AND id IN ({', '.join(['%s'] * len(lote))})",
+            lote,
+        )
+        validos.extend(row[0] for row in cursor.fetchall())
+    return np.where(np.isin(ids, validos), ids, 0)
+
+
+class IndiceEnderecos:
+    """
+    Endereços de um conjunto de clientes, carregados em uma consulta e
+    guardados em arrays compactos: os endereços do cliente `clientes[i]` são
+    `enderecos[offsets[i]:offsets[i + 1]]`.
+    """
 
+    def __init__(self, cursor, clientes_ids):
+        self.clientes = array("i")
+        self.offsets = array("i")
+        self.enderecos = array("i")
+
+        clientes_ids = sorted(set(clientes_ids))
+        if not clientes_ids:
+            return
+        cursor.execute(
+            f"""
+            SELECT cliente_id, id FROM enderecos
+            WHERE cliente_id IN ({', '.join(['%s'] * len(clientes_ids))})
+            ORDER BY cliente_id, id
+        """,
+            clientes_ids,
+        )
+        for cliente_id, endereco_id in cursor.fetchall():
+            if not self.clientes or self.clientes[-1] != cliente_id:
+                self.clientes.append(cliente_id)
+                self.offsets.append(len(self.enderecos))
+            self.enderecos.append(endereco_id)
+        self.offsets.append(len(self.enderecos))
+
+    def sortear(self, cliente_id):
+        """
+        Um endereço aleatório do cliente, ou None se ele não tiver endereços.
+        """
+        i = bisect_left(self.clientes, cliente_id)
+        if i == len(self.clientes) or self.clientes[i] != cliente_id:
+            return None
+        return self.enderecos[random.randrange(self.offsets[i], self.offsets[i + 1])]
+
+
+# Multiplica os volumes diários sorteados; lotes grandes são divididos em
+# etapas de até CARGA_TAMANHO_LOTE linhas, cada uma com seu commit
+CARGA_ESCALA = float(os.environ.get("CARGA_ESCALA", 1))
+CARGA_TAMANHO_LOTE = int(os.environ.get("CARGA_TAMANHO_LOTE", 500))
+CARGA_LOCK = "carga_diaria"
+
+
+def planejar_carga(cursor):
+    """
+    Sorteia os volumes da carga. O plano é gravado no primeiro checkpoint,
+    para que uma carga retomada siga exatamente o mesmo plano.
+    """
     try:
         cursor.execute("SELECT MAX(id) FROM fornecedores")
         max_fornecedor_id = cursor.fetchone()[0] or 0
@@ -176,130 +707,78 @@ def insert_fake_data(cursor):
         print(f"Erro ao obter o ID máximo de categorias: {e}")
         max_categoria_id = 0
 
-    if max_categoria_id == 0:
-        print("Primeira execução: criando categorias iniciais...")
-        categorias_unicas = set()
-        for _ in range(10):  # Tentar inserir até 10 categorias únicas
-            categoria = generator.gerar_categoria()
-            if categoria["nome"] not in categorias_unicas:
-                categorias_unicas.add(categoria["nome"])
-                try:
-                    cursor.execute(
-                        """
-                        INSERT INTO categorias (nome, descricao, ativa) 
-                        VALUES (%s, %s, %s)
-                    """,
-                        (categoria["nome"], categoria["descricao"], categoria["ativa"]),
-                    )
-                except pymysql.IntegrityError:
-                    pass
-        # Atualizar max_categoria_id
-        cursor.execute("SELECT MAX(id) FROM categorias")
-        max_categoria_id = cursor.fetchone()[0] or 0
-
+    num_novos_fornecedores = 0
     if max_fornecedor_id == 0:
         print("Primeira execução: criando fornecedores iniciais...")
-        for _ in range(5):
-            fornecedor = generator.gerar_fornecedor()
-            try:
-                cursor.execute(
-                    """
-                    INSERT INTO fornecedores (nome, email, telefone, cnpj, endereco, cidade, estado, cep, ativo) 
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                    (
-                        fornecedor["nome"],
-                        fornecedor["email"],
-                        fornecedor["telefone"],
-                        fornecedor["cnpj"],
-                        fornecedor["endereco"],
-                        fornecedor["cidade"],
-                        fornecedor["estado"],
-                        fornecedor["cep"],
-                        fornecedor["ativo"],
-                    ),
-                )
-            except pymysql.IntegrityError:
-                pass
-        # Atualizar max_fornecedor_id
-        cursor.execute("SELECT MAX(id) FROM fornecedores")
-        max_fornecedor_id = cursor.fetchone()[0] or 0
+        num_novos_fornecedores += 5
 
     if random.random() < 0.2:
         print("Adicionando novo fornecedor...")
-        fornecedor = generator.gerar_fornecedor()
-        try:
-            cursor.execute(
-                """
-                INSERT INTO fornecedores (nome, email, telefone, cnpj, endereco, cidade, estado, cep, ativo) 
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """,
-                (
-                    fornecedor["nome"],
-                    fornecedor["email"],
-                    fornecedor["telefone"],
-                    fornecedor["cnpj"],
-                    fornecedor["endereco"],
-                    fornecedor["cidade"],
-                    fornecedor["estado"],
-                    fornecedor["cep"],
-                    fornecedor["ativo"],
-                ),
-            )
-            max_fornecedor_id = cursor.lastrowid
-        except pymysql.IntegrityError:
-            pass
+        num_novos_fornecedores += 1
 
-    novos_clientes = []
-    num_novos_clientes = random.randint(3, 8)
-    print(f"Registrando {num_novos_clientes} novos clientes...")
+    def escalar(quantidade):
+        return max(1, round(quantidade * CARGA_ESCALA))
 
-    for _ in range(num_novos_clientes):
-        cliente = generator.gerar_cliente()
-        try:
-            cursor.execute(
-                """
-                INSERT INTO clientes (nome, sobrenome, email, telefone, cpf, data_nascimento, genero) 
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """,
-                (
-                    cliente["nome"],
-                    cliente["sobrenome"],
-                    cliente["email"],
-                    cliente["telefone"],
-                    cliente["cpf"],
-                    cliente["data_nascimento"],
-                    cliente["genero"],
-                ),
-            )
-            novos_clientes.append(cursor.lastrowid)
-        except pymysql.IntegrityError:
-            # Email ou CPF já existe, tentar novamente
-            pass
+    # O volume de vendas acompanha a sazonalidade do dia da carga
+    sazonalidade = 1.0
+    if SAZONALIDADE:
+        hoje = np.array([date.today()], dtype="datetime64[D]")
+        sazonalidade = float(pesos_sazonais(hoje)[0])
 
-    for cliente_id in novos_clientes:
-        endereco = generator.gerar_endereco(cliente_id)
-        cursor.execute(
-            """
-            INSERT INTO enderecos (cliente_id, cep, logradouro, numero, complemento, bairro, cidade, estado, endereco_principal) 
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """,
-            (
-                endereco["cliente_id"],
-                endereco["cep"],
-                endereco["logradouro"],
-                endereco["numero"],
-                endereco["complemento"],
-                endereco["bairro"],
-                endereco["cidade"],
-                endereco["estado"],
-                endereco["endereco_principal"],
-            ),
+    return {
+        "dia": date.today().isoformat(),
+        "categorias_iniciais": max_categoria_id == 0,
+        "fornecedores": num_novos_fornecedores,
+        "clientes": escalar(random.randint(3, 8)),
+        "produtos": escalar(random.randint(2, 5)),
+        "vendas": escalar(random.randint(5, 15) * sazonalidade),
+    }
+
+
+def etapa_cadastros(cursor, generator, plano, contexto):
+    if plano["categorias_iniciais"]:
+        print("Primeira execução: criando categorias iniciais...")
+        categorias = {}
+        for _ in range(10):  # Tentar inserir até 10 categorias únicas
+            categoria = generator.gerar_categoria()
+            categorias.setdefault(categoria["nome"], categoria)
+        inserir_em_lote(cursor, "categorias", list(categorias.values()))
+
+    if plano["fornecedores"]:
+        unicos = AlocadorUnico(
+            cursor, "fornecedores", ("email", "cnpj"), plano["fornecedores"]
         )
+        fornecedores = unicos.resolver(
+            [generator.gerar_fornecedor(unicos) for _ in range(plano["fornecedores"])]
+        )
+        inserir_em_lote(cursor, "fornecedores", fornecedores)
 
-    novos_produtos = []
-    num_novos_produtos = random.randint(2, 5)
-    print(f"Adicionando {num_novos_produtos} novos produtos...")
+    return {"fornecedores": plano["fornecedores"]}, ["categorias", "fornecedores"]
+
+
+def etapa_clientes(cursor, generator, quantidade, contexto):
+    print(f"Registrando {quantidade} novos clientes...")
+    if "unicos_clientes" not in contexto:
+        contexto["unicos_clientes"] = AlocadorUnico(
+            cursor, "clientes", ("email", "cpf"), contexto["plano"]["clientes"]
+        )
+    unicos = contexto["unicos_clientes"]
+    clientes = unicos.resolver(
+        [generator.gerar_cliente(unicos) for _ in range(quantidade)]
+    )
+    novos_clientes = inserir_em_lote(cursor, "clientes", clientes)
+
+    inserir_em_lote(
+        cursor,
+        "enderecos",
+        [generator.gerar_endereco(cliente_id) for cliente_id in novos_clientes],
+    )
+    contexto["novos_clientes"].extend(novos_clientes)
+    return {"ids": novos_clientes}, ["clientes", "enderecos"]
+
+
+def etapa_produtos(cursor, generator, quantidade, contexto):
+    print(f"Adicionando {quantidade} novos produtos...")
 
     cursor.execute("SELECT id FROM categorias WHERE ativa = TRUE")
     categorias_ativas = [row[0] for row in cursor.fetchall()]
@@ -307,132 +786,565 @@ def insert_fake_data(cursor):
     cursor.execute("SELECT id FROM fornecedores WHERE ativo = TRUE")
     fornecedores_ativos = [row[0] for row in cursor.fetchall()]
 
+    novos_produtos = []
     if categorias_ativas and fornecedores_ativos:
-        for _ in range(num_novos_produtos):
-            produto = generator.gerar_produto(
-                categoria_id=random.choice(categorias_ativas),
-                fornecedor_id=random.choice(fornecedores_ativos),
-            )
-            cursor.execute(
-                """
-                INSERT INTO produtos (nome, descricao, categoria_id, fornecedor_id, preco, custo, peso, quantidade_estoque, em_estoque, ativo) 
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """,
-                (
-                    produto["nome"],
-                    produto["descricao"],
-                    produto["categoria_id"],
-                    produto["fornecedor_id"],
-                    produto["preco"],
-                    produto["custo"],
-                    produto["peso"],
-                    produto["quantidade_estoque"],
-                    produto["em_estoque"],
-                    produto["ativo"],
-                ),
-            )
-            novos_produtos.append(cursor.lastrowid)
+        produtos = generator.gerar_produtos(
+            quantidade, categorias_ativas, fornecedores_ativos
+        )
+        novos_produtos = inserir_em_lote(cursor, "produtos", registros(produtos))
     else:
         print("Erro: Não há categorias ou fornecedores ativos para criar produtos")
 
-    novos_vendas = []
-    num_vendas = random.randint(5, 15)
-    print(f"Processando {num_vendas} vendas de hoje...")
+    return {"produtos": len(novos_produtos)}, ["produtos"]
 
-    cursor.execute("SELECT id FROM clientes")
-    todos_clientes = [row[0] for row in cursor.fetchall()]
 
-    cursor.execute("SELECT COUNT(*) FROM produtos WHERE ativo = TRUE")
-    produtos_ativos_count = cursor.fetchone()[0]
+def etapa_vendas(cursor, generator, num_vendas, contexto):
+    print(f"Processando {num_vendas} vendas de hoje...")
+    rng = generator.rng
+    novos_clientes = contexto["novos_clientes"]
+    novos_vendas = []
 
-    if todos_clientes and produtos_ativos_count > 0:
-        for _ in range(num_vendas):
+    # Sorteios extras cobrem os candidatos que caem em lacunas
+    clientes_sorteados = sortear_populares(
+        cursor, rng, "clientes", 2 * num_vendas, ZIPF_CLIENTES
+    )
+    clientes_sorteados = clientes_sorteados[clientes_sorteados > 0].tolist()
+    tamanhos = tamanhos_cesta(rng, num_vendas)
+    candidatos = sortear_populares(
+        cursor,
+        rng,
+        "produtos",
+        4 * CESTA_MAXIMA * num_vendas,
+        ZIPF_PRODUTOS,
+        filtro="ativo = TRUE",
+    ).reshape(num_vendas, -1)
+
+    if clientes_sorteados and candidatos.any():
+        clientes_venda = []
+        for i in range(num_vendas):
             # Clientes novos têm maior probabilidade de comprar (simulando campanhas)
             if novos_clientes and random.random() < 0.4:
-                cliente_id = random.choice(novos_clientes)
+                clientes_venda.append(random.choice(novos_clientes))
             else:
-                cliente_id = random.choice(todos_clientes)
+                clientes_venda.append(clientes_sorteados[i % len(clientes_sorteados)])
 
-            # Buscar endereço do cliente
-            cursor.execute(
-                "SELECT id FROM enderecos WHERE cliente_id = %s ORDER BY RAND() LIMIT 1",
-                (cliente_id,),
-            )
-            endereco_result = cursor.fetchone()
-            endereco_id = endereco_result[0] if endereco_result else None
-
-            venda = generator.gerar_venda(cliente_id, endereco_id)
-            cursor.execute(
-                """
-                INSERT INTO vendas (cliente_id, endereco_entrega_id, status, subtotal, frete, total, metodo_pagamento, status_pagamento, data_entrega_prevista) 
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """,
-                (
-                    venda["cliente_id"],
-                    venda["endereco_entrega_id"],
-                    venda["status"],
-                    venda["subtotal"],
-                    venda["frete"],
-                    venda["total"],
-                    venda["metodo_pagamento"],
-                    venda["status_pagamento"],
-                    venda["data_entrega_prevista"],
-                ),
-            )
-            novos_vendas.append(cursor.lastrowid)
+        enderecos = IndiceEnderecos(cursor, clientes_venda)
+        vendas = generator.gerar_vendas(
+            clientes_venda, [enderecos.sortear(c) for c in clientes_venda]
+        )
+        novos_vendas = inserir_em_lote(cursor, "vendas", registros(vendas))
     else:
-        print("Aviso: Não há clientes ou produtos ativos suficientes para criar vendas")
+        print(
+            "Aviso: Não há clientes ou produtos ativos suficientes para criar vendas"
+        )
+
+    itens = []
+    if novos_vendas:
+        indices, produtos_ids = montar_cestas(candidatos, tamanhos)
+        vendas_itens = np.asarray(novos_vendas)[indices]
+        itens = registros(generator.gerar_itens_venda(vendas_itens, produtos_ids))
+        inserir_em_lote(cursor, "itens_venda", itens)
+
+    return {"vendas": len(novos_vendas), "itens": len(itens)}, ["vendas", "itens_venda"]
+
+
+def etapa_resumos(cursor, generator, reconstruir, contexto):
+    return atualizar_resumos(cursor, reconstruir=reconstruir), [
+        "resumo_vendas_dia",
+        "resumo_itens_dia",
+    ]
+
+
+def _lotes(total):
+    return [
+        min(CARGA_TAMANHO_LOTE, total - inicio)
+        for inicio in range(0, total, CARGA_TAMANHO_LOTE)
+    ]
+
+
+def _carga_pendente(cursor):
+    """
+    Retorna o id da carga a executar e os checkpoints já gravados dela: a
+    última carga, se não foi concluída, ou uma nova carga sem checkpoints.
+    """
+    cursor.execute("SELECT MAX(carga_id) FROM cargas_checkpoints")
+    ultima = cursor.fetchone()[0]
+    if ultima is None:
+        return 1, {}
+
+    cursor.execute(
+        "SELECT etapa, resultado FROM cargas_checkpoints WHERE carga_id = %s",
+        (ultima,),
+    )
+    checkpoints = {etapa: json.loads(resultado) for etapa, resultado in cursor}
+    if "concluida" in checkpoints:
+        return ultima + 1, {}
+    return ultima, checkpoints
+
+
+def _registrar_etapa(cursor, carga_id, etapa, resultado):
+    cursor.execute(
+        """
+        INSERT INTO cargas_checkpoints (carga_id, etapa, resultado)
+        VALUES (%s, %s, %s)
+    """,
+        (carga_id, etapa, json.dumps(resultado)),
+    )
+
+
+def _executar_etapas(connection, cursor, carga_id, checkpoints, reconstruir_resumos):
+    """
+    Executa as etapas da carga `carga_id` ainda sem checkpoint e grava o
+    checkpoint final. Retorna o resumo da carga.
+    """
+    plano = checkpoints["plano"]
+    etapas = [("cadastros", etapa_cadastros, plano)]
+    etapas += [
+        (f"clientes:{i}", etapa_clientes, quantidade)
+        for i, quantidade in enumerate(_lotes(plano["clientes"]))
+    ]
+    etapas += [
+        (f"produtos:{i}", etapa_produtos, quantidade)
+        for i, quantidade in enumerate(_lotes(plano["produtos"]))
+    ]
+    etapas += [
+        (f"vendas:{i}", etapa_vendas, quantidade)
+        for i, quantidade in enumerate(_lotes(plano["vendas"]))
+    ]
+    etapas.append(("resumos", etapa_resumos, reconstruir_resumos))
+
+    generator = Generator()
+    contexto = {
+        "plano": plano,
+        "novos_clientes": [
+            cliente_id
+            for etapa, resultado in checkpoints.items()
+            if etapa.startswith("clientes:")
+            for cliente_id in resultado["ids"]
+        ],
+    }
+    for nome, executar, argumento in etapas:
+        if nome in checkpoints:
+            continue
+        resultado, tabelas = executar(cursor, generator, argumento, contexto)
+        _registrar_etapa(cursor, carga_id, nome, resultado)
+        incrementar_geracoes(cursor, tabelas)
+        connection.commit()
+        checkpoints[nome] = resultado
+
+    def somar(prefixo, chave):
+        return sum(
+            resultado[chave]
+            for etapa, resultado in checkpoints.items()
+            if etapa.startswith(prefixo)
+        )
 
-    cursor.execute("SELECT id FROM produtos WHERE ativo = TRUE")
-    todos_produtos = [row[0] for row in cursor.fetchall()]
+    resumo = {
+        "carga_id": carga_id,
+        "novos_clientes": len(contexto["novos_clientes"]),
+        "novos_produtos": somar("produtos:", "produtos"),
+        "vendas_realizadas": somar("vendas:", "vendas"),
+        "total_itens_vendidos": somar("vendas:", "itens"),
+        "resumos": checkpoints["resumos"],
+    }
+    _registrar_etapa(cursor, carga_id, "concluida", resumo)
+    connection.commit()
+    return resumo
+
+
+def executar_carga(connection, cursor, reconstruir_resumos=False):
+    """
+    Executa a carga diária em etapas: cadastros, lotes de clientes, de
+    produtos e de vendas, e resumos. Cada etapa é commitada junto com seu
+    checkpoint em `cargas_checkpoints` e com o incremento de geração das
+    tabelas que alterou, então os locks duram só uma etapa e a API nunca vê
+    dados novos com um ETag antigo.
+
+    Se a execução anterior foi interrompida (timeout ou erro), esta retoma a
+    mesma carga: o plano salvo é reutilizado e as etapas já registradas são
+    puladas. O plano guarda o dia em que foi feito; se a carga retomada é de
+    um dia anterior, a carga de hoje é executada em seguida. Um lock nomeado
+    impede duas execuções simultâneas.
+    """
+    cursor.execute("SELECT GET_LOCK(%s, 0)", (CARGA_LOCK,))
+    if not cursor.fetchone()[0]:
+        raise RuntimeError("Outra execução da carga diária está em andamento")
+
+    hoje = date.today().isoformat()
+    try:
+        while True:
+            carga_id, checkpoints = _carga_pendente(cursor)
+            if checkpoints:
+                feitas = len(checkpoints) - 1
+                print(f"Retomando a carga {carga_id} ({feitas} etapas já concluídas)")
+            else:
+                checkpoints["plano"] = planejar_carga(cursor)
+                _registrar_etapa(cursor, carga_id, "plano", checkpoints["plano"])
+                connection.commit()
 
-    if todos_produtos:
-        for venda_id in novos_vendas:
-            # Cada venda terá 1-4 produtos diferentes
-            num_itens = random.randint(1, 4)
-            produtos_na_venda = random.sample(
-                todos_produtos, min(num_itens, len(todos_produtos))
+            resumo = _executar_etapas(
+                connection, cursor, carga_id, checkpoints, reconstruir_resumos
             )
+            if checkpoints["plano"].get("dia") == hoje:
+                break
+            print(f"Carga {carga_id} era de um dia anterior; executando a de hoje")
+    finally:
+        # Não pode esconder a exceção original se a conexão já tiver caído
+        try:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (CARGA_LOCK,))
+        except pymysql.Error as e:
+            print(f"Erro ao liberar o lock da carga diária: {e}")
 
-            for produto_id in produtos_na_venda:
-                item_venda = generator.gerar_item_venda(venda_id, produto_id)
-                cursor.execute(
-                    """
-                    INSERT INTO itens_venda (venda_id, produto_id, quantidade, preco_unitario, subtotal) 
-                    VALUES (%s, %s, %s, %s, %s)
-                """,
-                    (
-                        item_venda["venda_id"],
-                        item_venda["produto_id"],
-                        item_venda["quantidade"],
-                        item_venda["preco_unitario"],
-                        item_venda["subtotal"],
-                    ),
-                )
+    print(
+        f"RESUMO DO DIA: {resumo['novos_clientes']} novos clientes, {resumo['novos_produtos']} novos produtos, {resumo['vendas_realizadas']} vendas realizadas"
+    )
+    return resumo
+
+
+TABELAS_DATASET = [
+    "fornecedores",
+    "categorias",
+    "clientes",
+    "enderecos",
+    "produtos",
+    "vendas",
+    "itens_venda",
+    "resumo_vendas_dia",
+    "resumo_itens_dia",
+]
+
+
+def incrementar_geracoes(cursor, tabelas=TABELAS_DATASET):
+    """
+    Incrementa a geração das tabelas usada pela API para montar os ETags.
+    Roda na mesma transação de cada etapa da carga, então a nova geração só
+    fica visível junto com os dados novos.
+    """
+    cursor.executemany(
+        """
+        INSERT INTO geracoes_dataset (tabela, geracao) VALUES (%s, 1)
+        ON DUPLICATE KEY UPDATE geracao = geracao + 1
+    """,
+        [(tabela,) for tabela in tabelas],
+    )
+
+
+# Dias mais recentes recalculados a cada execução da carga: vendas commitadas
+# fora da ordem dos ids e alterações feitas pela API dentro dessa janela
+# entram nos resumos
+RESUMOS_JANELA_DIAS = int(os.environ.get("RESUMOS_JANELA_DIAS", 7))
+
+
+def _avancar_marca(cursor, tabela, consulta_dia):
+    """
+    Registra MAX(id) de `tabela` como a nova marca na transação corrente e
+    retorna o menor dia (`consulta_dia`, filtrada por `id > %s`) das linhas
+    inseridas desde a marca anterior, ou None se não houver nenhuma.
+    """
+    cursor.execute(
+        "SELECT ultimo_id FROM resumos_marcas WHERE tabela = %s FOR UPDATE",
+        (tabela,),
+    )
+    row = cursor.fetchone()
+    ultimo_id = row[0] if row else 0
+
+    cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {tabela}")
+    max_id = cursor.fetchone()[0]
+    cursor.execute(consulta_dia, (ultimo_id,))
+    menor_dia = cursor.fetchone()[0]
+
+    cursor.execute(
+        """
+        INSERT INTO resumos_marcas (tabela, ultimo_id) VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE ultimo_id = VALUES(ultimo_id)
+    """,
+        (tabela, max_id),
+    )
+    return menor_dia
+
+
+def atualizar_resumos(cursor, reconstruir=False):
+    """
+    Recalcula nas tabelas de resumo os últimos RESUMOS_JANELA_DIAS dias e
+    qualquer dia mais antigo que tenha recebido vendas ou itens desde a última
+    execução (marcas em `resumos_marcas`). Os dias da janela são apagados e
+    agregados de novo a partir de vendas e itens, então vendas commitadas fora
+    da ordem dos ids e alterações ou exclusões feitas pela API nesse período
+    também entram nos resumos. Com `reconstruir=True` todo o histórico é
+    recalculado.
+    """
+    menor_venda = _avancar_marca(
+        cursor, "vendas", "SELECT MIN(DATE(data_venda)) FROM vendas WHERE id > %s"
+    )
+    menor_item = _avancar_marca(
+        cursor,
+        "itens_venda",
+        """
+        SELECT MIN(DATE(v.data_venda)) FROM itens_venda iv
+        JOIN vendas v ON v.id = iv.venda_id
+        WHERE iv.id > %s
+    """,
+    )
+
+    if reconstruir:
+        print("Reconstruindo tabelas de resumo...")
+        desde = None
     else:
-        print("Aviso: Não há produtos ativos para criar itens de venda")
+        dias = [date.today() - timedelta(days=RESUMOS_JANELA_DIAS)]
+        dias += [dia for dia in (menor_venda, menor_item) if dia is not None]
+        desde = min(dias)
+
+    filtro_resumo, filtro_vendas, parametros = "", "", ()
+    if desde is not None:
+        filtro_resumo = "WHERE dia >= %s"
+        filtro_vendas = "WHERE v.data_venda >= %s"
+        parametros = (desde,)
+
+    cursor.execute(f"DELETE FROM resumo_vendas_dia {filtro_resumo}", parametros)
+    cursor.execute(
+        f"""
+        INSERT INTO resumo_vendas_dia (dia, metodo_pagamento, status, num_vendas, subtotal, frete, total)
+        SELECT DATE(v.data_venda), v.metodo_pagamento, v.status, COUNT(*), SUM(v.subtotal), SUM(v.frete), SUM(v.total)
+        FROM vendas v
+        {filtro_vendas}
+        GROUP BY DATE(v.data_venda), v.metodo_pagamento, v.status
+    """,
+        parametros,
+    )
+    linhas_vendas = cursor.rowcount
+
+    cursor.execute(f"DELETE FROM resumo_itens_dia {filtro_resumo}", parametros)
+    cursor.execute(
+        f"""
+        INSERT INTO resumo_itens_dia (dia, categoria_id, fornecedor_id, quantidade, receita, custo)
+        SELECT DATE(v.data_venda), COALESCE(p.categoria_id, 0), COALESCE(p.fornecedor_id, 0),
+            SUM(iv.quantidade), SUM(iv.subtotal), SUM(iv.quantidade * COALESCE(p.custo, 0))
+        FROM itens_venda iv
+        JOIN vendas v ON v.id = iv.venda_id
+        JOIN produtos p ON p.id = iv.produto_id
+        {filtro_vendas}
+        GROUP BY DATE(v.data_venda), COALESCE(p.categoria_id, 0), COALESCE(p.fornecedor_id, 0)
+    """,
+        parametros,
+    )
+    linhas_itens = cursor.rowcount
 
     print(
-        f"RESUMO DO DIA: {len(novos_clientes)} novos clientes, {len(novos_produtos)} novos produtos, {len(novos_vendas)} vendas realizadas"
+        f"Resumos recalculados desde {desde or 'o início'}: "
+        f"{linhas_vendas} linhas de vendas, {linhas_itens} linhas de itens"
     )
-
     return {
-        "novos_clientes": len(novos_clientes),
-        "novos_produtos": len(novos_produtos),
-        "vendas_realizadas": len(novos_vendas),
-        "total_itens_vendidos": (
-            sum(
-                len(
-                    random.sample(
-                        todos_produtos, min(random.randint(1, 4), len(todos_produtos))
-                    )
+        "desde": desde.isoformat() if desde else None,
+        "linhas_vendas": linhas_vendas,
+        "linhas_itens": linhas_itens,
+    }
+
+
+# Colunas de cada recurso na ordem dos schemas de resposta da API, para que os
+# registros do snapshot sejam idênticos ao JSON servido a partir do banco, e
+# as colunas booleanas, que o PyMySQL devolve como inteiros.
+SNAPSHOT_RECURSOS = {
+    "categorias": (["nome", "descricao", "ativa", "id", "criado_em"], {"ativa"}),
+    "fornecedores": (
+        [
+            "nome",
+            "email",
+            "telefone",
+            "cnpj",
+            "endereco",
+            "cidade",
+            "estado",
+            "cep",
+            "ativo",
+            "id",
+            "criado_em",
+        ],
+        {"ativo"},
+    ),
+    "clientes": (
+        [
+            "nome",
+            "sobrenome",
+            "email",
+            "telefone",
+            "cpf",
+            "data_nascimento",
+            "genero",
+            "id",
+            "criado_em",
+        ],
+        set(),
+    ),
+    "enderecos": (
+        [
+            "cliente_id",
+            "cep",
+            "logradouro",
+            "numero",
+            "complemento",
+            "bairro",
+            "cidade",
+            "estado",
+            "endereco_principal",
+            "id",
+        ],
+        {"endereco_principal"},
+    ),
+    "produtos": (
+        [
+            "nome",
+            "descricao",
+            "categoria_id",
+            "fornecedor_id",
+            "preco",
+            "custo",
+            "peso",
+            "quantidade_estoque",
+            "em_estoque",
+            "ativo",
+            "id",
+            "criado_em",
+        ],
+        {"em_estoque", "ativo"},
+    ),
+    "vendas": (
+        [
+            "cliente_id",
+            "endereco_entrega_id",
+            "status",
+            "subtotal",
+            "frete",
+            "total",
+            "metodo_pagamento",
+            "status_pagamento",
+            "data_venda",
+            "data_entrega_prevista",
+            "id",
+        ],
+        set(),
+    ),
+}
+
+SNAPSHOT_MAGIC = b"ECSNAP01"
+
+
+def _valor_snapshot(valor):
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    raise TypeError(f"Tipo não serializável: {type(valor)}")
+
+
+def escrever_snapshot_recurso(connection, recurso, destino):
+    """
+    Grava `recurso` em `destino` no formato lido pela API via mmap:
+
+        MAGIC | n (uint64) | ids (n x int64) | offsets (n + 1 x uint64) | dados
+
+    Os dados são os registros JSON ordenados por id, cada um seguido de ",",
+    então qualquer página da listagem é uma fatia contígua do arquivo. As
+    linhas são lidas com um cursor do lado do servidor.
+    """
+    colunas, booleanas = SNAPSHOT_RECURSOS[recurso]
+    posicao_id = colunas.index("id")
+    ids = array("q")
+    offsets = array("Q", [0])
+
+    with tempfile.TemporaryFile() as dados:
+        with connection.cursor(pymysql.cursors.SSCursor) as cursor:
+            cursor.execute(f"SELECT {', '.join(colunas)} FROM {recurso} ORDER BY id")
+            for linha in cursor:
+                registro = dict(zip(colunas, linha))
+                for coluna in booleanas:
+                    if registro[coluna] is not None:
+                        registro[coluna] = bool(registro[coluna])
+                corpo = (
+                    json.dumps(
+                        registro,
+                        ensure_ascii=False,
+                        separators=(",", ":"),
+                        default=_valor_snapshot,
+                    ).encode("utf-8")
+                    + b","
                 )
-                for _ in novos_vendas
+                dados.write(corpo)
+                ids.append(linha[posicao_id])
+                offsets.append(offsets[-1] + len(corpo))
+
+        if sys.byteorder != "little":
+            ids.byteswap()
+            offsets.byteswap()
+
+        dados.seek(0)
+        with open(destino, "wb") as arquivo:
+            arquivo.write(SNAPSHOT_MAGIC)
+            arquivo.write(struct.pack("<Q", len(ids)))
+            arquivo.write(ids.tobytes())
+            arquivo.write(offsets.tobytes())
+            shutil.copyfileobj(dados, arquivo)
+
+    return len(ids)
+
+
+def gerar_snapshot(connection):
+    """
+    Gera uma nova versão do snapshot a partir do estado já commitado e a
+    publica no S3 (SNAPSHOT_BUCKET) ou em um diretório local (SNAPSHOT_DIR).
+
+    Todas as leituras acontecem em uma única transação com snapshot
+    consistente, então as gerações registradas no manifesto correspondem
+    exatamente aos dados gravados. O ponteiro LATEST só é atualizado depois
+    que todos os arquivos da versão foram publicados.
+    """
+    bucket = os.environ.get("SNAPSHOT_BUCKET")
+    prefixo = os.environ.get("SNAPSHOT_PREFIX", "snapshots").strip("/")
+    diretorio_local = os.environ.get("SNAPSHOT_DIR")
+    versao = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+
+    base = tempfile.mkdtemp() if bucket else os.path.join(diretorio_local, versao)
+    os.makedirs(base, exist_ok=True)
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT")
+            cursor.execute("SELECT tabela, geracao FROM geracoes_dataset")
+            geracoes = dict(cursor.fetchall())
+
+        manifesto = {"versao": versao, "recursos": {}}
+        for recurso in SNAPSHOT_RECURSOS:
+            arquivo = f"{recurso}.snap"
+            linhas = escrever_snapshot_recurso(
+                connection, recurso, os.path.join(base, arquivo)
             )
-            if todos_produtos
-            else 0
-        ),
-    }
+            manifesto["recursos"][recurso] = {
+                "arquivo": arquivo,
+                "linhas": linhas,
+                "geracao": geracoes.get(recurso, 0),
+            }
+    finally:
+        connection.rollback()
+
+    with open(os.path.join(base, "manifest.json"), "w") as arquivo:
+        json.dump(manifesto, arquivo)
+
+    if bucket:
+        import boto3  # type: ignore
+
+        s3 = boto3.client("s3")
+        for nome in os.listdir(base):
+            s3.upload_file(
+                os.path.join(base, nome), bucket, f"{prefixo}/{versao}/{nome}"
+            )
+        s3.put_object(Bucket=bucket, Key=f"{prefixo}/LATEST", Body=versao.encode())
+        shutil.rmtree(base, ignore_errors=True)
+    else:
+        with open(os.path.join(diretorio_local, "LATEST"), "w") as arquivo:
+            arquivo.write(versao)
+
+    linhas = {recurso: info["linhas"] for recurso, info in manifesto["recursos"].items()}
+    print(f"Snapshot {versao} publicado: {linhas}")
+    return {"versao": versao, "linhas": linhas}
 
 
 def lambda_handler(event, context):
@@ -494,10 +1406,19 @@ def lambda_handler(event, context):
         cursor.execute("SELECT 1")
         print("Conexão com banco estabelecida com sucesso")
 
-        dados_inseridos = insert_fake_data(cursor)
+        dados_inseridos = executar_carga(
+            connection,
+            cursor,
+            reconstruir_resumos=bool((event or {}).get("reconstruir_resumos")),
+        )
+        print("Carga commitada com sucesso")
 
-        connection.commit()
-        print("Transação commitada com sucesso")
+        if os.environ.get("SNAPSHOT_BUCKET") or os.environ.get("SNAPSHOT_DIR"):
+            try:
+                dados_inseridos["snapshot"] = gerar_snapshot(connection)
+            except Exception as e:
+                # Os dados já foram commitados; a API segue lendo do banco
+                print(f"Erro ao gerar o snapshot: {str(e)}")
 
         execution_time = (datetime.now() - start_time).total_seconds()
 
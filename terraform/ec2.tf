@@ -38,6 +38,9 @@ resource "aws_instance" "api_server" {
     sudo docker run -d --restart unless-stopped -p 8000:8000 --name fake-ecommerce-api \
                 -e DB_USER=${var.db_access.username} \
                 -e DB_PASSWORD=${var.db_access.password} \
+                -e WEB_CONCURRENCY=${var.api_workers} \
+                -e SNAPSHOT_ENABLED=${var.api_snapshot_enabled} \
+                -e SNAPSHOT_BUCKET=${aws_s3_bucket.snapshots.bucket} \
                 ${var.aws_account_id}.dkr.ecr.${var.aws_region}.amazonaws.com/fake-ecommerce-api:latest
 
     sudo docker ps -a >> /var/log/user_data_check.log
@@ -15,7 +15,7 @@ resource "terraform_data" "lambda_dependencies" {
 
   provisioner "local-exec" {
     working_dir = "${path.module}/../lambda"
-    command     = "rm -rf package-update-data && mkdir -p package-update-data && pip install -r ../data/requirements.txt -t package-update-data/ && cp ../data/update_data.py package-update-data/ && cp ../terraform/db_host.txt package-update-data/"
+    command     = "rm -rf package-update-data && mkdir -p package-update-data && pip install -r ../data/requirements.txt -t package-update-data/ --platform manylinux2014_x86_64 --python-version 3.9 --only-binary=:all: && cp ../data/update_data.py package-update-data/ && cp ../terraform/db_host.txt package-update-data/"
   }
 }
 
@@ -43,6 +43,8 @@ resource "aws_lambda_function" "lambda_update_data" {
       DB_USER     = var.db_access.username
       DB_PASSWORD = var.db_access.password
       DB_NAME     = var.db_name
+
+      SNAPSHOT_BUCKET = aws_s3_bucket.snapshots.bucket
     }
   }
 
@@ -0,0 +1,74 @@
+#######################
+# Snapshot diário da API
+#######################
+
+resource "aws_s3_bucket" "snapshots" {
+  bucket = "${var.snapshot_bucket_prefix}-${var.aws_account_id}"
+
+  tags = {
+    Name = "fake-ecommerce-snapshots"
+  }
+}
+
+resource "aws_s3_bucket_lifecycle_configuration" "snapshots" {
+  bucket = aws_s3_bucket.snapshots.id
+
+  rule {
+    id     = "expirar-versoes-antigas"
+    status = "Enabled"
+
+    filter {
+      prefix = "snapshots/"
+    }
+
+    expiration {
+      days = 7
+    }
+  }
+}
+
+# A Lambda roda na VPC sem saída para a internet; o endpoint de gateway dá
+# acesso ao S3 sem NAT.
+resource "aws_vpc_endpoint" "s3" {
+  vpc_id            = aws_vpc.main.id
+  service_name      = "com.amazonaws.${var.aws_region}.s3"
+  vpc_endpoint_type = "Gateway"
+  route_table_ids   = [aws_route_table.public.id]
+
+  tags = {
+    Name = "ecommerce-s3-endpoint"
+  }
+}
+
+resource "aws_iam_role_policy" "lambda_snapshots" {
+  name = "lambda-update-data-snapshots"
+  role = aws_iam_role.lambda_update_data.id
+  policy = jsonencode({
+    Version = "2012-10-17",
+    Statement = [{
+      Effect   = "Allow",
+      Action   = ["s3:PutObject"],
+      Resource = "${aws_s3_bucket.snapshots.arn}/*"
+    }]
+  })
+}
+
+resource "aws_iam_role_policy" "ec2_snapshots" {
+  name = "ec2-api-snapshots"
+  role = aws_iam_role.ec2_ecr_role.id
+  policy = jsonencode({
+    Version = "2012-10-17",
+    Statement = [
+      {
+        Effect   = "Allow",
+        Action   = ["s3:GetObject"],
+        Resource = "${aws_s3_bucket.snapshots.arn}/*"
+      },
+      {
+        Effect   = "Allow",
+        Action   = ["s3:ListBucket"],
+        Resource = aws_s3_bucket.snapshots.arn
+      }
+    ]
+  })
+}
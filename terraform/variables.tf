@@ -29,3 +29,21 @@ variable "myip" {
   type        = string
   default     = "179.175.250.171"
 }
+
+variable "api_workers" {
+  description = "Número de workers do uvicorn no container da API (caches em memória são por processo)"
+  type        = number
+  default     = 1
+}
+
+variable "snapshot_bucket_prefix" {
+  description = "Prefixo do bucket S3 com o snapshot diário da API"
+  type        = string
+  default     = "fake-ecommerce-snapshots"
+}
+
+variable "api_snapshot_enabled" {
+  description = "Se a API deve servir os GETs a partir do snapshot diário"
+  type        = bool
+  default     = true
+}